@@ -0,0 +1,96 @@
+"""
+Benchmark: memoized, interned code normalizers in the mappers.
+
+Maps freshly parsed JSON rows of Table B1 (every code a separate string
+object, as json.loads returns them) with TableB1Mapper.map_batch, once with
+the shared _CodeCache normalizers and once with the plain str() coercions
+they replaced, reporting rows/s and the memory retained by the entities.
+
+Usage:
+    python benchmarks/bench_codes.py [--rows 200000]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from operator import methodcaller
+
+from peru_susalud_seti.application import mappers
+
+_zfill_2 = methodcaller("zfill", 2)
+
+# The column coercions before the code normalizers were memoized.
+PLAIN_COERCIONS = {
+    "text": lambda values: list(map(str.strip, map(str, values))),
+    "code": lambda values: list(map(str, values)),
+    "age": lambda values: list(map(_zfill_2, map(str, values))),
+    "upper": lambda values: list(map(str.upper, map(str.strip, map(str, values)))),
+    "flag": lambda values: list(map(str.upper, map(str, values))),
+}
+
+
+@contextmanager
+def plain_coercions():
+    saved = dict(mappers._COLUMN_COERCIONS)
+    mappers._COLUMN_COERCIONS.update(PLAIN_COERCIONS)
+    try:
+        yield
+    finally:
+        mappers._COLUMN_COERCIONS.update(saved)
+
+
+def parsed_rows(rows):
+    """B1 rows as a JSON parser returns them: no string shared between rows."""
+    return json.loads(json.dumps([
+        {
+            "period": "202602", "ipress_code": "00001234", "ugipress_code": "00001234",
+            "ups_code": "301601", "age_group": str(n % 20), "gender": str(n % 2 + 1),
+            "total_patients": n % 50, "total_appointments": n % 70,
+            "poverty_level": str(n % 3 + 1), "funding_source": str(n % 5 + 1),
+        }
+        for n in range(rows)
+    ]))
+
+
+def rows_per_second(rows):
+    """Mapping throughput of TableB1Mapper.map_batch over already parsed rows."""
+    started = time.perf_counter()
+    result = mappers.TableB1Mapper.map_batch(rows)
+    return len(result.records) / (time.perf_counter() - started)
+
+
+def bytes_per_row(rows):
+    """Memory still held once the parsed rows are gone: entities and their strings."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        parsed = parsed_rows(rows)
+        records = mappers.TableB1Mapper.map_batch(parsed).records
+        del parsed
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del records
+    return retained / rows
+
+
+def run(rows):
+    return rows_per_second(parsed_rows(rows)), bytes_per_row(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'normalizers':<12}{'rows/s':>12}{'bytes/row':>12}")
+    with plain_coercions():
+        speed, size = run(args.rows)
+    print(f"{'plain':<12}{speed:>12,.0f}{size:>12.1f}")
+    speed, size = run(args.rows)
+    print(f"{'memoized':<12}{speed:>12,.0f}{size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
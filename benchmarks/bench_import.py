@@ -0,0 +1,69 @@
+"""
+Benchmark: cold-start cost of the package, measured with python -X importtime.
+
+Each scenario runs in a fresh interpreter, as a serverless invocation would:
+importing the package, building a SetiGenerationService and generating one
+Table B1 row. Reports the median import time of the package's modules
+(cumulative, in ms) over --repeat runs, the total wall time of the
+interpreter and the slowest modules imported.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 10] [--top 8]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    "import": "import peru_susalud_seti",
+    "service": "from peru_susalud_seti import SetiGenerationService; SetiGenerationService()",
+    "first table": (
+        "import tempfile\n"
+        "from peru_susalud_seti import SetiGenerationService\n"
+        "SetiGenerationService().generate_table('B1', [{'period': '202602', 'ipress_code': '00001234'}], tempfile.mkdtemp())"
+    ),
+}
+
+
+def import_times(code):
+    """
+    Runs code under -X importtime. Returns {module: cumulative us}, the
+    microseconds spent importing the package (its top-level entries,
+    which include what they import) and the wall seconds of the run.
+    """
+    started = time.perf_counter()
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", code], check=True, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    times, package_us = {}, 0
+    for line in child.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+        # Nested imports are indented; lazily imported modules show up at top level.
+        if name.startswith(" peru_susalud_seti"):
+            package_us += int(cumulative)
+    return times, package_us, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for label, code in SCENARIOS.items():
+        runs = [import_times(code) for _ in range(args.repeat)]
+        package_ms = statistics.median(package_us for _, package_us, _ in runs) / 1000
+        wall_ms = statistics.median(elapsed for _, _, elapsed in runs) * 1000
+        print(f"{label:<12} package {package_ms:7.1f} ms   interpreter {wall_ms:7.1f} ms")
+
+        last = runs[-1][0]
+        for name, us in sorted(last.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {us / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Memory benchmark: bytes per row held by each domain entity.
+
+Measures with tracemalloc the memory retained by N instances of every table,
+next to an equivalent frozen dataclass without __slots__ for reference.
+String values are shared across rows, so the figures isolate the cost of
+the entity itself.
+
+Usage:
+    python benchmarks/bench_memory.py [--rows 100000]
+"""
+import argparse
+import tracemalloc
+from dataclasses import fields, make_dataclass
+
+from bench_models import ENTITIES, sample_values
+
+
+def bytes_per_row(entity_cls, values, rows):
+    """Memory retained by rows instances of entity_cls, divided by rows."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        records = [entity_cls(*values) for _ in range(rows)]
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del records
+    return retained / rows
+
+
+def unslotted_copy(entity_cls):
+    """A frozen dataclass with the same fields but a per-instance __dict__."""
+    return make_dataclass(
+        f"Unslotted{entity_cls.__name__}",
+        [(f.name, f.type) for f in fields(entity_cls)],
+        frozen=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'entity':<24}{'__dict__':>12}{'__slots__':>12}   (bytes/row)")
+    for entity_cls in ENTITIES:
+        values = sample_values(entity_cls)
+        unslotted = bytes_per_row(unslotted_copy(entity_cls), values, args.rows)
+        slotted = bytes_per_row(entity_cls, values, args.rows)
+        print(f"{entity_cls.__name__:<24}{unslotted:>12.1f}{slotted:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark: per-row construction cost of the domain entities.
+
+Compares the compiled validators of domain/models.py against the previous
+reflective check (dataclasses.fields() + getattr on every instance) and
+against no validation at all.
+
+Usage:
+    python benchmarks/bench_models.py [--rows 100000]
+"""
+import argparse
+import timeit
+from dataclasses import fields
+
+from peru_susalud_seti.domain import models
+
+ENTITIES = [
+    models.HealthResourceTableA,
+    models.OutpatientTableB1,
+    models.EmergencyTableB2,
+    models.InpatientTableC1,
+    models.StayTableC2,
+    models.EmergencyProductionD1,
+    models.EmergencyMorbidityD2,
+    models.ChildbirthTableE,
+    models.SurveillanceTableF,
+    models.ProceduresTableG,
+    models.SurgeryTableH,
+    models.ReferralTableI,
+    models.ExpenditureTableJ,
+]
+
+
+def sample_values(entity_cls):
+    """Valid positional arguments for entity_cls, in field order."""
+    values = []
+    for f in fields(entity_cls):
+        if f.name == "period":
+            values.append("202602")
+        elif f.name in ("ipress_code", "ugipress_code"):
+            values.append("00001234")
+        elif f.type is int:
+            values.append(7)
+        elif f.type is float:
+            values.append(1250.5)
+        else:
+            values.append("1")
+    return tuple(values)
+
+
+def reflective_validator(record):
+    """The validation HealthResourceTableA used before validators were compiled."""
+    if len(record.period) != 6 or not record.period.isdigit():
+        raise ValueError(f"El periodo '{record.period}' es inválido. Formato requerido: AAAAMM")
+    if len(record.ipress_code) != 8:
+        raise ValueError(f"El código IPRESS '{record.ipress_code}' debe tener 8 caracteres.")
+    for field in fields(record):
+        if field.type is int:
+            value = getattr(record, field.name)
+            if value < 0:
+                raise ValueError(f"El campo '{field.name}' no puede ser negativo: {value}")
+
+
+def time_construction(entity_cls, values, rows, validator):
+    """Best-of-3 construction time per row, in microseconds."""
+    original = models._VALIDATORS.get(entity_cls)
+    if validator is not None:
+        models._VALIDATORS[entity_cls] = validator
+    try:
+        best = min(timeit.repeat(lambda: entity_cls(*values), number=rows, repeat=3))
+    finally:
+        if original is None:
+            models._VALIDATORS.pop(entity_cls, None)
+        else:
+            models._VALIDATORS[entity_cls] = original
+    return best / rows * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'entity':<24}{'no checks':>12}{'reflective':>12}{'compiled':>12}   (us/row)")
+    for entity_cls in ENTITIES:
+        values = sample_values(entity_cls)
+        entity_cls(*values)  # compile the validator outside the timed loop
+        none = time_construction(entity_cls, values, args.rows, lambda record: None)
+        reflective = time_construction(entity_cls, values, args.rows, reflective_validator)
+        compiled = time_construction(entity_cls, values, args.rows, None)
+        print(f"{entity_cls.__name__:<24}{none:>12.3f}{reflective:>12.3f}{compiled:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
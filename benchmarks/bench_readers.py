@@ -0,0 +1,89 @@
+"""
+Benchmark: generating Table B1 from a JSON extract on disk.
+
+Compares the list-based path (json.load the whole file, then generate_table)
+with the streaming readers of infrastructure/readers.py. Each mode runs in
+its own process so its peak RSS is measured in isolation.
+
+Usage:
+    python benchmarks/bench_readers.py [--rows 1000000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from peru_susalud_seti import SetiGenerationService
+from peru_susalud_seti.infrastructure import readers
+
+MODES = ("list", "json_lines", "json_array")
+
+
+def write_extract(directory, rows):
+    """Writes the same synthetic rows as a JSON array and as JSON lines."""
+    array_path = os.path.join(directory, "rows.json")
+    lines_path = os.path.join(directory, "rows.jsonl")
+    with open(array_path, "w", encoding="utf-8") as array, open(lines_path, "w", encoding="utf-8") as lines:
+        array.write("[\n")
+        for n in range(rows):
+            row = json.dumps({
+                "period": "202602", "ipress_code": "00001234", "ugipress_code": "00001234",
+                "ups_code": "301601", "age_group": str(n % 20), "gender": str(n % 2 + 1),
+                "total_patients": n % 50, "total_appointments": n % 70,
+                "poverty_level": "3", "funding_source": "4",
+            })
+            array.write(row + (",\n" if n < rows - 1 else "\n"))
+            lines.write(row + "\n")
+        array.write("]\n")
+    return array_path, lines_path
+
+
+def run_mode(mode, array_path, lines_path, output_dir):
+    """Generates the table once; prints elapsed seconds and peak RSS in MiB."""
+    started = time.perf_counter()
+    if mode == "list":
+        with open(array_path, encoding="utf-8") as f:
+            rows = json.load(f)
+    elif mode == "json_lines":
+        rows = readers.read_json_lines(lines_path)
+    else:
+        rows = readers.read_json_array(array_path)
+    SetiGenerationService().generate_table("B1", rows, output_dir)
+    elapsed = time.perf_counter() - started
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed} {peak_mib}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--paths", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, *args.paths)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        array_path, lines_path = write_extract(directory, args.rows)
+        parser_name = "orjson" if readers.orjson is not None else "json"
+        print(f"{args.rows} rows, JSON-lines parser: {parser_name}")
+        print(f"{'mode':<12}{'seconds':>10}{'rows/s':>12}{'peak MiB':>10}")
+        for mode in MODES:
+            output_dir = os.path.join(directory, mode)
+            os.mkdir(output_dir)
+            result = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--paths", array_path, lines_path, output_dir],
+                check=True, capture_output=True, text=True
+            )
+            elapsed, peak = map(float, result.stdout.split())
+            print(f"{mode:<12}{elapsed:>10.2f}{args.rows / elapsed:>12,.0f}{peak:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Benchmark suite: throughput and memory of the map -> validate -> format -> write pipeline.
+
+For every table and row count, a child process generates synthetic rows
+(seeded, so every run sees the same data) and times each stage on its own:
+
+    map       TableXMapper.map_batch, with entity validation switched off
+    validate  the compiled validator over the mapped entities
+    format    line rendering and cp1252 encoding (SetiFileWriter.encode_records)
+    write     writing the encoded file (SetiFileWriter.write_encoded)
+
+Each stage reports rows/s (best of --repeat samples), the peak RSS of the
+child process at the end of the stage and how much the stage raised it
+(the first stage is measured from the peak after generating the input). --save stores the results as a JSON
+baseline; --compare exits with status 1 when a stage runs slower than the
+baseline by more than --threshold.
+
+Usage:
+    python benchmarks/run.py [--sizes 10000 100000 1000000] [--tables B1 D2]
+                             [--save baseline.json] [--compare baseline.json --threshold 0.15]
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from peru_susalud_seti.application import mappers
+from peru_susalud_seti.application.services import _TABLE_MAPPERS
+from peru_susalud_seti.domain import models
+from peru_susalud_seti.infrastructure.writers import SetiFileWriter
+
+SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.15
+
+# Value pools per field (or per coercion kind), sized like real extracts.
+_FIELD_POOLS = {
+    "period": ["202602"],
+    "ipress_code": ["00001234"],
+    "ugipress_code": ["00001234"],
+    "ups_code": ["301601", "301602", "301603", "302101", "303301", "304401"],
+    "icd10_code": ["J189", "A09", "K359", "O800", "R509", "S610", "J00", "N390"],
+    "surveillance_code": ["I01", "I02", "E05", "E07"],
+    "budget_category": ["2.1", "2.3", "2.5", "2.6"],
+    "diagnosis_type": ["D", "P", "R"],
+}
+_KIND_POOLS = {
+    "text": ["X"],
+    "code": ["1", "2", "3", "4", "5"],
+    "age": [str(n) for n in range(1, 21)],
+    "upper": ["X"],
+    "flag": ["D"],
+}
+
+
+def synthetic_rows(table_id, rows, seed=0):
+    """Valid raw rows for table_id, built column by column from the mapper's columns."""
+    rng = random.Random(f"{table_id}:{seed}")
+    names, columns = [], []
+    for name, kind, _ in _TABLE_MAPPERS[table_id]._COLUMNS:
+        names.append(name)
+        if kind in ("int", "count"):
+            columns.append([rng.randrange(100) for _ in range(rows)])
+        elif kind == "float":
+            columns.append([round(rng.uniform(0, 10_000), 2) for _ in range(rows)])
+        else:
+            columns.append(rng.choices(_FIELD_POOLS.get(name, _KIND_POOLS[kind]), k=rows))
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+@contextmanager
+def validation_disabled(entity_cls):
+    """Replaces the entity's compiled validator with a no-op, as bench_models does."""
+    original = models._VALIDATORS.get(entity_cls)
+    models._VALIDATORS[entity_cls] = lambda record: None
+    try:
+        yield
+    finally:
+        if original is None:
+            models._VALIDATORS.pop(entity_cls, None)
+        else:
+            models._VALIDATORS[entity_cls] = original
+
+
+def best_time(func, repeat, min_time=0.2):
+    """
+    Best time per call over repeat samples, and the result of the last call.
+    Like timeit's autorange, each sample loops until it lasts min_time, so
+    small inputs are not dominated by timer noise.
+    """
+    started = time.perf_counter()
+    result = func()
+    loops = max(1, math.ceil(min_time / max(time.perf_counter() - started, 1e-9)))
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            result = func()
+        best = min(best, (time.perf_counter() - started) / loops)
+    return best, result
+
+
+def peak_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_stages(table_id, rows, repeat):
+    """Times every stage for one table and size; returns {stage: measurements}."""
+    mapper = _TABLE_MAPPERS[table_id]
+    entity_cls = mapper._ENTITY
+    data = synthetic_rows(table_id, rows)
+    writer = SetiFileWriter()
+    results = {}
+    previous_peak = peak_rss_mib()
+
+    def record(stage, seconds):
+        nonlocal previous_peak
+        peak = peak_rss_mib()
+        results[stage] = {"rows_per_s": rows / seconds, "peak_rss_mib": peak, "rss_growth_mib": peak - previous_peak}
+        previous_peak = peak
+
+    with validation_disabled(entity_cls):
+        seconds, batch = best_time(lambda: mapper.map_batch(data), repeat)
+    assert not batch.errors, batch.errors[:1]
+    records = batch.records
+    del data, batch
+    record("map", seconds)
+
+    validate = models._VALIDATORS.get(entity_cls) or models._compile_validator(entity_cls)
+    seconds, _ = best_time(lambda: deque(map(validate, records), maxlen=0), repeat)
+    record("validate", seconds)
+
+    seconds, encoded = best_time(lambda: writer.encode_records(records), repeat)
+    record("format", seconds)
+
+    filename = writer._get_file_metadata(records[0])[0]
+    with tempfile.TemporaryDirectory() as output_dir:
+        seconds, _ = best_time(lambda: writer.write_encoded([(filename, encoded)], output_dir), repeat)
+    record("write", seconds)
+    return results
+
+
+def run_all(tables, sizes, repeat):
+    """Runs every (table, size) in its own process so RSS figures do not mix."""
+    results = []
+    for table_id in tables:
+        for rows in sizes:
+            child = subprocess.run(
+                [sys.executable, __file__, "--child", table_id, str(rows), "--repeat", str(repeat)],
+                check=True, capture_output=True, text=True
+            )
+            for stage, measured in json.loads(child.stdout).items():
+                results.append({"table": table_id, "rows": rows, "stage": stage, **measured})
+                print(
+                    f"{table_id:<6}{rows:>10}  {stage:<10}{measured['rows_per_s']:>14,.0f}"
+                    f"{measured['peak_rss_mib']:>12.0f}{measured['rss_growth_mib']:>10.0f}", flush=True
+                )
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": mappers._numpy() is not None,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Returns a message per stage whose rows/s fell more than threshold below the baseline."""
+    previous = {(r["table"], r["rows"], r["stage"]): r["rows_per_s"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        before = previous.get((r["table"], r["rows"], r["stage"]))
+        if before is None:
+            continue
+        change = r["rows_per_s"] / before - 1
+        if change < -threshold:
+            regressions.append(
+                f"{r['table']} {r['rows']} {r['stage']}: {r['rows_per_s']:,.0f} rows/s, "
+                f"{change:+.1%} vs {before:,.0f}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--tables", nargs="+", choices=list(_TABLE_MAPPERS), default=list(_TABLE_MAPPERS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (default 0.15)")
+    parser.add_argument("--child", nargs=2, metavar=("TABLE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        table_id, rows = args.child
+        print(json.dumps(run_stages(table_id, int(rows), args.repeat)))
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'table':<6}{'rows':>10}  {'stage':<10}{'rows/s':>14}{'peak MiB':>12}{'+MiB':>10}")
+    results = run_all(args.tables, args.sizes, args.repeat)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"No stage slower than the baseline by more than {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
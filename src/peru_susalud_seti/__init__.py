@@ -1,5 +1,57 @@
-from .application.services import SetiGenerationService
-from .domain.types import Observer
+from importlib import import_module
+
+# typing.TYPE_CHECKING without importing typing: type checkers treat the
+# name as True and see the real imports, the interpreter skips them.
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from .application.aggregation import GroupingStrategy, aggregate_encounters
+    from .application.async_services import AsyncSetiGenerationService
+    from .application.duplicates import DuplicateCheck, DuplicatePolicy
+    from .application.metrics import GenerationResult, InMemoryMetricsSink, MetricsSink, PrometheusTextfileSink, TableMetrics
+    from .application.profiling import Profiling
+    from .application.services import CatalogValidation, ErrorAggregation, SetiGenerationService
+    from .domain.types import Backpressure, Observer
+    from .infrastructure.cache import GenerationCache
+    from .infrastructure.catalogs import CodeCatalog
 
 __version__ = "0.1.0"
-__all__ = ["SetiGenerationService", "Observer"]
\ No newline at end of file
+
+# Public name -> module defining it. Names are imported on first access
+# (PEP 562), so `import peru_susalud_seti` loads none of the library and a
+# caller only pays for the parts it uses (asyncio, NumPy, mappers, ...).
+_EXPORTS = {
+    "SetiGenerationService": ".application.services",
+    "AsyncSetiGenerationService": ".application.async_services",
+    "ErrorAggregation": ".application.services",
+    "GenerationCache": ".infrastructure.cache",
+    "CatalogValidation": ".application.services",
+    "CodeCatalog": ".infrastructure.catalogs",
+    "DuplicateCheck": ".application.duplicates",
+    "DuplicatePolicy": ".application.duplicates",
+    "GroupingStrategy": ".application.aggregation",
+    "aggregate_encounters": ".application.aggregation",
+    "GenerationResult": ".application.metrics",
+    "TableMetrics": ".application.metrics",
+    "MetricsSink": ".application.metrics",
+    "InMemoryMetricsSink": ".application.metrics",
+    "PrometheusTextfileSink": ".application.metrics",
+    "Profiling": ".application.profiling",
+    "Observer": ".domain.types",
+    "Backpressure": ".domain.types",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Later lookups find the name in the module dict and skip this hook.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,263 @@
+import heapq
+import pickle
+import tempfile
+from enum import Enum
+from itertools import groupby
+from operator import itemgetter
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from . import mappers
+from .mappers import _COERCIONS, TableB1Mapper, TableB2Mapper, TableD1Mapper, TableGMapper, TableHMapper, TableIMapper
+
+# NumPy module or None, imported by _numpy() on the first SORT grouping.
+np: Any = mappers._NOT_LOADED
+
+
+def _numpy() -> Any:
+    global np
+    if np is mappers._NOT_LOADED:
+        np = mappers._numpy()
+    return np
+
+# Encounter field identifying the patient; encounters without it count as
+# one patient each.
+PATIENT_FIELD = "patient_id"
+DEFAULT_MAX_GROUPS = 1_000_000
+
+# Records pickled per write when spilling a sorted run to disk.
+_SPILL_BLOCK = 10_000
+
+# (group, patient, encounters, value): the partial aggregate of one patient in one group
+_Record = Tuple[Tuple[str, ...], str, int, int]
+
+
+class GroupingStrategy(str, Enum):
+    """How aggregate_encounters groups the encounters."""
+    HASH = "hash"  # Dict accumulators; spills sorted runs past max_groups
+    SORT = "sort"  # Sort all encounters at once (NumPy lexsort when installed)
+
+
+class _TableSpec(NamedTuple):
+    mapper: Any
+    group_fields: Tuple[str, ...]
+    patients_field: str
+    count_field: str
+    value_field: Optional[str]  # encounter field summed into count_field; None counts encounters
+
+
+_PRODUCTION_GROUP = ("period", "ipress_code", "ugipress_code", "ups_code", "age_group", "gender", "poverty_level", "funding_source")
+
+_TABLE_SPECS: Dict[str, _TableSpec] = {
+    "B1": _TableSpec(TableB1Mapper, _PRODUCTION_GROUP, "total_patients", "total_appointments", None),
+    "B2": _TableSpec(TableB2Mapper, _PRODUCTION_GROUP + ("priority", "destination"), "total_patients", "total_appointments", None),
+    "D1": _TableSpec(TableD1Mapper, _PRODUCTION_GROUP, "total_patients", "total_appointments", None),
+    "G": _TableSpec(TableGMapper, _PRODUCTION_GROUP, "total_patients", "total_procedures", "procedures"),
+    "H": _TableSpec(TableHMapper, _PRODUCTION_GROUP, "total_patients", "total_interventions", "interventions"),
+    "I": _TableSpec(TableIMapper, _PRODUCTION_GROUP, "total_patients", "total_referrals", "referrals"),
+}
+
+
+def _compile_group_key(spec: _TableSpec) -> Callable[[Dict[str, Any]], Tuple[str, ...]]:
+    """
+    Builds one function extracting the group of an encounter. Values go
+    through the mapper's own coercions, so '1' and '01' land in the same
+    age group.
+    """
+    columns = {name: (kind, default) for name, kind, default in spec.mapper._COLUMNS}
+    namespace = {f"c{i}": _COERCIONS[columns[name][0]] for i, name in enumerate(spec.group_fields)}
+    parts = [f"c{i}(e.get({name!r}, {columns[name][1]!r}))" for i, name in enumerate(spec.group_fields)]
+    source = "lambda e: (" + ", ".join(parts) + ",)"
+    return eval(compile(source, f"<seti-group-key {spec.count_field}>", "eval"), namespace)
+
+
+def _records(spec: _TableSpec, encounters: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Tuple[str, ...], str, int]]:
+    """Yields (group, patient, value) per encounter."""
+    group_key = _compile_group_key(spec)
+    value_field = spec.value_field
+
+    for number, encounter in enumerate(encounters, start=1):
+        try:
+            group = group_key(encounter)
+            patient = encounter.get(PATIENT_FIELD)
+            value = 1 if value_field is None else int(encounter.get(value_field, 1))
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"Atención {number}: {e}") from None
+        yield group, "" if patient is None else str(patient), value
+
+
+def _reduce_sorted(records: Iterable[_Record]) -> Iterator[Tuple[Tuple[str, ...], int, int, int]]:
+    """
+    Folds records sorted by (group, patient) into (group, patients,
+    encounters, value) in one pass and O(1) memory. Encounters without a
+    patient id ('') count one patient each.
+    """
+    for group, items in groupby(records, key=itemgetter(0)):
+        patients = encounters = value = 0
+        last_patient = None
+        for _, patient, count, amount in items:
+            if patient == "":
+                patients += count
+            elif patient != last_patient:
+                patients += 1
+            last_patient = patient
+            encounters += count
+            value += amount
+        yield group, patients, encounters, value
+
+
+class _SpilledRuns:
+    """Sorted runs of records written to temporary files and merged back lazily."""
+
+    def __init__(self, spill_dir: Optional[str]) -> None:
+        self._spill_dir = spill_dir
+        self._files: List[IO[bytes]] = []
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def spill(self, records: List[_Record]) -> None:
+        f = tempfile.TemporaryFile(dir=self._spill_dir)
+        self._files.append(f)
+        for start in range(0, len(records), _SPILL_BLOCK):
+            pickle.dump(records[start:start + _SPILL_BLOCK], f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.seek(0)
+
+    @staticmethod
+    def _read(f: IO[bytes]) -> Iterator[_Record]:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                return
+            yield from block
+
+    def merge(self, remainder: List[_Record]) -> Iterator[_Record]:
+        """Merges every run and the in-memory remainder, all sorted."""
+        return heapq.merge(*(self._read(f) for f in self._files), remainder)
+
+    def close(self) -> None:
+        for f in self._files:
+            f.close()
+        self._files.clear()
+
+
+def _group_hash(records: Iterable[Tuple[Tuple[str, ...], str, int]], max_groups: int, spill_dir: Optional[str]) -> Iterator[Tuple[Tuple[str, ...], int, int, int]]:
+    """
+    Accumulates per (group, patient) in a dict. Whenever it holds more than
+    max_groups entries they are spilled as a sorted run, and the runs are
+    merged back in one streaming pass at the end.
+    """
+    pairs: Dict[Tuple[Tuple[str, ...], str], List[int]] = {}
+    runs = _SpilledRuns(spill_dir)
+
+    def drain() -> List[_Record]:
+        drained = sorted((group, patient, totals[0], totals[1]) for (group, patient), totals in pairs.items())
+        pairs.clear()
+        return drained
+
+    try:
+        for group, patient, value in records:
+            # Anonymous encounters ('') share one entry; _reduce_sorted
+            # still counts each of them as a patient.
+            key = (group, patient)
+            totals = pairs.get(key)
+            if totals is None:
+                if len(pairs) >= max_groups:
+                    runs.spill(drain())
+                pairs[key] = [1, value]
+            else:
+                totals[0] += 1
+                totals[1] += value
+
+        if len(runs):
+            yield from _reduce_sorted(runs.merge(drain()))
+            return
+
+        # Everything fit in memory: fold the pairs per group and sort only the groups.
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for (group, patient), (count, value) in pairs.items():
+            totals = groups.get(group)
+            if totals is None:
+                totals = groups[group] = [0, 0, 0]
+            totals[0] += count if patient == "" else 1
+            totals[1] += count
+            totals[2] += value
+        for group in sorted(groups):
+            yield (group, *groups[group])
+    finally:
+        runs.close()
+
+
+def _group_sort(records: Iterable[Tuple[Tuple[str, ...], str, int]]) -> Iterator[Tuple[Tuple[str, ...], int, int, int]]:
+    """Sorts every encounter by (group, patient), with NumPy when installed."""
+    np = _numpy()
+    if np is None:
+        yield from _reduce_sorted(sorted((group, patient, 1, value) for group, patient, value in records))
+        return
+
+    groups, patients, values = [], [], []
+    for group, patient, value in records:
+        groups.append(group)
+        patients.append(patient)
+        values.append(value)
+    if not groups:
+        return
+
+    # Integer codes in key order, so sorting codes sorts the keys.
+    unique_groups = sorted(set(groups))
+    group_codes = dict(zip(unique_groups, range(len(unique_groups))))
+    unique_patients = sorted(set(patients))
+    patient_codes = dict(zip(unique_patients, range(len(unique_patients))))
+    g = np.fromiter(map(group_codes.__getitem__, groups), dtype=np.int64, count=len(groups))
+    p = np.fromiter(map(patient_codes.__getitem__, patients), dtype=np.int64, count=len(patients))
+    v = np.asarray(values, dtype=np.int64)
+
+    order = np.lexsort((p, g))
+    g, p, v = g[order], p[order], v[order]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    new_pair = np.r_[True, (g[1:] != g[:-1]) | (p[1:] != p[:-1])]
+    # Anonymous encounters ('' sorts first, code 0) are one patient each.
+    anonymous = patient_codes.get("")
+    if anonymous is not None:
+        new_pair |= p == anonymous
+
+    counted = np.add.reduceat(new_pair.astype(np.int64), starts)
+    encounters = np.diff(np.r_[starts, len(g)])
+    sums = np.add.reduceat(v, starts)
+    for code, patients_count, encounter_count, value in zip(g[starts].tolist(), counted.tolist(), encounters.tolist(), sums.tolist()):
+        yield unique_groups[code], patients_count, encounter_count, value
+
+
+def aggregate_encounters(table_id: str, encounters: Iterable[Dict[str, Any]], strategy: GroupingStrategy = GroupingStrategy.HASH, max_groups: int = DEFAULT_MAX_GROUPS, spill_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Rolls encounter-level rows (one per attention, with a patient_id) up to
+    the grouped rows of a production table (B1, B2, D1, G, H, I), ready for
+    generate_table. total_patients counts distinct patients per group; the
+    second count adds up the encounters or, for G, H and I, their
+    procedures, interventions or referrals (1 when absent).
+    Groups are yielded sorted by key, with the same result for every
+    strategy. With HASH, past max_groups (group, patient) entries the
+    partial aggregates are spilled to temporary files in spill_dir and
+    merged back, so memory stays bounded whatever the cardinality.
+    """
+    spec = _TABLE_SPECS.get(table_id)
+    if spec is None:
+        raise ValueError(f"La tabla {table_id} no admite agregación de atenciones.")
+    strategy = GroupingStrategy(strategy)
+    if max_groups < 1:
+        raise ValueError("max_groups debe ser mayor a cero.")
+
+    records = _records(spec, encounters)
+    if strategy is GroupingStrategy.SORT:
+        grouped = _group_sort(records)
+    else:
+        grouped = _group_hash(records, max_groups, spill_dir)
+    return _table_rows(spec, grouped)
+
+
+def _table_rows(spec: _TableSpec, grouped: Iterable[Tuple[Tuple[str, ...], int, int, int]]) -> Iterator[Dict[str, Any]]:
+    names = spec.group_fields
+    for group, patients, encounters, value in grouped:
+        row = dict(zip(names, group))
+        row[spec.patients_field] = patients
+        row[spec.count_field] = encounters if spec.value_field is None else value
+        yield row
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import abc
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from ..domain.types import Subject
+from ..infrastructure.writers import SetiFileWriter
+from .services import _TABLE_MAPPERS, CatalogValidation, ErrorAggregation, TableRunResult, _ErrorReport, _map_chunk_in_worker
+
+Rows = Union[AsyncIterable[Dict[str, Any]], Iterable[Dict[str, Any]]]
+
+
+async def _achunked(raw_data: Rows, size: int) -> AsyncIterator[Tuple[int, List[Any]]]:
+    """Async counterpart of services._chunked; also accepts plain iterables."""
+    offset = 0
+    chunk: List[Any] = []
+    if isinstance(raw_data, abc.AsyncIterable):
+        async for row in raw_data:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield offset, chunk
+                offset, chunk = offset + len(chunk), []
+    else:
+        for row in raw_data:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield offset, chunk
+                offset, chunk = offset + len(chunk), []
+    if chunk:
+        yield offset, chunk
+
+
+async def _run_in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs a blocking call in its own thread. Unlike asyncio.to_thread it does
+    not hold a default-executor worker, which mapping jobs may need meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result: Any, error: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target() -> None:
+        # The outcome is passed by value: 'except ... as e' unbinds e on exit.
+        try:
+            result, error = func(*args), None
+        except BaseException as e:
+            result, error = None, e
+        loop.call_soon_threadsafe(settle, result, error)
+
+    threading.Thread(target=target, name="seti-async-writer", daemon=True).start()
+    return await future
+
+
+class AsyncSetiGenerationService(Subject):
+    """
+    asyncio-native counterpart of SetiGenerationService for async
+    applications. Rows may come from async iterables; mapping and cp1252
+    encoding run in an executor chunk by chunk, and the file is written
+    from a separate thread, so the event loop is never blocked.
+    At most max_concurrency tables are generated at the same time.
+    """
+
+    def __init__(self, writer: Optional[SetiFileWriter] = None, error_aggregation: Optional[ErrorAggregation] = None, executor: Optional[Executor] = None, max_concurrency: int = 4, catalogs: Optional[CatalogValidation] = None):
+        super().__init__()
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser mayor a cero.")
+        self._writer = writer or SetiFileWriter()
+        self._error_aggregation = error_aggregation
+        self._executor = executor
+        self._catalogs = catalogs
+        self._mappers = _TABLE_MAPPERS
+        self._max_concurrency = max_concurrency
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    async def agenerate_table(self, table_id: str, raw_data: Rows, output_dir: str, chunk_size: int = 1000) -> str:
+        """
+        Validates and generates a specific TXT table from sync or async rows.
+        Produces the same file and the same "Fila N" errors as generate_table.
+        """
+        if table_id not in self._mappers:
+            raise ValueError(f"La tabla {table_id} no está soportada actualmente.")
+
+        async with self._semaphore():
+            self.notify("START", f"Iniciando proceso asíncrono para Tabla {table_id}")
+
+            try:
+                report = _ErrorReport(self, self._error_aggregation)
+                file_path = await self._write_chunks(table_id, raw_data, report, output_dir, chunk_size)
+                report.summarize(table_id)
+
+                if file_path is None:
+                    raise ValueError(f"No hay registros válidos para la Tabla {table_id}")
+
+                self.notify("SUCCESS", f"Archivo {table_id} generado en {file_path}")
+            except BaseException:
+                await asyncio.get_running_loop().run_in_executor(None, self.flush, False)
+                raise
+            await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+        return file_path
+
+    async def agenerate_all(self, tables: Mapping[str, Rows], output_dir: str, chunk_size: int = 1000) -> Dict[str, TableRunResult]:
+        """
+        Generates several tables concurrently, up to max_concurrency at once.
+        If any table fails, its error is raised once every table has finished.
+        """
+        for table_id in tables:
+            if table_id not in self._mappers:
+                raise ValueError(f"La tabla {table_id} no está soportada actualmente.")
+
+        async def timed(table_id: str, rows: Rows) -> TableRunResult:
+            started = time.perf_counter()
+            file_path = await self.agenerate_table(table_id, rows, output_dir, chunk_size)
+            return TableRunResult(table_id, file_path, time.perf_counter() - started)
+
+        outcomes = await asyncio.gather(
+            *(timed(table_id, rows) for table_id, rows in tables.items()), return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        return {result.table_id: result for result in outcomes}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit of the running loop (asyncio primitives are per loop)."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        return semaphore
+
+    async def _write_chunks(self, table_id: str, raw_data: Rows, report: _ErrorReport, output_dir: str, chunk_size: int) -> Optional[str]:
+        """
+        Drives SetiFileWriter.write_encoded from a writer thread. Each chunk
+        the writer pulls is read and mapped on the loop side, so reading the
+        source, mapping and writing overlap without blocking the loop.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = _achunked(raw_data, chunk_size)
+        cancelled = threading.Event()
+
+        async def next_chunk() -> Optional[Tuple[Optional[str], bytes]]:
+            try:
+                offset, chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                return None
+            filename, data, errors = await loop.run_in_executor(self._executor, _map_chunk_in_worker, table_id, chunk, self._catalogs)
+            for index, error in errors:
+                report.add(offset + index + 1, error)
+            return filename, data
+
+        def pull() -> Iterable[Tuple[Optional[str], bytes]]:
+            while True:
+                if cancelled.is_set():
+                    raise asyncio.CancelledError()
+                encoded = asyncio.run_coroutine_threadsafe(next_chunk(), loop).result()
+                if encoded is None:
+                    return
+                yield encoded
+
+        try:
+            return await _run_in_thread(self._writer.write_encoded, pull(), output_dir)
+        except asyncio.CancelledError:
+            # The writer thread stops at its next pull and discards its temp file.
+            cancelled.set()
+            raise
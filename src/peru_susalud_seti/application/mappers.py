@@ -1,313 +1,368 @@
-from typing import Dict, Any
-from ..domain.models import (
-    HealthResourceTableA,
-    OutpatientTableB1, 
-    EmergencyTableB2,
-    InpatientTableC1,
-    StayTableC2,
-    EmergencyProductionD1,
-    EmergencyMorbidityD2,
-    ChildbirthTableE,
-    SurveillanceTableF,
-    ProceduresTableG,
-    SurgeryTableH,
-    ReferralTableI,
-    ExpenditureTableJ
-)
-
-class TableAMapper:
+import sys
+from collections import abc
+from dataclasses import fields
+from operator import methodcaller
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
+from ..domain.schema import SCHEMAS, TableSchema
+
+# NumPy is an optional accelerator, imported by _numpy() on the first
+# column that could use it rather than with the package.
+_NOT_LOADED: Any = object()
+np: Any = _NOT_LOADED
+
+
+def _numpy() -> Any:
+    """The numpy module, or None when it is not installed."""
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+            numpy = None
+        np = numpy
+    return np
+
+
+def _to_int_or_zero(val: Any) -> int:
+    if val is None or val == "":
+        return 0
+    return int(val)
+
+
+# Distinct values kept per code normalizer; later values are still
+# normalized and interned, just not cached.
+_CODE_CACHE_SIZE = 4096
+
+
+class _CodeCache(dict):
     """
-    Translates raw dictionary data (from JSON input) into valid Domain Entities.
+    Memoized, interned normalization of a low-cardinality code field
+    (period, IPRESS, UPS, gender, ...). cache[value] returns one shared
+    string object per distinct code, so a million entities hold a few
+    dozen strings, and a repeated code costs a single dict lookup.
+    Only str and int inputs are cached: 1, 1.0 and True are equal dict
+    keys but normalize to different strings. Unhashable values raise
+    TypeError, which the mappers report as a row error.
     """
+    __slots__ = ("_normalize", "_numbers")
 
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> HealthResourceTableA:
-        """
-        Maps a single dictionary row to a HealthResourceTableA entity.
-        """
-        try:
-            def to_int(val: Any) -> int:
-                if val is None or val == "":
-                    return 0
-                return int(val)
-
-            return HealthResourceTableA(
-                # Usamos llaves en inglés para consistencia con el código
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                
-                physical_consulting_rooms=to_int(data.get("physical_consulting_rooms")),
-                functional_consulting_rooms=to_int(data.get("functional_consulting_rooms")),
-                hospital_beds=to_int(data.get("hospital_beds")),
-                total_physicians=to_int(data.get("total_physicians")),
-                serums_physicians=to_int(data.get("serums_physicians")),
-                resident_physicians=to_int(data.get("resident_physicians")),
-                nurses=to_int(data.get("nurses")),
-                dentists=to_int(data.get("dentists")),
-                psychologists=to_int(data.get("psychologists")),
-                nutritionists=to_int(data.get("nutritionists")),
-                medical_technologists=to_int(data.get("medical_technologists")),
-                midwives=to_int(data.get("midwives")),
-                pharmacists=to_int(data.get("pharmacists")),
-                support_staff=to_int(data.get("support_staff")),
-                other_professionals=to_int(data.get("other_professionals")),
-                operative_ambulances=to_int(data.get("operative_ambulances"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaA: {str(e)}")
-
-
-
-class TableB1Mapper:
+    def __init__(self, normalize: Callable[[Any], str]) -> None:
+        super().__init__()
+        self._normalize = normalize
+        self._numbers: Dict[int, str] = {}
+
+    def __missing__(self, value: Any) -> str:
+        kind = type(value)
+        if kind is int:
+            result = self._numbers.get(value)
+            if result is not None:
+                return result
+        result = sys.intern(self._normalize(value))
+        if kind is str:
+            if len(self) < _CODE_CACHE_SIZE:
+                self[value] = result
+        elif kind is int and len(self._numbers) < _CODE_CACHE_SIZE:
+            self._numbers[value] = result
+        return result
+
+
+_TEXT = _CodeCache(lambda v: str(v).strip())
+_CODE = _CodeCache(str)
+_AGE = _CodeCache(lambda v: str(v).zfill(2))
+_UPPER = _CodeCache(lambda v: str(v).strip().upper())
+_FLAG = _CodeCache(lambda v: str(v).upper())
+
+# Per-value coercions, mirroring exactly what the hand-written mappers do.
+_COERCIONS: Dict[str, Callable[[Any], Any]] = {
+    "text": _TEXT.__getitem__,
+    "code": _CODE.__getitem__,
+    "age": _AGE.__getitem__,
+    "upper": _UPPER.__getitem__,
+    "flag": _FLAG.__getitem__,
+    "int": int,
+    "count": _to_int_or_zero,
+    "float": float,
+}
+
+
+def _coerce_int_column(values: Sequence[Any]) -> List[Any]:
     """
-    Translates raw dictionary data into OutpatientTableB1 entities.
+    Vectorized int() for a column. NumPy is only trusted with inputs that are
+    already numeric; anything else (strings, None, mixed) goes through int().
     """
+    np = _numpy()
+    if np is not None:
+        array = np.asarray(values)
+        if array.dtype.kind in "iu":
+            return array.tolist()
+        if array.dtype.kind == "b":
+            return array.astype(np.int64).tolist()
+        if array.dtype.kind == "f" and np.isfinite(array).all() and (np.abs(array) < 2 ** 63).all():
+            return np.trunc(array).astype(np.int64).tolist()
+    return list(map(int, values))
 
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> OutpatientTableB1:
-        """
-        Maps dictionary to OutpatientTableB1 (TBB1).
-        """
-        try:
-            return OutpatientTableB1(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_appointments=int(data.get("total_appointments", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaB1: {str(e)}")
-
-class TableB2Mapper:
+
+# Whole-column versions of _COERCIONS, chained through C-level map().
+_COLUMN_COERCIONS: Dict[str, Callable[[Sequence[Any]], List[Any]]] = {
+    "text": lambda values: list(map(_TEXT.__getitem__, values)),
+    "code": lambda values: list(map(_CODE.__getitem__, values)),
+    "age": lambda values: list(map(_AGE.__getitem__, values)),
+    "upper": lambda values: list(map(_UPPER.__getitem__, values)),
+    "flag": lambda values: list(map(_FLAG.__getitem__, values)),
+    "int": _coerce_int_column,
+    "count": lambda values: list(map(_to_int_or_zero, values)),
+    "float": lambda values: list(map(float, values)),
+}
+
+
+# Inline expression of each coercion in a generated map_from_dict: the code
+# caches are subscripted directly, the same lookup their __getitem__ makes.
+_EXPRESSIONS: Dict[str, str] = {
+    "text": "_TEXT[{}]",
+    "code": "_CODE[{}]",
+    "age": "_AGE[{}]",
+    "upper": "_UPPER[{}]",
+    "flag": "_FLAG[{}]",
+    "int": "int({})",
+    "count": "_to_int_or_zero({})",
+    "float": "float({})",
+}
+
+
+def _compile_map_from_dict(schema: TableSchema) -> Callable[[Dict[str, Any]], Any]:
     """
-    Translates raw dictionary data into EmergencyTableB2 entities.
+    Builds the map_from_dict of a table from its schema: one straight-line
+    function that reads, normalizes and passes each column to the entity
+    constructor. Any coercion or validation error is reported as
+    'Error en mapeo Tabla<id>: ...'.
     """
+    arguments = [
+        _EXPRESSIONS[column.kind].format(f"data.get({column.name!r}, {column.default!r})")
+        for column in schema.entity_columns()
+    ]
+    source = (
+        "def map_from_dict(data):\n"
+        "    try:\n"
+        f"        return ENTITY({', '.join(arguments)})\n"
+        "    except (ValueError, TypeError, AttributeError) as e:\n"
+        f"        raise ValueError(f\"Error en mapeo Tabla{schema.table_id}: {{str(e)}}\")\n"
+    )
+    namespace = {
+        "ENTITY": schema.entity_class, "_TEXT": _TEXT, "_CODE": _CODE, "_AGE": _AGE,
+        "_UPPER": _UPPER, "_FLAG": _FLAG, "_to_int_or_zero": _to_int_or_zero,
+    }
+    exec(compile(source, f"<seti-mapper {schema.table_id}>", "exec"), namespace)
+    return namespace["map_from_dict"]
 
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> EmergencyTableB2:
-        """
-        Maps dictionary to EmergencyTableB2 (TBB2).
-        """
-        try:
-            return EmergencyTableB2(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_appointments=int(data.get("total_appointments", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4")),
-                priority=str(data.get("priority", "3")),
-                destination=str(data.get("destination", "1"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaB2: {str(e)}")
-
-
-class TableC1Mapper:
+
+class _CompiledMapFromDict:
     """
-    Translates raw dictionary data into InpatientTableC1 entities.
+    Class attribute standing for a mapper's map_from_dict until its first
+    use, when the function is compiled from the schema and replaces it, so
+    only the tables actually mapped pay for compilation.
     """
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> InpatientTableC1:
-        try:
-            return InpatientTableC1(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_appointments=int(data.get("total_appointments", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4")),
-                exit_type=str(data.get("exit_type", "1"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaC1: {str(e)}")
-
-class TableC2Mapper:
+
+    def __get__(self, instance: Any, owner: type) -> Callable[[Dict[str, Any]], Any]:
+        map_from_dict = _compile_map_from_dict(owner._SCHEMA)
+        map_from_dict.__qualname__ = f"{owner.__qualname__}.map_from_dict"
+        setattr(owner, "map_from_dict", staticmethod(map_from_dict))
+        return map_from_dict
+
+
+class BatchResult(NamedTuple):
+    """Entities mapped from a batch plus the (row index, error) of each rejected row."""
+    records: List[Any]
+    errors: List[Tuple[int, Exception]]
+
+
+def _coerce_column(kind: str, values: Sequence[Any]) -> Tuple[List[Any], Set[int]]:
     """
-    Translates raw dictionary data into StayTableC2 entities.
+    Coerces a whole column at once. Returns the converted values and the set
+    of positions that failed; those positions hold None.
     """
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> StayTableC2:
+    try:
+        return _COLUMN_COERCIONS[kind](values), set()
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        pass
+
+    coerce = _COERCIONS[kind]
+    converted: List[Any] = []
+    failed = set()
+    for index, value in enumerate(values):
         try:
-            return StayTableC2(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_appointments=int(data.get("total_appointments", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4")),
-                stay_days=int(data.get("stay_days", 0))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaC2: {str(e)}")
-
-
-class TableD1Mapper:
+            converted.append(coerce(value))
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            converted.append(None)
+            failed.add(index)
+    return converted, failed
+
+
+# Table id -> mapper class, filled as mapper classes are defined.
+_MAPPERS: Dict[str, type] = {}
+
+
+class _BatchMapper:
+    """
+    Base of the table mappers, generated from the table schema a subclass
+    names in _TABLE: _ENTITY is the target entity, _COLUMNS the (field,
+    coercion, default) of each column in constructor order, map_from_dict
+    maps one row and map_batch maps rows column by column.
+    """
+    _TABLE: str
+    _SCHEMA: TableSchema
+    _ENTITY: type
+    _COLUMNS: Tuple[Tuple[str, str, Any], ...]
+
+    map_from_dict = _CompiledMapFromDict()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "_TABLE" not in cls.__dict__:
+            return
+        cls._SCHEMA = SCHEMAS[cls._TABLE]
+        cls._ENTITY = cls._SCHEMA.entity_class
+        cls._COLUMNS = tuple(tuple(column) for column in cls._SCHEMA.entity_columns())
+        _MAPPERS[cls._TABLE] = cls
+
+    @classmethod
+    def map_batch(cls, rows: Union[Sequence[Any], Mapping[str, Sequence[Any]]]) -> BatchResult:
+        """
+        Maps a list of row dicts, or a dict of columns, coercing column by
+        column. Rows that fail are re-mapped with map_from_dict so the
+        reported error is exactly the one a row-by-row run would give.
+        """
+        failed: Set[int] = set()
+
+        if isinstance(rows, abc.Mapping):
+            sizes = {len(column) for column in rows.values()}
+            if len(sizes) > 1:
+                raise ValueError(f"Las columnas deben tener la misma longitud; se recibieron longitudes {sorted(sizes)}.")
+            size = sizes.pop() if sizes else 0
+            columnar = rows
+            row_at = lambda i: {name: column[i] for name, column in columnar.items()}
+            raw_columns = [
+                columnar[name] if name in columnar else [default] * size
+                for name, kind, default in cls._COLUMNS
+            ]
+        else:
+            rows = rows if isinstance(rows, list) else list(rows)
+            row_at = rows.__getitem__
+            try:
+                raw_columns = [
+                    list(map(methodcaller("get", name, default), rows))
+                    for name, kind, default in cls._COLUMNS
+                ]
+            except AttributeError:
+                failed = {i for i, row in enumerate(rows) if not isinstance(row, abc.Mapping)}
+                usable = [{} if i in failed else row for i, row in enumerate(rows)]
+                raw_columns = [
+                    [row.get(name, default) for row in usable]
+                    for name, kind, default in cls._COLUMNS
+                ]
+
+        converted = {}
+        for (name, kind, default), values in zip(cls._COLUMNS, raw_columns):
+            converted[name], column_failed = _coerce_column(kind, values)
+            failed |= column_failed
+
+        entity = cls._ENTITY
+        field_columns = [converted[f.name] for f in fields(entity)]
+
+        if not failed:
+            try:
+                return BatchResult(list(map(entity, *field_columns)), [])
+            except Exception:
+                pass
+
+        records: List[Any] = []
+        errors: List[Tuple[int, Exception]] = []
+        for index, values in enumerate(zip(*field_columns)):
+            if index not in failed:
+                try:
+                    records.append(entity(*values))
+                    continue
+                except Exception:
+                    pass
+            try:
+                records.append(cls.map_from_dict(row_at(index)))
+            except Exception as e:
+                errors.append((index, e))
+
+        return BatchResult(records, errors)
+
+
+class TableAMapper(_BatchMapper):
+    """Translates raw dictionary data (from JSON input) into HealthResourceTableA entities."""
+    _TABLE = "A"
+
+
+class TableB1Mapper(_BatchMapper):
+    """Translates raw dictionary data into OutpatientTableB1 entities."""
+    _TABLE = "B1"
+
+
+class TableB2Mapper(_BatchMapper):
+    """Translates raw dictionary data into EmergencyTableB2 entities."""
+    _TABLE = "B2"
+
+
+class TableC1Mapper(_BatchMapper):
+    """Translates raw dictionary data into InpatientTableC1 entities."""
+    _TABLE = "C1"
+
+
+class TableC2Mapper(_BatchMapper):
+    """Translates raw dictionary data into StayTableC2 entities."""
+    _TABLE = "C2"
+
+
+class TableD1Mapper(_BatchMapper):
     """Translates raw dictionary data into EmergencyProductionD1 entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> EmergencyProductionD1:
-        try:
-            return EmergencyProductionD1(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_appointments=int(data.get("total_appointments", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaD1: {str(e)}")
-
-class TableD2Mapper:
+    _TABLE = "D1"
+
+
+class TableD2Mapper(_BatchMapper):
     """Translates raw dictionary data into EmergencyMorbidityD2 entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> EmergencyMorbidityD2:
-        try:
-            return EmergencyMorbidityD2(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                icd10_code=str(data.get("icd10_code", "")).strip().upper(),
-                diagnosis_type=str(data.get("diagnosis_type", "D")).upper(),
-                total_cases=int(data.get("total_cases", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaD2: {str(e)}")
-
-
-class TableEMapper:
+    _TABLE = "D2"
+
+
+class TableEMapper(_BatchMapper):
     """Translates raw dictionary data into ChildbirthTableE entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> ChildbirthTableE:
-        try:
-            return ChildbirthTableE(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                total_deliveries=int(data.get("total_deliveries", 0)),
-                complicated_deliveries=int(data.get("complicated_deliveries", 0)),
-                live_births=int(data.get("live_births", 0)),
-                still_births=int(data.get("still_births", 0))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaE: {str(e)}")
-
-class TableFMapper:
+    _TABLE = "E"
+
+
+class TableFMapper(_BatchMapper):
     """Translates raw dictionary data into SurveillanceTableF entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> SurveillanceTableF:
-        try:
-            return SurveillanceTableF(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                surveillance_code=str(data.get("surveillance_code", "")).strip().upper(),
-                event_count=int(data.get("event_count", 0))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaF: {str(e)}")        
-
-class TableGMapper:
+    _TABLE = "F"
+
+
+class TableGMapper(_BatchMapper):
     """Translates raw dictionary data into ProceduresTableG entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> ProceduresTableG:
-        try:
-            return ProceduresTableG(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_procedures=int(data.get("total_procedures", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaG: {str(e)}")
-
-class TableHMapper:
+    _TABLE = "G"
+
+
+class TableHMapper(_BatchMapper):
     """Translates raw dictionary data into SurgeryTableH entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> SurgeryTableH:
-        try:
-            return SurgeryTableH(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_interventions=int(data.get("total_interventions", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaH: {str(e)}")
-
-class TableIMapper:
+    _TABLE = "H"
+
+
+class TableIMapper(_BatchMapper):
     """Translates raw dictionary data into ReferralTableI entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> ReferralTableI:
-        try:
-            return ReferralTableI(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                ups_code=str(data.get("ups_code", "")).strip(),
-                age_group=str(data.get("age_group", "01")).zfill(2),
-                gender=str(data.get("gender", "1")),
-                total_patients=int(data.get("total_patients", 0)),
-                total_referrals=int(data.get("total_referrals", 0)),
-                poverty_level=str(data.get("poverty_level", "3")),
-                funding_source=str(data.get("funding_source", "4"))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaI: {str(e)}")
-
-class TableJMapper:
+    _TABLE = "I"
+
+
+class TableJMapper(_BatchMapper):
     """Translates raw dictionary data into ExpenditureTableJ entities."""
-    @staticmethod
-    def map_from_dict(data: Dict[str, Any]) -> ExpenditureTableJ:
-        try:
-            return ExpenditureTableJ(
-                period=str(data.get("period", "")).strip(),
-                ipress_code=str(data.get("ipress_code", "")).strip(),
-                ugipress_code=str(data.get("ugipress_code", "")).strip(),
-                funding_source=str(data.get("funding_source", "1")),
-                budget_category=str(data.get("budget_category", "")).strip(),
-                executed_amount=float(data.get("executed_amount", 0.0))
-            )
-        except (ValueError, TypeError, AttributeError) as e:
-            raise ValueError(f"Error en mapeo TablaJ: {str(e)}")    
\ No newline at end of file
+    _TABLE = "J"
+
+
+def mapper_for(table_id: str) -> type:
+    """
+    Mapper class of a table. A table in the schema registry without its own
+    class gets one generated on first use, so a new table needs no code here.
+    """
+    mapper = _MAPPERS.get(table_id)
+    if mapper is None:
+        schema = SCHEMAS[table_id]
+        mapper = type(f"Table{table_id}Mapper", (_BatchMapper,), {"_TABLE": schema.table_id, "__module__": __name__})
+    return mapper
@@ -0,0 +1,139 @@
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Pipeline stages timed by generate_table, in pipeline order.
+STAGES = ("map", "format", "encode", "write")
+
+
+@dataclass(frozen=True)
+class TableMetrics:
+    """
+    Counters and per-stage wall times of one generate_table run.
+    stage_seconds holds map (reading, mapping and validating the rows,
+    including catalog and duplicate checks), format (rendering the lines),
+    encode (cp1252) and write (file writes, rename and fsync).
+    rows_in = rows_valid + rows_rejected; rows_written is lower than
+    rows_valid when duplicate rows were merged. A run served from the
+    generation cache has cached=True and writes nothing.
+    """
+    table_id: str
+    file_path: str
+    rows_in: int
+    rows_valid: int
+    rows_rejected: int
+    rows_written: int
+    bytes_written: int
+    elapsed_seconds: float
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    cached: bool = False
+
+
+class GenerationResult(str):
+    """
+    Path of the TXT returned by generate_table. It is a str, so callers
+    that only want the path are unaffected; metrics holds the TableMetrics
+    of the run, or None when the service collects no metrics.
+    """
+    metrics: Optional[TableMetrics]
+
+    def __new__(cls, file_path: str, metrics: Optional[TableMetrics] = None) -> "GenerationResult":
+        result = super().__new__(cls, file_path)
+        result.metrics = metrics
+        return result
+
+    def __reduce__(self) -> tuple:
+        return type(self), (str(self), self.metrics)
+
+
+class MetricsSink(ABC):
+    """Receives the TableMetrics of every table a service generates."""
+
+    @abstractmethod
+    def record(self, metrics: TableMetrics) -> None:
+        pass
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """Keeps every TableMetrics recorded, e.g. for tests or a final report."""
+
+    def __init__(self) -> None:
+        self._records: List[TableMetrics] = []
+        self._lock = threading.Lock()
+
+    def record(self, metrics: TableMetrics) -> None:
+        with self._lock:
+            self._records.append(metrics)
+
+    @property
+    def records(self) -> List[TableMetrics]:
+        with self._lock:
+            return list(self._records)
+
+    def latest(self, table_id: str) -> Optional[TableMetrics]:
+        """Metrics of the last run of table_id, if any."""
+        with self._lock:
+            for metrics in reversed(self._records):
+                if metrics.table_id == table_id:
+                    return metrics
+        return None
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PrometheusTextfileSink(MetricsSink):
+    """
+    Exports the latest metrics of each table in the Prometheus text format,
+    for node_exporter's textfile collector. The whole file is rewritten
+    atomically on every record, so a scrape never sees a partial file.
+    """
+
+    def __init__(self, path: Union[str, Path], prefix: str = "seti") -> None:
+        self._path = Path(path)
+        self._prefix = prefix
+        self._latest: Dict[str, TableMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, metrics: TableMetrics) -> None:
+        with self._lock:
+            self._latest[metrics.table_id] = metrics
+            text = self.render()
+            temp_path = self._path.with_name(f".{self._path.name}.{uuid.uuid4().hex[:12]}.tmp")
+            with open(temp_path, mode='w', encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, self._path)
+
+    def render(self) -> str:
+        """The exposition text for the metrics recorded so far."""
+        p = self._prefix
+        tables = [(f'table="{_label(table_id)}"', m) for table_id, m in sorted(self._latest.items())]
+        families = [
+            (f"{p}_rows", "Rows of the last run per outcome (in, valid, rejected, written).", [
+                f'{p}_rows{{{labels},outcome="{outcome}"}} {value}'
+                for labels, m in tables
+                for outcome, value in (("in", m.rows_in), ("valid", m.rows_valid), ("rejected", m.rows_rejected), ("written", m.rows_written))
+            ]),
+            (f"{p}_bytes_written", "Bytes written to the TXT in the last run.", [
+                f"{p}_bytes_written{{{labels}}} {m.bytes_written}" for labels, m in tables
+            ]),
+            (f"{p}_stage_seconds", "Wall time per pipeline stage in the last run.", [
+                f'{p}_stage_seconds{{{labels},stage="{_label(stage)}"}} {seconds!r}'
+                for labels, m in tables for stage, seconds in m.stage_seconds.items()
+            ]),
+            (f"{p}_run_seconds", "Wall time of the last run.", [
+                f"{p}_run_seconds{{{labels}}} {m.elapsed_seconds!r}" for labels, m in tables
+            ]),
+            (f"{p}_cache_hit", "1 if the last run reused a cached TXT.", [
+                f"{p}_cache_hit{{{labels}}} {int(m.cached)}" for labels, m in tables
+            ]),
+        ]
+        lines = []
+        for name, help_text, samples in families:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", *samples]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,42 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping, Optional
+
+# Any value but "" or "0" turns profiling on for services built without
+# an explicit Profiling; the second variable sets its min_rows.
+PROFILE_ENV = "SETI_PROFILE"
+PROFILE_MIN_ROWS_ENV = "SETI_PROFILE_MIN_ROWS"
+
+
+@dataclass(frozen=True)
+class Profiling:
+    """
+    Runs generate_table under cProfile and saves the stats next to the
+    generated TXT as {TXT stem}.{table_id}.pstats, so hot paths can be
+    compared across releases with the pstats module or snakeviz. Runs over
+    fewer than min_rows rows are not profiled (when the input has no
+    len(), the run is profiled and its stats discarded).
+    """
+    min_rows: int = 0
+
+    def __post_init__(self) -> None:
+        if self.min_rows < 0:
+            raise ValueError("min_rows no puede ser negativo.")
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> Optional["Profiling"]:
+        """Profiling configured by SETI_PROFILE and SETI_PROFILE_MIN_ROWS, or None."""
+        environ = os.environ if environ is None else environ
+        if environ.get(PROFILE_ENV, "") in ("", "0"):
+            return None
+        min_rows = environ.get(PROFILE_MIN_ROWS_ENV, "")
+        try:
+            return cls(int(min_rows) if min_rows else 0)
+        except ValueError:
+            raise ValueError(f"{PROFILE_MIN_ROWS_ENV} debe ser un entero no negativo: {min_rows!r}") from None
+
+    @staticmethod
+    def stats_path(file_path: str, table_id: str) -> Path:
+        path = Path(file_path)
+        return path.with_name(f"{path.stem}.{table_id}.pstats")
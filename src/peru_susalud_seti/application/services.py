@@ -1,71 +1,630 @@
-from typing import List, Dict, Any
-from ..domain.types import Subject
-from ..infrastructure.writers import SetiFileWriter
-from .mappers import (
-    TableAMapper, 
-    TableB1Mapper, 
-    TableB2Mapper,
-    TableC1Mapper,
-    TableC2Mapper,
-    TableD1Mapper,
-    TableD2Mapper,
-    TableEMapper,
-    TableFMapper,
-    TableGMapper,
-    TableHMapper,
-    TableIMapper,
-    TableJMapper
+import hashlib
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import count, islice
+from operator import attrgetter, itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from ..domain.schema import SCHEMAS
+from ..domain.types import Observer, Subject
+from ..infrastructure.cache import GenerationCache
+from ..infrastructure.catalogs import CodeCatalog, open_catalog
+from ..infrastructure.writers import SetiFileWriter, WriteStats
+from .duplicates import DuplicateCheck, DuplicatePolicy
+from .metrics import STAGES, GenerationResult, InMemoryMetricsSink, MetricsSink, TableMetrics
+from .profiling import Profiling
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Executor
+    from .mappers import BatchResult
+
+
+class _MapperRegistry(Mapping[str, Any]):
+    """
+    Strategy pattern: table id -> mapper, for every table in the schema
+    registry. The mappers module is imported on the first lookup of a
+    mapper, so importing the service or checking a table id loads no mapper.
+    """
+
+    def __init__(self, schemas: Mapping[str, Any]) -> None:
+        self._schemas = schemas
+        self._mappers: Dict[str, Any] = {}
+
+    def __getitem__(self, table_id: str) -> Any:
+        mapper = self._mappers.get(table_id)
+        if mapper is None:
+            from .mappers import mapper_for
+            mapper = self._mappers[table_id] = mapper_for(table_id)
+        return mapper
+
+    def __contains__(self, table_id: object) -> bool:
+        return table_id in self._schemas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schemas)
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+
+_TABLE_MAPPERS = _MapperRegistry(SCHEMAS)
+
+
+@dataclass(frozen=True)
+class TableRunResult:
+    """
+    Outcome of one table generated by SetiGenerationService.generate_all.
+    """
+    table_id: str
+    file_path: str
+    elapsed_seconds: float
+    metrics: Optional[TableMetrics] = None
+
+
+@dataclass(frozen=True)
+class ErrorAggregation:
+    """
+    Reports failed rows as one ERROR_SUMMARY event per run instead of one
+    ERROR event per row. Failures are grouped by exception class and message
+    template; max_details rows are still reported one by one.
+    """
+    max_details: int = 0
+    max_samples: int = 10
+
+
+CatalogSource = Union[CodeCatalog, str, Path, None]
+
+# Entity field -> (CatalogValidation attribute, label used in error messages)
+_CATALOG_FIELDS = (
+    ("icd10_code", "icd10", "CIE-10"),
+    ("ups_code", "ups", "UPS"),
+    ("surveillance_code", "surveillance", "de vigilancia"),
 )
 
+
+@dataclass(frozen=True)
+class CatalogValidation:
+    """
+    Checks coded fields against reference catalogs (CodeCatalog or catalog
+    file path): icd10_code against icd10, ups_code against ups and
+    surveillance_code against surveillance. A row with an unknown code is
+    reported and skipped like any other invalid row.
+    """
+    icd10: CatalogSource = None
+    ups: CatalogSource = None
+    surveillance: CatalogSource = None
+
+    def __post_init__(self) -> None:
+        for _, name, _ in _CATALOG_FIELDS:
+            object.__setattr__(self, name, open_catalog(getattr(self, name)))
+
+    def checker(self, entity_cls: type) -> Optional[Callable[[Any], None]]:
+        """
+        Returns a function raising ValueError for an entity of entity_cls
+        with an unknown code, or None if no catalog applies to the class.
+        """
+        names = getattr(entity_cls, "__dataclass_fields__", {})
+        checks = [
+            (attrgetter(field), getattr(self, name), label)
+            for field, name, label in _CATALOG_FIELDS
+            if field in names and getattr(self, name) is not None
+        ]
+        if not checks:
+            return None
+
+        def check(entity: Any) -> None:
+            for get, catalog, label in checks:
+                code = get(entity)
+                if code not in catalog:
+                    raise ValueError(f"El código {label} '{code}' no figura en el catálogo.")
+        return check
+
+    def fingerprint(self) -> str:
+        """Hash of the catalog contents, so cached tables expire when a catalog changes."""
+        digest = hashlib.blake2b(digest_size=16)
+        for _, name, _ in _CATALOG_FIELDS:
+            catalog = getattr(self, name)
+            digest.update(f"{name}:".encode())
+            if catalog is not None:
+                digest.update("\n".join(sorted(catalog.codes)).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+
+def _check_batch(result: "BatchResult", check: Optional[Callable[[Any], None]]) -> "BatchResult":
+    """Applies a catalog check to the records of a batch, moving failures to its errors."""
+    if check is None or not result.records:
+        return result
+    failed = {index for index, _ in result.errors}
+    indexes = (index for index in range(len(result.records) + len(failed)) if index not in failed)
+
+    records: List[Any] = []
+    errors = list(result.errors)
+    for index, record in zip(indexes, result.records):
+        try:
+            check(record)
+        except ValueError as e:
+            errors.append((index, e))
+            continue
+        records.append(record)
+    if len(errors) > len(result.errors):
+        errors.sort(key=lambda item: item[0])
+    return result._replace(records=records, errors=errors)
+
+
+# Quoted values and space-separated numbers vary per row; the rest is the
+# template. Anchoring numbers on the space keeps the regex scan cheap.
+_QUOTED_VALUE = re.compile(r"'[^']*'")
+_NUMERIC_VALUE = re.compile(r" -?[0-9]+(?:\.[0-9]+)?(?![\w.])")
+_TEMPLATE_CACHE_SIZE = 4096
+
+
+def _message_template(message: str) -> str:
+    return _NUMERIC_VALUE.sub(" N", _QUOTED_VALUE.sub("'...'", message))
+
+
+class _ErrorReport:
+    """
+    Collects the row failures of one generation run, either notifying each
+    one or grouping them for a final summary, per the service's settings.
+    """
+
+    def __init__(self, subject: Subject, aggregation: Optional[ErrorAggregation]) -> None:
+        self._subject = subject
+        self._aggregation = aggregation
+        self._groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._templates: Dict[str, str] = {}
+        self._total = 0
+
+    @property
+    def total(self) -> int:
+        """Number of failed rows reported so far."""
+        return self._total
+
+    def add(self, row_number: int, error: Exception) -> None:
+        self._total += 1
+        aggregation = self._aggregation
+        if aggregation is None:
+            self._subject.notify("ERROR", f"Fila {row_number}: {str(error)}")
+            return
+
+        message = str(error)
+        if self._total <= aggregation.max_details:
+            self._subject.notify("ERROR", f"Fila {row_number}: {message}")
+
+        # A broken extract tends to repeat the same message row after row.
+        template = self._templates.get(message)
+        if template is None:
+            template = _message_template(message)
+            if len(self._templates) < _TEMPLATE_CACHE_SIZE:
+                self._templates[message] = template
+
+        key = (type(error).__name__, template)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {"exception": key[0], "template": key[1], "count": 0, "sample_rows": []}
+        group["count"] += 1
+        if len(group["sample_rows"]) < aggregation.max_samples:
+            group["sample_rows"].append(row_number)
+
+    def summarize(self, table_id: str) -> None:
+        """Notifies the ERROR_SUMMARY event, if aggregating and any row failed."""
+        if self._aggregation is None or not self._total:
+            return
+        groups = sorted(self._groups.values(), key=lambda group: -group["count"])
+        self._subject.notify(
+            "ERROR_SUMMARY",
+            f"Tabla {table_id}: {self._total} filas con errores en {len(groups)} grupos.",
+            {"table_id": table_id, "total": self._total, "groups": groups}
+        )
+
+
+class _EventRecorder(Observer):
+    """Collects notifications in a worker process so the parent can replay them."""
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, str, Any]] = []
+
+    def update(self, event_type: str, message: str, data: Any = None) -> None:
+        self.events.append((event_type, message, data))
+
+
+def _generate_in_worker(table_id: str, raw_data: List[Dict[str, Any]], output_dir: str, batch_size: Optional[int], writer: Optional[SetiFileWriter] = None, error_aggregation: Optional[ErrorAggregation] = None, cache: Optional[GenerationCache] = None, catalogs: Optional[CatalogValidation] = None, duplicates: Optional[DuplicateCheck] = None, collect_metrics: bool = False, profiling: Optional[Profiling] = None) -> tuple:
+    """
+    Process-pool entry point: generates one table and returns its path
+    (a GenerationResult, carrying its metrics if collected), elapsed time,
+    recorded events and the error raised, if any.
+    """
+    metrics = InMemoryMetricsSink() if collect_metrics else None
+    service = SetiGenerationService(writer, error_aggregation, cache, catalogs, duplicates, metrics, profiling)
+    recorder = _EventRecorder()
+    service.attach(recorder)
+
+    started = time.perf_counter()
+    try:
+        file_path, error = service.generate_table(table_id, raw_data, output_dir, batch_size=batch_size), None
+    except Exception as e:
+        file_path, error = None, e
+
+    return file_path, time.perf_counter() - started, recorder.events, error
+
+
+def _map_chunk_in_worker(table_id: str, chunk: List[Dict[str, Any]], catalogs: Optional[CatalogValidation] = None) -> tuple:
+    """
+    Process-pool entry point: maps one chunk of rows and renders the valid
+    ones as cp1252 bytes. Returns (filename, data, errors), where filename
+    is None when no row in the chunk is valid.
+    """
+    mapper = _TABLE_MAPPERS[table_id]
+    result = mapper.map_batch(chunk)
+    if catalogs is not None:
+        result = _check_batch(result, catalogs.checker(mapper._ENTITY))
+    writer = SetiFileWriter()
+
+    filename = writer._get_file_metadata(result.records[0])[0] if result.records else None
+    return filename, writer.encode_records(result.records), result.errors
+
+
+def _chunked(raw_data: Iterable[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """Splits an iterable into (offset, chunk) pairs of at most size rows."""
+    iterator = iter(raw_data)
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+
 class SetiGenerationService(Subject):
     """
     Orchestrates the generation of multiple SUSALUD tables.
     Uses a mapping strategy to remain open for new table types.
+    A configured SetiFileWriter (e.g. with a durability mode) may be injected,
+    row failures may be aggregated into a summary (see ErrorAggregation),
+    unchanged tables may be reused from a GenerationCache, coded fields
+    may be checked against reference catalogs (see CatalogValidation) and
+    rows repeating a natural key rejected or merged (see DuplicateCheck).
+    With a MetricsSink, every generated table records its row counts and
+    per-stage timings; without one, nothing is timed. With Profiling (or
+    the SETI_PROFILE environment variable), generate_table runs are
+    profiled with cProfile.
     """
 
-    def __init__(self):
+    def __init__(self, writer: Optional[SetiFileWriter] = None, error_aggregation: Optional[ErrorAggregation] = None, cache: Optional[GenerationCache] = None, catalogs: Optional[CatalogValidation] = None, duplicates: Optional[DuplicateCheck] = None, metrics: Optional[MetricsSink] = None, profiling: Optional[Profiling] = None):
         super().__init__()
-        self._writer = SetiFileWriter()
-        # Strategy pattern for mappers
-        self._mappers = {
-            "A": TableAMapper.map_from_dict,
-            "B1": TableB1Mapper.map_from_dict,
-            "B2": TableB2Mapper.map_from_dict,
-            "C1": TableC1Mapper.map_from_dict,
-            "C2": TableC2Mapper.map_from_dict,
-            "D1": TableD1Mapper.map_from_dict,
-            "D2": TableD2Mapper.map_from_dict,
-            "E": TableEMapper.map_from_dict,
-            "F": TableFMapper.map_from_dict,
-            "G": TableGMapper.map_from_dict,
-            "H": TableHMapper.map_from_dict,
-            "I": TableIMapper.map_from_dict,
-            "J": TableJMapper.map_from_dict
-        }
-
-    def generate_table(self, table_id: str, raw_data: List[Dict[str, Any]], output_dir: str) -> str:
+        self._writer = writer or SetiFileWriter()
+        self._error_aggregation = error_aggregation
+        self._cache = cache
+        self._catalogs = catalogs
+        self._duplicates = duplicates
+        self._metrics = metrics
+        self._profiling = profiling if profiling is not None else Profiling.from_env()
+        self._mappers = _TABLE_MAPPERS
+
+    def generate_table(self, table_id: str, raw_data: Iterable[Dict[str, Any]], output_dir: str, batch_size: Optional[int] = None) -> GenerationResult:
         """
         Validates and generates a specific TXT table from JSON-like data.
+        Rows are mapped and written one at a time, so raw_data may be any
+        iterable (list, generator, DB cursor) and memory use stays constant.
+        With batch_size, rows are mapped column by column in chunks of that size.
+        With a cache, rows are materialized to be hashed, and a table whose
+        rows and TXT are unchanged is neither mapped nor written: a CACHE_HIT
+        event replaces the SUCCESS event.
+        Returns the file path as a GenerationResult, whose metrics are set
+        (and sent to the metrics sink) when the service has one.
+        With profiling, the cProfile stats of the run are saved next to the
+        TXT and announced by a PROFILE event.
         """
         if table_id not in self._mappers:
             raise ValueError(f"La tabla {table_id} no está soportada actualmente.")
 
+        profiling = self._profiling
+        if profiling is None or (hasattr(raw_data, "__len__") and len(raw_data) < profiling.min_rows):
+            return self._generate_table(table_id, raw_data, output_dir, batch_size)
+        return self._generate_table_profiled(profiling, table_id, raw_data, output_dir, batch_size)
+
+    def _generate_table_profiled(self, profiling: Profiling, table_id: str, raw_data: Iterable[Dict[str, Any]], output_dir: str, batch_size: Optional[int]) -> GenerationResult:
+        """
+        Runs _generate_table under cProfile. Inputs without len() are
+        counted on the way, and their stats discarded below min_rows.
+        """
+        import cProfile
+
+        counter = None
+        if not hasattr(raw_data, "__len__"):
+            counter = count()
+            raw_data = map(itemgetter(0), zip(raw_data, counter))
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = self._generate_table(table_id, raw_data, output_dir, batch_size)
+        finally:
+            profiler.disable()
+
+        if counter is None or next(counter) >= profiling.min_rows:
+            stats_path = profiling.stats_path(result, table_id)
+            profiler.dump_stats(stats_path)
+            self.notify(
+                "PROFILE", f"Perfil de Tabla {table_id} guardado en {stats_path}",
+                {"table_id": table_id, "file_path": str(stats_path)}
+            )
+            self.flush()
+        return result
+
+    def _generate_table(self, table_id: str, raw_data: Iterable[Dict[str, Any]], output_dir: str, batch_size: Optional[int]) -> GenerationResult:
         self.notify("START", f"Iniciando proceso para Tabla {table_id}")
-        
-        mapper_func = self._mappers[table_id]
-        validated_records = []
 
+        sink = self._metrics
+        started = time.perf_counter() if sink is not None else 0.0
+        try:
+            cache_entry = None
+            if self._cache is not None:
+                raw_data = raw_data if isinstance(raw_data, (list, tuple)) else list(raw_data)
+                cache_entry = self._cache.lookup(table_id, raw_data, output_dir, self._cache_salt())
+                if cache_entry is not None and cache_entry.file_path is not None:
+                    self.notify(
+                        "CACHE_HIT", f"Tabla {table_id} sin cambios; se reutiliza {cache_entry.file_path}",
+                        {"table_id": table_id, "file_path": cache_entry.file_path, "failed_rows": cache_entry.failed_rows}
+                    )
+                    metrics = None
+                    if sink is not None:
+                        rows_in = len(raw_data)
+                        metrics = TableMetrics(
+                            table_id, cache_entry.file_path, rows_in, rows_in - cache_entry.failed_rows, cache_entry.failed_rows,
+                            0, 0, time.perf_counter() - started, cached=True
+                        )
+                        sink.record(metrics)
+                    self.flush()
+                    return GenerationResult(cache_entry.file_path, metrics)
+                self.notify("CACHE_MISS", f"Tabla {table_id}: sin archivo vigente en caché", {"table_id": table_id})
+
+            report = _ErrorReport(self, self._error_aggregation)
+            stats = counter = None
+            if sink is not None:
+                stats, counter = WriteStats(), count()
+                # zip stops at the end of raw_data before drawing from counter,
+                # so next(counter) is the number of rows read.
+                raw_data = map(itemgetter(0), zip(raw_data, counter))
+            file_path = self._writer.write_stream(self._map_rows(table_id, raw_data, report, batch_size), output_dir, stats)
+            report.summarize(table_id)
+
+            if file_path is None:
+                raise ValueError(f"No hay registros válidos para la Tabla {table_id}")
+
+            if cache_entry is not None:
+                self._cache.store(cache_entry, file_path, output_dir, report.total)
+            metrics = None
+            if sink is not None:
+                rows_in = next(counter)
+                metrics = TableMetrics(
+                    table_id, file_path, rows_in, rows_in - report.total, report.total, stats.records, stats.bytes_written,
+                    time.perf_counter() - started,
+                    dict(zip(STAGES, (stats.read_seconds, stats.format_seconds, stats.encode_seconds, stats.write_seconds)))
+                )
+                sink.record(metrics)
+            self.notify("SUCCESS", f"Archivo {table_id} generado en {file_path}")
+        except BaseException:
+            # In async dispatch mode, observers have every event on return;
+            # an observer failure must not replace the run's own error.
+            self.flush(raise_errors=False)
+            raise
+        self.flush()
+
+        return GenerationResult(file_path, metrics)
+
+    def generate_table_parallel(self, table_id: str, raw_data: Iterable[Dict[str, Any]], output_dir: str, workers: Optional[int] = None, chunk_size: int = 10000) -> str:
+        """
+        Generates a single large table by mapping and formatting chunks of
+        rows in worker processes. The parent writes the chunks in their
+        original order, so the file and the "Fila N" error numbers are the
+        same as with generate_table.
+        """
+        if table_id not in self._mappers:
+            raise ValueError(f"La tabla {table_id} no está soportada actualmente.")
+        if self._duplicates is not None:
+            # Workers only see their own chunk, not the keys of the whole table.
+            raise ValueError("La detección de duplicados no está disponible en generate_table_parallel; use generate_table.")
+
+        self.notify("START", f"Iniciando proceso paralelo para Tabla {table_id}")
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        try:
+            report = _ErrorReport(self, self._error_aggregation)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = self._map_chunks_in_pool(executor, table_id, raw_data, report, chunk_size, window=workers * 2)
+                file_path = self._writer.write_encoded(chunks, output_dir)
+            report.summarize(table_id)
+
+            if file_path is None:
+                raise ValueError(f"No hay registros válidos para la Tabla {table_id}")
+
+            self.notify("SUCCESS", f"Archivo {table_id} generado en {file_path}")
+        except BaseException:
+            self.flush(raise_errors=False)
+            raise
+        self.flush()
+
+        return file_path
+
+    def generate_all(self, tables: Mapping[str, Iterable[Dict[str, Any]]], output_dir: str, max_workers: Optional[int] = None, batch_size: Optional[int] = None) -> Dict[str, TableRunResult]:
+        """
+        Generates several tables in parallel, one worker process per table.
+        Rows are sent to the workers, so one-shot iterables are materialized.
+        Worker events are replayed to the observers in table order; if any
+        table fails, its error is raised once every table has finished.
+        With a metrics sink, the metrics of each table are recorded by the
+        parent process and set on its TableRunResult.
+        """
+        for table_id in tables:
+            if table_id not in self._mappers:
+                raise ValueError(f"La tabla {table_id} no está soportada actualmente.")
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        results: Dict[str, TableRunResult] = {}
+        first_error: Optional[Exception] = None
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    (table_id, executor.submit(
+                        _generate_in_worker, table_id,
+                        rows if isinstance(rows, (list, tuple)) else list(rows),
+                        output_dir, batch_size, self._writer, self._error_aggregation, self._cache, self._catalogs, self._duplicates,
+                        self._metrics is not None, self._profiling
+                    ))
+                    for table_id, rows in tables.items()
+                ]
+
+                for table_id, future in futures:
+                    file_path, elapsed, events, error = future.result()
+                    for event in events:
+                        self.notify(*event)
+
+                    if error is not None:
+                        first_error = first_error or error
+                        continue
+                    if file_path.metrics is not None:
+                        self._metrics.record(file_path.metrics)
+                    results[table_id] = TableRunResult(table_id, str(file_path), elapsed, file_path.metrics)
+
+            if first_error is not None:
+                raise first_error
+        except BaseException:
+            # Replayed events reach the observers even if the pool broke.
+            self.flush(raise_errors=False)
+            raise
+        self.flush()
+
+        return results
+
+    def generate_partitioned(self, table_id: str, raw_data: Iterable[Dict[str, Any]], output_dir: str, max_open_files: int = 64) -> Dict[str, int]:
+        """
+        Generates one TXT per (IPRESS, period) found in the input, in a single
+        pass. Returns a manifest mapping each file path to its row count.
+        """
+        if table_id not in self._mappers:
+            raise ValueError(f"La tabla {table_id} no está soportada actualmente.")
+
+        self.notify("START", f"Iniciando proceso particionado para Tabla {table_id}")
+
+        try:
+            report = _ErrorReport(self, self._error_aggregation)
+            manifest = self._writer.write_partitioned(
+                self._map_rows(table_id, raw_data, report), output_dir, max_open_files=max_open_files
+            )
+            report.summarize(table_id)
+
+            if not manifest:
+                raise ValueError(f"No hay registros válidos para la Tabla {table_id}")
+
+            self.notify("SUCCESS", f"Tabla {table_id}: {len(manifest)} archivos generados en {output_dir}", manifest)
+        except BaseException:
+            self.flush(raise_errors=False)
+            raise
+        self.flush()
+
+        return manifest
+
+    def _map_rows(self, table_id: str, raw_data: Iterable[Dict[str, Any]], report: _ErrorReport, batch_size: Optional[int] = None) -> Iterator[Any]:
+        """
+        Lazily maps each raw row to its entity, reporting (and skipping) rows
+        that fail validation. With DuplicatePolicy.MERGE, entities are only
+        yielded once the input is exhausted.
+        """
+        mapper = self._mappers[table_id]
+        entities = self._map_entities(mapper, raw_data, report, batch_size, self._row_check(mapper._ENTITY))
+
+        if self._duplicates is None or self._duplicates.policy is not DuplicatePolicy.MERGE:
+            yield from entities
+            return
+
+        merger = self._duplicates.merger(mapper._ENTITY)
+        yield from merger.merge(entities)
+        if merger.merged:
+            self.notify(
+                "DUPLICATES_MERGED", f"Tabla {table_id}: {merger.merged} filas fusionadas por clave duplicada.",
+                {"table_id": table_id, "merged": merger.merged}
+            )
+
+    def _map_entities(self, mapper: Any, raw_data: Iterable[Dict[str, Any]], report: _ErrorReport, batch_size: Optional[int], check: Optional[Callable[[Any], None]]) -> Iterator[Any]:
+        if batch_size:
+            yield from self._map_batches(mapper, raw_data, report, batch_size, check)
+            return
+
+        mapper_func = mapper.map_from_dict
         for index, item in enumerate(raw_data):
             try:
                 entity = mapper_func(item)
-                validated_records.append(entity)
+                if check is not None:
+                    check(entity)
             except Exception as e:
-                self.notify("ERROR", f"Fila {index + 1}: {str(e)}")
+                report.add(index + 1, e)
+                continue
+            yield entity
+
+    def _row_check(self, entity_cls: type) -> Optional[Callable[[Any], None]]:
+        """
+        Combines the per-entity checks enabled on the service: catalogs
+        first, so a rejected row never takes a key in the duplicate index.
+        """
+        checks = []
+        if self._catalogs is not None:
+            checks.append(self._catalogs.checker(entity_cls))
+        if self._duplicates is not None and self._duplicates.policy is DuplicatePolicy.REJECT:
+            checks.append(self._duplicates.rejecter(entity_cls))
+        checks = [check for check in checks if check is not None]
+        if len(checks) <= 1:
+            return checks[0] if checks else None
+
+        def check_all(entity: Any) -> None:
+            for check in checks:
+                check(entity)
+        return check_all
+
+    def _cache_salt(self) -> str:
+        """Settings besides the rows that change the generated file."""
+        catalogs = self._catalogs.fingerprint() if self._catalogs is not None else ""
+        duplicates = self._duplicates.fingerprint() if self._duplicates is not None else ""
+        return f"{catalogs}|{duplicates}"
+
+    def _map_batches(self, mapper: Any, raw_data: Iterable[Dict[str, Any]], report: _ErrorReport, batch_size: int, check: Optional[Callable[[Any], None]] = None) -> Iterator[Any]:
+        """
+        Maps raw rows in chunks through the mapper's map_batch, keeping the
+        global row number in error reports.
+        """
+        for offset, chunk in _chunked(raw_data, batch_size):
+            result = _check_batch(mapper.map_batch(chunk), check)
+            for index, error in result.errors:
+                report.add(offset + index + 1, error)
+            yield from result.records
+
+    def _map_chunks_in_pool(self, executor: "Executor", table_id: str, raw_data: Iterable[Dict[str, Any]], report: _ErrorReport, chunk_size: int, window: int) -> Iterator[Tuple[Optional[str], bytes]]:
+        """
+        Submits chunks to the pool with at most window chunks in flight and
+        yields their (filename, data) in the original order, reporting the
+        errors of each chunk with their global row numbers.
+        """
+        pending: deque = deque()
+
+        def drain_one() -> Tuple[Optional[str], bytes]:
+            offset, future = pending.popleft()
+            filename, data, errors = future.result()
+            for index, error in errors:
+                report.add(offset + index + 1, error)
+            return filename, data
 
-        if not validated_records:
-            raise ValueError(f"No hay registros válidos para la Tabla {table_id}")
+        for offset, chunk in _chunked(raw_data, chunk_size):
+            pending.append((offset, executor.submit(_map_chunk_in_worker, table_id, chunk, self._catalogs)))
+            if len(pending) >= window:
+                yield drain_one()
 
-        file_path = self._writer.write_records(validated_records, output_dir)
-        self.notify("SUCCESS", f"Archivo {table_id} generado en {file_path}")
-        
-        return file_path
\ No newline at end of file
+        while pending:
+            yield drain_one()
@@ -1,7 +1,147 @@
-from dataclasses import dataclass, fields
+from dataclasses import MISSING, FrozenInstanceError, dataclass, fields
+from typing import Any, Callable, Dict
 
+
+def _compile_validator(cls: type) -> Callable[[Any], None]:
+    """
+    Builds, once per entity class, a function that checks its domain
+    invariants: AAAAMM period, 8-character IPRESS code, non-negative
+    integer fields and text that SUSALUD's ANSI (cp1252) files can hold.
+    Messages are in Spanish for end-user feedback.
+    """
+    int_fields = [f.name for f in fields(cls) if f.type is int]
+    str_fields = [f.name for f in fields(cls) if f.type is str]
+    lines = [
+        "def validate(r):",
+        "    period = r.period",
+        "    if len(period) != 6 or not period.isdigit():",
+        "        raise ValueError(f\"El periodo '{period}' es inválido. Formato requerido: AAAAMM\")",
+        "    if len(r.ipress_code) != 8:",
+        "        raise ValueError(f\"El código IPRESS '{r.ipress_code}' debe tener 8 caracteres.\")",
+    ]
+    if int_fields:
+        lines.append("    if " + " or ".join(f"r.{name} < 0" for name in int_fields) + ":")
+        lines.append("        _raise_negative(r, INT_FIELDS)")
+    if str_fields:
+        # isascii() is a cheap fast path; only non-ASCII or non-str values
+        # (which have no isascii) take the detailed check.
+        lines.append("    try:")
+        lines.append("        ascii_only = " + " and ".join(f"r.{name}.isascii()" for name in str_fields))
+        lines.append("    except AttributeError:")
+        lines.append("        ascii_only = False")
+        lines.append("    if not ascii_only:")
+        lines.append("        _check_ansi(r, STR_FIELDS)")
+
+    namespace = {
+        "_raise_negative": _raise_negative, "INT_FIELDS": tuple(int_fields),
+        "_check_ansi": _check_ansi, "STR_FIELDS": tuple(str_fields),
+    }
+    exec(compile("\n".join(lines), f"<seti-validator {cls.__name__}>", "exec"), namespace)
+    return namespace["validate"]
+
+
+def _raise_negative(record: Any, int_fields: tuple) -> None:
+    for name in int_fields:
+        value = getattr(record, name)
+        if value < 0:
+            raise ValueError(f"El campo '{name}' no puede ser negativo: {value}")
+
+
+def _check_ansi(record: Any, str_fields: tuple) -> None:
+    for name in str_fields:
+        # Non-str values are written through str(), so that is what must encode.
+        value = str(getattr(record, name))
+        try:
+            value.encode("cp1252")
+        except UnicodeEncodeError as e:
+            raise ValueError(
+                f"El campo '{name}' contiene el carácter {value[e.start]!r}, "
+                "no compatible con la codificación ANSI (cp1252)."
+            ) from None
+
+
+# Entity class -> compiled validator, filled on first instantiation.
+_VALIDATORS: Dict[type, Callable[[Any], None]] = {}
+
+
+class _DomainEntity:
+    """
+    Base for all SETI-IPRESS entities. Validates domain invariants
+    immediately upon creation, using the validator compiled for the class.
+    """
+    # Like plain dataclass instances, entities can be weakly referenced.
+    __slots__ = ("__weakref__",)
+
+    def __post_init__(self) -> None:
+        cls = type(self)
+        try:
+            validate = _VALIDATORS[cls]
+        except KeyError:
+            validate = _VALIDATORS[cls] = _compile_validator(cls)
+        validate(self)
+
+    def __reduce__(self) -> tuple:
+        # Slotted frozen instances cannot be restored attribute by attribute,
+        # so they are pickled as a constructor call.
+        return type(self), tuple(getattr(self, name) for name in self.__dataclass_fields__)
+
+
+def _frozen_setattr(self: Any, name: str, value: Any) -> None:
+    raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+
+def _frozen_delattr(self: Any, name: str) -> None:
+    raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+
+def _compile_slot_init(cls: type) -> Callable[..., None]:
+    """
+    Builds an __init__ that stores each field through its slot descriptor
+    instead of the object.__setattr__ call a frozen dataclass makes per field.
+    """
+    names = [f.name for f in fields(cls)]
+    namespace = {f"_set_{name}": getattr(cls, name).__set__ for name in names}
+    source = (
+        f"def __init__(self, {', '.join(names)}):\n"
+        + "".join(f"    _set_{name}(self, {name})\n" for name in names)
+        + "    self.__post_init__()\n"
+    )
+    exec(compile(source, f"<seti-init {cls.__name__}>", "exec"), namespace)
+
+    init = namespace["__init__"]
+    init.__qualname__ = f"{cls.__qualname__}.__init__"
+    return init
+
+
+def _slotted(cls: type) -> type:
+    """
+    Recreates a frozen dataclass with __slots__ for the fields it declares,
+    so instances carry no per-instance __dict__. Inherited fields keep the
+    slots of their base class. Classes without field defaults also get a
+    faster __init__.
+    """
+    inherited = {name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())}
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    for name in cls_dict["__slots__"]:
+        # Field defaults live on the class and would clash with the slots.
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    # The generated frozen __setattr__/__delattr__ refer to the original class.
+    cls_dict["__setattr__"] = _frozen_setattr
+    cls_dict["__delattr__"] = _frozen_delattr
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    if all(f.init and f.default is MISSING and f.default_factory is MISSING for f in fields(cls)):
+        slotted_cls.__init__ = _compile_slot_init(slotted_cls)
+    return slotted_cls
+
+
+@_slotted
 @dataclass(frozen=True)
-class HealthResourceTableA:
+class HealthResourceTableA(_DomainEntity):
     """
     Represents a row in Table A (Health Resources).
     Immutable Data Class to ensure data integrity during processing.
@@ -26,30 +166,10 @@ class HealthResourceTableA:
     other_professionals: int
     operative_ambulances: int
 
-    def __post_init__(self):
-        """
-        Validates domain invariants immediately upon creation.
-        Raises ValueError with Spanish messages for end-user feedback.
-        """
-        # Validate Period Format
-        if len(self.period) != 6 or not self.period.isdigit():
-             raise ValueError(f"El periodo '{self.period}' es inválido. Formato requerido: AAAAMM")
-        
-        # Validate IPRESS Code Length
-        if len(self.ipress_code) != 8:
-            raise ValueError(f"El código IPRESS '{self.ipress_code}' debe tener 8 caracteres.")
-
-        # Validate Non-Negative Integers for all numeric fields
-        # specific logic to iterate over integer fields only
-        for field in fields(self):
-            if field.type is int:
-                value = getattr(self, field.name)
-                if value < 0:
-                    raise ValueError(f"El campo '{field.name}' no puede ser negativo: {value}")
-
 
+@_slotted
 @dataclass(frozen=True)
-class BaseProductionTable:
+class BaseProductionTable(_DomainEntity):
     """
     Base class for SETI-IPRESS production tables.
     Contains common fields for B1 and B2 tables.
@@ -65,6 +185,7 @@ class BaseProductionTable:
     poverty_level: str
     funding_source: str
 
+@_slotted
 @dataclass(frozen=True)
 class OutpatientTableB1(BaseProductionTable):
     """
@@ -73,6 +194,7 @@ class OutpatientTableB1(BaseProductionTable):
     """
     pass
 
+@_slotted
 @dataclass(frozen=True)
 class EmergencyTableB2(BaseProductionTable):
     """
@@ -82,6 +204,7 @@ class EmergencyTableB2(BaseProductionTable):
     priority: str
     destination: str
 
+@_slotted
 @dataclass(frozen=True)
 class InpatientTableC1(BaseProductionTable):
     """
@@ -89,6 +212,7 @@ class InpatientTableC1(BaseProductionTable):
     """
     exit_type: str # Alta, Fallecido, Referido, etc.
 
+@_slotted
 @dataclass(frozen=True)
 class StayTableC2(BaseProductionTable):
     """
@@ -97,8 +221,9 @@ class StayTableC2(BaseProductionTable):
     stay_days: int # Total de días estancia en el periodo
 
 
+@_slotted
 @dataclass(frozen=True)
-class EmergencyProductionD1:
+class EmergencyProductionD1(_DomainEntity):
     """
     Represents Table D1: Emergency Production.
     Focuses on the volume of care (patients and appointments) in Emergency UPS.
@@ -114,8 +239,9 @@ class EmergencyProductionD1:
     poverty_level: str
     funding_source: str
 
+@_slotted
 @dataclass(frozen=True)
-class EmergencyMorbidityD2:
+class EmergencyMorbidityD2(_DomainEntity):
     """
     Represents Table D2: Emergency Morbidity.
     Focuses on the causes of care (ICD-10 diagnoses).
@@ -132,8 +258,9 @@ class EmergencyMorbidityD2:
     poverty_level: str
     funding_source: str
 
+@_slotted
 @dataclass(frozen=True)
-class ChildbirthTableE:
+class ChildbirthTableE(_DomainEntity):
     """
     Represents Table E: Consolidated Childbirth Report (Partos).
     Aggregated monthly data (not patient-level).
@@ -147,8 +274,9 @@ class ChildbirthTableE:
     still_births: int           # Nacidos muertos (óbito fetal)
 
 
+@_slotted
 @dataclass(frozen=True)
-class SurveillanceTableF:
+class SurveillanceTableF(_DomainEntity):
     """
     Represents Table F: Institutional Surveillance (Vigilancia Institucional).
     Tracks adverse events and sanitary indicators by UPS.
@@ -160,8 +288,9 @@ class SurveillanceTableF:
     surveillance_code: str  # Código del indicador (ej. 'I01', 'E05')
     event_count: int        # Cantidad de eventos reportados    
 
+@_slotted
 @dataclass(frozen=True)
-class ProceduresTableG:
+class ProceduresTableG(_DomainEntity):
     """
     Represents Table G: Procedures Production (Producción de Procedimientos).
     Reports diagnostic and therapeutic support procedures by UPS.
@@ -177,8 +306,9 @@ class ProceduresTableG:
     poverty_level: str
     funding_source: str
 
+@_slotted
 @dataclass(frozen=True)
-class SurgeryTableH:
+class SurgeryTableH(_DomainEntity):
     """
     Represents Table H: Surgical Interventions (Intervenciones Quirúrgicas).
     """
@@ -193,8 +323,9 @@ class SurgeryTableH:
     poverty_level: str
     funding_source: str
 
+@_slotted
 @dataclass(frozen=True)
-class ReferralTableI:
+class ReferralTableI(_DomainEntity):
     """
     Represents Table I: Referrals (Referencias y Contrarreferencias).
     Reports patients sent to other institutions.
@@ -210,8 +341,9 @@ class ReferralTableI:
     poverty_level: str
     funding_source: str
 
+@_slotted
 @dataclass(frozen=True)
-class ExpenditureTableJ:
+class ExpenditureTableJ(_DomainEntity):
     """
     Represents Table J: Budget Execution (Gastos).
     Reports financial execution by category.
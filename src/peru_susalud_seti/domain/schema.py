@@ -0,0 +1,91 @@
+from dataclasses import fields
+from importlib import import_module
+from typing import Any, Dict, NamedTuple, Tuple
+
+
+class Column(NamedTuple):
+    """
+    One field of a SETI-IPRESS table. kind is the normalization the mappers
+    apply to the raw value: text (str, stripped), code (str), age (str,
+    zero-padded to 2), upper (stripped, upper case), flag (upper case),
+    int, count (int, with None or '' as 0) or float. default stands in for
+    a missing key.
+    """
+    name: str
+    kind: str = "text"
+    default: Any = ""
+
+
+class TableSchema(NamedTuple):
+    """
+    Declarative description of a SETI-IPRESS table: its domain entity,
+    official file suffix and columns in SUSALUD's file order. The mappers
+    (map_from_dict, map_batch) and the TXT line formatter are generated
+    from it. The entity is named rather than imported, so reading the
+    registry loads no entity class.
+    """
+    table_id: str
+    entity: str
+    suffix: str
+    columns: Tuple[Column, ...]
+
+    @property
+    def entity_class(self) -> type:
+        return getattr(import_module(".models", __package__), self.entity)
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        """Column order of the TXT file."""
+        return tuple(column.name for column in self.columns)
+
+    def entity_columns(self) -> Tuple[Column, ...]:
+        """The columns in the entity's field (constructor) order."""
+        by_name = {column.name: column for column in self.columns}
+        names = [f.name for f in fields(self.entity_class)]
+        if len(by_name) != len(self.columns) or set(names) != set(by_name):
+            raise TypeError(f"El esquema de la Tabla {self.table_id} no coincide con los campos de {self.entity}.")
+        return tuple(by_name[name] for name in names)
+
+
+def _counts(*names: str) -> Tuple[Column, ...]:
+    return tuple(Column(name, "int", 0) for name in names)
+
+
+_KEY = (Column("period"), Column("ipress_code"), Column("ugipress_code"))
+_PRODUCTION_HEAD = _KEY + (Column("ups_code"), Column("age_group", "age", "01"), Column("gender", "code", "1"))
+_FUNDING_TAIL = (Column("poverty_level", "code", "3"), Column("funding_source", "code", "4"))
+
+_RESOURCES = (
+    "physical_consulting_rooms", "functional_consulting_rooms", "hospital_beds", "total_physicians",
+    "serums_physicians", "resident_physicians", "nurses", "dentists", "psychologists", "nutritionists",
+    "medical_technologists", "midwives", "pharmacists", "support_staff", "other_professionals",
+    "operative_ambulances",
+)
+
+# The column order is SUSALUD's, which does not always follow the dataclass
+# field order (B2, C1 and C2 write their specific fields before poverty_level).
+SCHEMAS: Dict[str, TableSchema] = {schema.table_id: schema for schema in (
+    TableSchema("A", "HealthResourceTableA", "TAA0", _KEY + tuple(Column(name, "count", None) for name in _RESOURCES)),
+    TableSchema("B1", "OutpatientTableB1", "TBB1", _PRODUCTION_HEAD + _counts("total_patients", "total_appointments") + _FUNDING_TAIL),
+    TableSchema("B2", "EmergencyTableB2", "TBB2", _PRODUCTION_HEAD + _counts("total_patients", "total_appointments") + (
+        Column("priority", "code", "3"), Column("destination", "code", "1")
+    ) + _FUNDING_TAIL),
+    TableSchema("C1", "InpatientTableC1", "TCC1", _PRODUCTION_HEAD + _counts("total_patients", "total_appointments") + (
+        Column("exit_type", "code", "1"),
+    ) + _FUNDING_TAIL),
+    TableSchema("C2", "StayTableC2", "TCC2", _PRODUCTION_HEAD + _counts("total_patients", "total_appointments", "stay_days") + _FUNDING_TAIL),
+    TableSchema("D1", "EmergencyProductionD1", "TDD1", _PRODUCTION_HEAD + _counts("total_patients", "total_appointments") + _FUNDING_TAIL),
+    TableSchema("D2", "EmergencyMorbidityD2", "TDD2", _PRODUCTION_HEAD + (
+        Column("icd10_code", "upper"), Column("diagnosis_type", "flag", "D")
+    ) + _counts("total_cases") + _FUNDING_TAIL),
+    TableSchema("E", "ChildbirthTableE", "TEE0", _KEY + _counts("total_deliveries", "complicated_deliveries", "live_births", "still_births")),
+    TableSchema("F", "SurveillanceTableF", "TFF0", _KEY + (
+        Column("ups_code"), Column("surveillance_code", "upper")
+    ) + _counts("event_count")),
+    TableSchema("G", "ProceduresTableG", "TGG0", _PRODUCTION_HEAD + _counts("total_patients", "total_procedures") + _FUNDING_TAIL),
+    TableSchema("H", "SurgeryTableH", "THH0", _PRODUCTION_HEAD + _counts("total_patients", "total_interventions") + _FUNDING_TAIL),
+    TableSchema("I", "ReferralTableI", "TII0", _PRODUCTION_HEAD + _counts("total_patients", "total_referrals") + _FUNDING_TAIL),
+    TableSchema("J", "ExpenditureTableJ", "TJJ0", _KEY + (
+        Column("funding_source", "code", "1"), Column("budget_category"), Column("executed_amount", "float", 0.0)
+    )),
+)}
@@ -1,5 +1,13 @@
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, List
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+# (event_type, message, data) as passed to Observer.update
+Event = Tuple[str, str, Any]
+
 
 class Observer(ABC):
     """
@@ -10,6 +18,156 @@ class Observer(ABC):
     def update(self, event_type: str, message: str, data: Any = None) -> None:
         pass
 
+    def update_batch(self, events: Sequence[Event]) -> None:
+        """
+        Receives several events at once in async dispatch mode. Override it
+        to write a whole batch to a slow sink in one call.
+        """
+        for event in events:
+            self.update(*event)
+
+
+class Backpressure(str, Enum):
+    """
+    What notify() does with a per-row ERROR event when the async dispatch
+    queue is full. Lifecycle events (START, SUCCESS, ERROR_SUMMARY, ...) are
+    never dropped or coalesced, so they may briefly exceed the bound.
+    """
+    BLOCK = "block"              # Wait until the observers catch up
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued ERROR event
+    COALESCE = "coalesce"        # Count overflowing ERROR events in one event
+
+
+# Only per-row events may be dropped or coalesced under backpressure.
+_SHEDDABLE_EVENTS = frozenset({"ERROR"})
+
+
+class _Coalesced:
+    """Queue placeholder counting the overflowing events it stands for."""
+    __slots__ = ("event_type", "count")
+
+    def __init__(self, event_type: str) -> None:
+        self.event_type = event_type
+        self.count = 1
+
+    def as_event(self) -> Event:
+        return (
+            self.event_type,
+            f"{self.count} eventos '{self.event_type}' agrupados por saturación de la cola.",
+            {"coalesced": self.count}
+        )
+
+
+class _AsyncDispatcher:
+    """
+    Bounded event queue drained by a daemon thread, which delivers the
+    events to the observers in batches. An exception raised by an observer
+    is kept and re-raised by the next flush().
+    """
+
+    def __init__(self, observers: List[Observer], max_queue: int, max_batch: int, backpressure: Backpressure) -> None:
+        if max_queue < 1 or max_batch < 1:
+            raise ValueError("max_queue y max_batch deben ser mayores a cero.")
+        self._observers = observers
+        self._max_queue = max_queue
+        self._max_batch = max_batch
+        self._backpressure = Backpressure(backpressure)
+
+        self._queue: Deque[Any] = deque()
+        self._in_flight = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, event: Event) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("El despachador de eventos está cerrado.")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="seti-observer-dispatch", daemon=True)
+                self._thread.start()
+
+            if len(self._queue) >= self._max_queue:
+                if self._backpressure is Backpressure.BLOCK:
+                    self._cond.wait_for(lambda: len(self._queue) < self._max_queue)
+                elif event[0] in _SHEDDABLE_EVENTS and not self._shed(event):
+                    return
+
+            self._queue.append(event)
+            self._cond.notify_all()
+
+    def _shed(self, event: Event) -> bool:
+        """
+        Makes room for a per-row event on a full queue. Returns False when
+        the event was absorbed into a coalescing placeholder instead.
+        """
+        if self._backpressure is Backpressure.COALESCE:
+            # The placeholder sits where the overflow happened, so ordering
+            # with later lifecycle events is kept.
+            tail = self._queue[-1]
+            if isinstance(tail, _Coalesced) and tail.event_type == event[0]:
+                tail.count += 1
+            else:
+                self._queue.append(_Coalesced(event[0]))
+            return False
+
+        for index, queued in enumerate(self._queue):
+            if isinstance(queued, tuple) and queued[0] in _SHEDDABLE_EVENTS:
+                del self._queue[index]
+                break
+        return True
+
+    def flush(self, raise_errors: bool = True) -> None:
+        """
+        Blocks until every queued event has been delivered. A pending
+        observer error is re-raised, or just discarded with raise_errors=False.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: not (self._queue or self._in_flight))
+            error, self._error = self._error, None
+        if error is not None and raise_errors:
+            raise error
+
+    def close(self) -> None:
+        self.flush()
+        self.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+
+    def shutdown(self) -> None:
+        """Lets the thread deliver what is queued and exit, without waiting."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _take_batch(self) -> List[Event]:
+        batch = [self._queue.popleft() for _ in range(min(self._max_batch, len(self._queue)))]
+        return [item.as_event() if isinstance(item, _Coalesced) else item for item in batch]
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if self._closed and not self._queue:
+                    return
+                batch = self._take_batch()
+                self._in_flight = len(batch)
+                # Wake producers blocked on a full queue.
+                self._cond.notify_all()
+
+            try:
+                for observer in list(self._observers):
+                    observer.update_batch(batch)
+            except BaseException as e:
+                with self._cond:
+                    self._error = self._error or e
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+
 class Subject(ABC):
     """
     Subject Base Class: Manages the subscription of observers.
@@ -17,6 +175,7 @@ class Subject(ABC):
     """
     def __init__(self) -> None:
         self._observers: List[Observer] = []
+        self._dispatcher: Optional[_AsyncDispatcher] = None
 
     def attach(self, observer: Observer) -> None:
         self._observers.append(observer)
@@ -24,6 +183,37 @@ class Subject(ABC):
     def detach(self, observer: Observer) -> None:
         self._observers.remove(observer)
 
+    def enable_async_dispatch(self, max_queue: int = 1024, max_batch: int = 256, backpressure: Backpressure = Backpressure.BLOCK) -> None:
+        """
+        Switches notify() to a bounded queue drained by a background thread,
+        so slow observers no longer stall the caller. Events reach the
+        observers in order, in batches of at most max_batch, via update_batch.
+        The thread ends on disable_async_dispatch() or when the subject is
+        garbage collected.
+        """
+        self.disable_async_dispatch()
+        self._dispatcher = _AsyncDispatcher(self._observers, max_queue, max_batch, backpressure)
+        self._dispatcher_finalizer = weakref.finalize(self, self._dispatcher.shutdown)
+
+    def disable_async_dispatch(self) -> None:
+        """Delivers pending events and returns to synchronous dispatch."""
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            self._dispatcher_finalizer.detach()
+            dispatcher.close()
+
+    def flush(self, raise_errors: bool = True) -> None:
+        """
+        Waits until observers have received every event notified so far.
+        With raise_errors=False a pending observer error is discarded, so it
+        cannot hide an exception the caller is already propagating.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.flush(raise_errors)
+
     def notify(self, event_type: str, message: str, data: Any = None) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.put((event_type, message, data))
+            return
         for observer in self._observers:
-            observer.update(event_type, message, data)
\ No newline at end of file
+            observer.update(event_type, message, data)
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+# Bump when a change in the library alters the TXT produced from the same
+# rows, so files generated by an older version are not reused.
+_CACHE_VERSION = 1
+_MANIFEST_DIR = ".seti-cache"
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, mode='rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_digest(table_id: str, rows: Sequence[Any], salt: str = "") -> str:
+    """
+    Stable hash of the input rows of a table: each row is serialized as
+    canonical JSON (sorted keys), so key order and dict identity do not matter.
+    salt stands for any other setting the output depends on.
+    """
+    digest = hashlib.blake2b(f"{_CACHE_VERSION}|{table_id}|{salt}".encode(), digest_size=16)
+    dumps = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode
+    for row in rows:
+        digest.update(dumps(row).encode("utf-8", "surrogatepass"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Cache slot of one table run: its key, input hash and reusable file, if any."""
+    table_id: str
+    ipress_code: str
+    period: str
+    input_hash: str
+    file_path: Optional[str] = None
+    failed_rows: int = 0
+
+
+class GenerationCache:
+    """
+    Opt-in content-hash cache of generated tables. Each (table, IPRESS,
+    period) has a small JSON manifest under output_dir/.seti-cache holding
+    the hash of the rows it was generated from and the size and hash of
+    the TXT written; a run with the same rows reuses the TXT if it is intact.
+    """
+
+    def lookup(self, table_id: str, rows: Sequence[Any], output_dir: str, salt: str = "") -> Optional[CacheEntry]:
+        """
+        Returns the cache slot for the rows, with file_path set on a hit.
+        Returns None when the rows do not name their IPRESS and period.
+        salt is mixed into the input hash (e.g. the catalogs in use).
+        """
+        first = rows[0] if rows else None
+        if not isinstance(first, dict) or not first.get("ipress_code") or not first.get("period"):
+            return None
+
+        entry = CacheEntry(table_id, str(first["ipress_code"]), str(first["period"]), input_digest(table_id, rows, salt))
+        try:
+            with open(self._manifest_path(entry, output_dir), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return entry
+
+        if manifest.get("input_hash") != entry.input_hash:
+            return entry
+        file_path = Path(output_dir) / manifest.get("file", "")
+        try:
+            intact = file_path.is_file() and file_path.stat().st_size == manifest.get("file_size") \
+                and _file_digest(file_path) == manifest.get("file_hash")
+        except OSError:
+            intact = False
+        if not intact:
+            return entry
+        return CacheEntry(entry.table_id, entry.ipress_code, entry.period, entry.input_hash, str(file_path), manifest.get("failed_rows", 0))
+
+    def store(self, entry: CacheEntry, file_path: str, output_dir: str, failed_rows: int = 0) -> None:
+        """Records the TXT generated for a cache slot, replacing the manifest atomically."""
+        path = Path(file_path)
+        manifest: Dict[str, Any] = {
+            "version": _CACHE_VERSION,
+            "table_id": entry.table_id,
+            "ipress_code": entry.ipress_code,
+            "period": entry.period,
+            "input_hash": entry.input_hash,
+            "file": path.name,
+            "file_size": path.stat().st_size,
+            "file_hash": _file_digest(path),
+            "failed_rows": failed_rows,
+        }
+        manifest_path = self._manifest_path(entry, output_dir)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = manifest_path.with_name(f".{manifest_path.name}.{uuid.uuid4().hex[:12]}.tmp")
+        with open(temp_path, mode='w', encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def _manifest_path(self, entry: CacheEntry, output_dir: str) -> Path:
+        # One manifest per slot, so tables generated in parallel never race.
+        name = f"{entry.table_id}_{entry.ipress_code}_{entry.period}.json"
+        return Path(output_dir) / _MANIFEST_DIR / "".join(c if c.isalnum() or c in "_.-" else "_" for c in name)
@@ -0,0 +1,96 @@
+import os
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+# (resolved path, mtime_ns, size) -> codes, shared by every CodeCatalog, so
+# each file is read once per process however many services use it.
+_LOADED: Dict[Tuple[str, int, int], FrozenSet[str]] = {}
+_LOAD_LOCK = threading.Lock()
+
+
+def _normalize(code: str) -> str:
+    return code.strip().upper()
+
+
+def _parse_catalog(path: Path, encoding: str) -> FrozenSet[str]:
+    """
+    Reads a catalog file: one code per line, optionally followed by a '|'
+    or tab and a description. Blank lines and '#' comments are skipped.
+    """
+    codes = set()
+    with open(path, mode='r', encoding=encoding) as f:
+        for line in f:
+            code = _normalize(line.split("|", 1)[0].split("\t", 1)[0])
+            if code and not code.startswith("#"):
+                codes.add(code)
+    return frozenset(codes)
+
+
+class CodeCatalog:
+    """
+    Reference catalog of valid codes (CIE-10, UPS, surveillance indicators)
+    held as a frozenset for O(1) membership tests. A catalog backed by a
+    file is only read on its first lookup, and the parsed codes are shared
+    by every catalog opened on the same, unchanged file.
+    """
+
+    def __init__(self, path: Optional[PathLike] = None, encoding: str = "utf-8", codes: Optional[Iterable[str]] = None) -> None:
+        if (path is None) == (codes is None):
+            raise ValueError("Indique la ruta del catálogo o sus códigos, pero no ambos.")
+        self._path = Path(path) if path is not None else None
+        self._encoding = encoding
+        self._codes: Optional[FrozenSet[str]] = frozenset(map(_normalize, codes)) if codes is not None else None
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> "CodeCatalog":
+        """In-memory catalog, e.g. loaded from a database table."""
+        return cls(codes=codes)
+
+    @property
+    def codes(self) -> FrozenSet[str]:
+        codes = self._codes
+        if codes is None:
+            codes = self._codes = self._load()
+        return codes
+
+    def _load(self) -> FrozenSet[str]:
+        path = self._path.resolve()
+        try:
+            stat = path.stat()
+        except OSError as e:
+            raise ValueError(f"No se pudo leer el catálogo {self._path}: {e.strerror}.") from None
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with _LOAD_LOCK:
+            codes = _LOADED.get(key)
+            if codes is None:
+                codes = _LOADED[key] = _parse_catalog(path, self._encoding)
+        return codes
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.codes
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getstate__(self) -> dict:
+        # File-backed catalogs travel to worker processes as their path only.
+        state = dict(self.__dict__)
+        if self._path is not None:
+            state["_codes"] = None
+        return state
+
+    def __repr__(self) -> str:
+        source = str(self._path) if self._path is not None else f"{len(self.codes)} códigos"
+        return f"CodeCatalog({source})"
+
+
+def open_catalog(source: Union[CodeCatalog, PathLike, None]) -> Optional[CodeCatalog]:
+    """Accepts a CodeCatalog, a catalog file path or None."""
+    if source is None or isinstance(source, CodeCatalog):
+        return source
+    if not isinstance(source, (str, os.PathLike)):
+        raise TypeError(f"Catálogo no soportado: {source!r}")
+    return CodeCatalog(source)
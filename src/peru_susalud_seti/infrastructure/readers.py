@@ -0,0 +1,184 @@
+import csv
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    orjson = None
+
+PathLike = Union[str, Path]
+
+DEFAULT_READ_SIZE = 64 * 1024
+DEFAULT_FETCH_SIZE = 1000
+
+# orjson parses bytes several times faster than the stdlib; both accept bytes
+# and both raise ValueError subclasses on malformed input.
+_loads = orjson.loads if orjson is not None else json.loads
+
+_NON_WHITESPACE = re.compile(r"[^ \t\r\n]")
+_LONGEST_LITERAL = len("-Infinity")
+_NEXT_VALUE = re.compile(r"[ \t\r\n]*,[ \t\r\n]*(?=[^ \t\r\n\]])")
+
+
+def read_json_lines(path: PathLike) -> Iterator[Any]:
+    """
+    Streams the rows of a JSON-lines file (one JSON object per line), so
+    generate_table can consume an extract without loading it whole.
+    Blank lines are skipped. Uses orjson when it is installed.
+    """
+    with open(path, mode='rb') as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield _loads(line)
+            except ValueError as e:
+                raise ValueError(f"Línea {number}: JSON inválido ({e}).") from None
+
+
+def read_json_array(path: PathLike, encoding: str = "utf-8", read_size: int = DEFAULT_READ_SIZE) -> Iterator[Any]:
+    """
+    Streams the elements of a file holding one top-level JSON array,
+    parsing each element as soon as it is complete. Only the element being
+    parsed and one read block are kept in memory.
+    """
+    if read_size < 1:
+        raise ValueError("read_size debe ser mayor a cero.")
+
+    # The C scanner behind JSONDecoder.raw_decode, without its per-call wrapper.
+    scan = json.JSONDecoder().scan_once
+    with open(path, mode='r', encoding=encoding) as f:
+        buffer = ""
+        position = 0
+        offset = 0  # characters already discarded from the buffer
+        eof = False
+
+        def fill(size: int) -> None:
+            nonlocal buffer, position, offset, eof
+            block = f.read(size)
+            eof = not block
+            offset += position
+            buffer = buffer[position:] + block
+            position = 0
+
+        def skip_whitespace() -> str:
+            nonlocal position
+            while True:
+                match = _NON_WHITESPACE.search(buffer, position)
+                if match is not None:
+                    position = match.start()
+                    return buffer[position]
+                position = len(buffer)
+                if eof:
+                    return ""
+                fill(read_size)
+
+        fill(read_size)
+        if skip_whitespace() != "[":
+            raise ValueError("El archivo no contiene un arreglo JSON.")
+        position += 1
+
+        token = skip_whitespace()
+        while token != "]":
+            if token == "":
+                raise ValueError("Arreglo JSON incompleto: falta ']'.")
+
+            # A value is decoded only once it is surely complete: if it ends
+            # at the buffer edge (e.g. a number), more input may extend it.
+            size = read_size
+            while True:
+                try:
+                    value, end = scan(buffer, position)
+                    if end < len(buffer) or eof:
+                        break
+                except StopIteration as e:
+                    # Only a literal (true, -Infinity, ...) cut by the buffer
+                    # edge can still become valid with more input.
+                    if eof or len(buffer) - e.value > _LONGEST_LITERAL:
+                        raise ValueError(f"JSON inválido en la posición {offset + e.value}: se esperaba un valor.") from None
+                except json.JSONDecodeError as e:
+                    if eof:
+                        raise ValueError(f"JSON inválido en la posición {offset + e.pos}: {e.msg}.") from None
+                fill(size)
+                size *= 2
+            position = end
+            yield value
+
+            # Fast path: a comma followed by the start of the next value.
+            separator = _NEXT_VALUE.match(buffer, position)
+            if separator is not None:
+                position = separator.end()
+                token = buffer[position]
+                continue
+
+            token = skip_whitespace()
+            if token == ",":
+                position += 1
+                token = skip_whitespace()
+                if token == "]":
+                    raise ValueError(f"JSON inválido en la posición {offset + position}: coma final antes de ']'.")
+            elif token not in ("]", ""):
+                raise ValueError(f"JSON inválido en la posición {offset + position}: se esperaba ',' o ']'.")
+        position += 1
+
+        if skip_whitespace() != "":
+            raise ValueError(f"JSON inválido en la posición {offset + position}: contenido después del arreglo.")
+
+
+def _field_names(source_columns: Sequence[str], columns: Optional[Mapping[str, str]]) -> List[str]:
+    """
+    Applies a {source column: field name} rename map to a header. Columns
+    missing from the map keep their name.
+    """
+    if not columns:
+        return list(source_columns)
+    missing = [name for name in columns if name not in source_columns]
+    if missing:
+        raise ValueError(f"Columnas no encontradas en el origen: {', '.join(missing)}.")
+    return [columns.get(name, name) for name in source_columns]
+
+
+def _as_rows(field_names: List[str], records: Iterator[Sequence[Any]]) -> Iterator[Dict[str, Any]]:
+    # Empty cells and NULLs are left out, so the mapper applies its default
+    # as it does for a missing JSON key.
+    for record in records:
+        yield {name: value for name, value in zip(field_names, record) if value is not None and value != ""}
+
+
+def read_csv(path: PathLike, columns: Optional[Mapping[str, str]] = None, encoding: str = "utf-8", **fmtparams: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the rows of a CSV export with a header line, keyed by field
+    name after applying the columns rename map. fmtparams (delimiter, ...)
+    are passed to csv.reader.
+    """
+    with open(path, mode='r', encoding=encoding, newline='') as f:
+        records = csv.reader(f, **fmtparams)
+        header = next(records, None)
+        if header is None:
+            return
+        yield from _as_rows(_field_names(header, columns), records)
+
+
+def read_cursor(cursor: Any, columns: Optional[Mapping[str, str]] = None, fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the result of an executed DB-API 2.0 cursor, fetch_size rows at
+    a time through fetchmany, keyed by field name after applying the
+    columns rename map.
+    """
+    if fetch_size < 1:
+        raise ValueError("fetch_size debe ser mayor a cero.")
+    if cursor.description is None:
+        raise ValueError("El cursor no tiene una consulta ejecutada.")
+
+    def batches() -> Iterator[Sequence[Any]]:
+        while True:
+            batch = cursor.fetchmany(fetch_size)
+            if not batch:
+                return
+            yield from batch
+
+    field_names = _field_names([column[0] for column in cursor.description], columns)
+    yield from _as_rows(field_names, batches())
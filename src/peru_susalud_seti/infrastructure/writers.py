@@ -1,6 +1,12 @@
 import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from enum import Enum
+from itertools import islice
 from pathlib import Path
-from typing import List, Union
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from ..domain.models import (
     HealthResourceTableA, 
     OutpatientTableB1, 
@@ -16,6 +22,147 @@ from ..domain.models import (
     ReferralTableI,
     ExpenditureTableJ
 )
+from ..domain.schema import SCHEMAS
+
+# Characters (= cp1252 bytes) collected before each encode and write.
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Records per block when write_stream times its stages.
+_TIMED_BLOCK_ROWS = 1024
+
+# Entity class -> (official file suffix, column order), from the table schemas.
+_TABLE_LAYOUTS = {schema.entity_class: (schema.suffix, schema.column_names) for schema in SCHEMAS.values()}
+
+
+def _compile_formatter(entity_cls: type, columns: Tuple[str, ...]) -> Callable[[Any], str]:
+    """
+    Builds a single f-string function that renders a record of entity_cls as
+    a pipe-delimited line. Money (float) fields are rendered with 2 decimals.
+    """
+    float_fields = {f.name for f in fields(entity_cls) if f.type is float}
+    parts = [
+        f"{{r.{name}:.2f}}" if name in float_fields else f"{{r.{name}}}"
+        for name in columns
+    ]
+    source = 'lambda r: f"' + "|".join(parts) + '"'
+    return eval(compile(source, f"<seti-formatter {entity_cls.__name__}>", "eval"))
+
+
+# Entity class -> (file suffix, line formatter), compiled on the first
+# record of each class, so only the tables actually written pay for it.
+_FORMATTERS: Dict[type, Tuple[str, Callable[[Any], str]]] = {}
+
+
+def _resolve_format(entity_cls: type) -> Tuple[str, Callable[[Any], str]]:
+    """
+    Returns the (suffix, formatter) pair for an entity class. Subclasses of a
+    registered entity reuse its layout; both are cached on first use.
+    """
+    entry = _FORMATTERS.get(entity_cls)
+    if entry is None:
+        for base in entity_cls.__mro__:
+            layout = _TABLE_LAYOUTS.get(base)
+            if layout is not None:
+                entry = _FORMATTERS.get(base)
+                if entry is None:
+                    suffix, columns = layout
+                    entry = _FORMATTERS[base] = (suffix, _compile_formatter(base, columns))
+                _FORMATTERS[entity_cls] = entry
+                break
+        else:
+            raise ValueError(f"Tipo de entidad no soportado para escritura: {entity_cls}")
+    return entry
+
+
+def _encode_block(lines: List[str], first_position: int) -> bytes:
+    """
+    Encodes a block of lines to cp1252 in a single call. If a character
+    cannot be encoded, reports which record (1-based position) holds it.
+    """
+    if not lines:
+        return b""
+    text = "\n".join(lines) + "\n"
+    try:
+        return text.encode('cp1252')
+    except UnicodeEncodeError as e:
+        position = first_position + text.count("\n", 0, e.start)
+        raise ValueError(
+            f"Registro {position}: el carácter {text[e.start]!r} "
+            "no es compatible con la codificación ANSI (cp1252)."
+        ) from None
+
+
+class Durability(str, Enum):
+    """
+    How hard the writer works to make a generated file survive a crash.
+    Every mode writes to a temp file renamed atomically on success; the
+    fsync calls only decide whether the data is forced to disk first.
+    """
+    NONE = "none"            # Rely on the OS page cache (fastest)
+    FILE = "file"            # fsync the file before renaming it
+    DIRECTORY = "directory"  # Also fsync the directory after the rename
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persists renames in a directory (POSIX only; Windows cannot open directories)."""
+    if os.name == "nt":  # pragma: no cover
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _PendingFile:
+    """
+    Output written to a hidden temp file in the target directory. commit()
+    renames it over the official name; discard() deletes it, so an
+    interrupted run never leaves a truncated file under the official name.
+    """
+
+    def __init__(self, final_path: Path) -> None:
+        self.final_path = final_path
+        self.temp_path = final_path.with_name(f".{final_path.name}.{uuid.uuid4().hex[:12]}.tmp")
+        self.handle: Optional[BinaryIO] = open(self.temp_path, mode='xb')
+
+    def reopen(self) -> BinaryIO:
+        self.handle = open(self.temp_path, mode='ab')
+        return self.handle
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def commit(self, durability: "Durability") -> None:
+        if durability is not Durability.NONE:
+            handle = self.handle or self.reopen()
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.close()
+        os.replace(self.temp_path, self.final_path)
+
+    def discard(self) -> None:
+        self.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+@dataclass
+class WriteStats:
+    """
+    Counters filled by SetiFileWriter.write_stream when passed one: records
+    and bytes written, and the seconds spent waiting on the record iterator
+    (mapping and validation upstream), rendering lines, encoding them to
+    cp1252 and writing them (including the final rename and fsync).
+    """
+    records: int = 0
+    bytes_written: int = 0
+    read_seconds: float = 0.0
+    format_seconds: float = 0.0
+    encode_seconds: float = 0.0
+    write_seconds: float = 0.0
+
 
 class SetiFileWriter:
     """
@@ -23,39 +170,28 @@ class SetiFileWriter:
     ANSI-encoded, pipe-delimited text files.
     """
 
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, durability: Durability = Durability.NONE) -> None:
+        if buffer_size < 1:
+            raise ValueError("buffer_size debe ser mayor a cero.")
+        self._buffer_size = buffer_size
+        self._durability = Durability(durability)
+
+    def _commit(self, pending_files: Iterable[_PendingFile]) -> None:
+        """Atomically publishes finished temp files under their official names."""
+        directories = set()
+        for pending in pending_files:
+            pending.commit(self._durability)
+            directories.add(pending.final_path.parent)
+
+        if self._durability is Durability.DIRECTORY:
+            for directory in directories:
+                _fsync_directory(directory)
+
     def _get_file_metadata(self, record: Union[HealthResourceTableA, OutpatientTableB1, EmergencyTableB2]) -> tuple:
         """
-        Determines the filename suffix and formatting logic based on the entity type.
-        """
-        # Cambiamos el orden: Primero validamos el tipo, luego extraemos datos
-        if isinstance(record, HealthResourceTableA):
-            suffix = "TAA0"
-        elif isinstance(record, OutpatientTableB1):
-            suffix = "TBB1"
-        elif isinstance(record, EmergencyTableB2):
-            suffix = "TBB2"
-        elif isinstance(record, InpatientTableC1):
-            suffix = "TCC1"
-        elif isinstance(record, StayTableC2):
-            suffix = "TCC2"
-        elif isinstance(record, EmergencyProductionD1):
-            suffix = "TDD1"
-        elif isinstance(record, EmergencyMorbidityD2):
-            suffix = "TDD2"
-        elif isinstance(record, ChildbirthTableE):
-            suffix = "TEE0"
-        elif isinstance(record, SurveillanceTableF):
-            suffix = "TFF0"
-        elif isinstance(record, ProceduresTableG):
-            suffix = "TGG0"
-        elif isinstance(record, SurgeryTableH):
-            suffix = "THH0"
-        elif isinstance(record, ReferralTableI):
-            suffix = "TII0"
-        elif isinstance(record, ExpenditureTableJ):
-            suffix = "TJJ0"
-        else:
-            raise ValueError(f"Tipo de entidad no soportado para escritura: {type(record)}")
+        Determines the filename and suffix based on the entity type.
+        """
+        suffix = _resolve_format(type(record))[0]
 
         year = record.period[:4]
         month = record.period[4:]
@@ -68,104 +204,176 @@ class SetiFileWriter:
         if not data:
             raise ValueError("No hay datos para generar el archivo.")
 
-        filename, table_type = self._get_file_metadata(data[0])
+        return self.write_stream(data, output_dir)
+
+    def write_stream(self, records: Iterable[Any], output_dir: str, stats: Optional[WriteStats] = None) -> Optional[str]:
+        """
+        Writes records as they are produced, without holding them in memory.
+        Lines are collected into blocks of about buffer_size bytes, encoded
+        once per block and written through a binary handle.
+        The file is created only when the first record arrives, so an empty
+        iterable returns None and leaves nothing on disk. Data goes to a temp
+        file that replaces the official one only once writing succeeds.
+        With stats, records are processed in fixed blocks whose stages are
+        timed into it; the file is the same.
+        """
+        iterator = iter(records)
+        started = time.perf_counter() if stats is not None else 0.0
+        first = next(iterator, None)
+        if stats is not None:
+            stats.read_seconds += time.perf_counter() - started
+        if first is None:
+            return None
+        if stats is not None:
+            return self._write_stream_timed(first, iterator, output_dir, stats)
+
+        filename, table_type = self._get_file_metadata(first)
         file_path = Path(output_dir) / filename
+        format_line = self._format_line
+        buffer_size = self._buffer_size
+
+        pending = _PendingFile(file_path)
+        try:
+            with pending.handle as f:
+                block = [format_line(first)]
+                block_chars = len(block[0])
+                block_start = 1
+                for record in iterator:
+                    line = format_line(record)
+                    block.append(line)
+                    block_chars += len(line) + 1
+                    if block_chars >= buffer_size:
+                        f.write(_encode_block(block, block_start))
+                        block_start += len(block)
+                        block = []
+                        block_chars = 0
+                f.write(_encode_block(block, block_start))
+                self._commit([pending])
+        except BaseException:
+            pending.discard()
+            raise
+
+        return str(file_path)
+
+    def _write_stream_timed(self, first: Any, iterator: Iterator[Any], output_dir: str, stats: WriteStats) -> str:
+        """
+        write_stream with per-stage timings. Timing whole blocks of records
+        keeps the clock out of the per-record loop.
+        """
+        perf_counter = time.perf_counter
+        file_path = Path(output_dir) / self._get_file_metadata(first)[0]
+        format_line = self._format_line
 
-        with open(file_path, mode='w', encoding='cp1252', newline='') as f:
-            for record in data:
-                line = self._format_line(record)
-                f.write(line + "\n")
+        pending = _PendingFile(file_path)
+        try:
+            with pending.handle as f:
+                block = [first]
+                position = 1
+                while block:
+                    t0 = perf_counter()
+                    lines = list(map(format_line, block))
+                    t1 = perf_counter()
+                    data = _encode_block(lines, position)
+                    t2 = perf_counter()
+                    f.write(data)
+                    t3 = perf_counter()
+                    position += len(block)
+                    stats.records += len(block)
+                    stats.bytes_written += len(data)
+                    block = list(islice(iterator, _TIMED_BLOCK_ROWS))
+                    stats.format_seconds += t1 - t0
+                    stats.encode_seconds += t2 - t1
+                    stats.write_seconds += t3 - t2
+                    stats.read_seconds += perf_counter() - t3
+                t0 = perf_counter()
+                self._commit([pending])
+                stats.write_seconds += perf_counter() - t0
+        except BaseException:
+            pending.discard()
+            raise
 
         return str(file_path)
 
+    def encode_records(self, records: Iterable[Any]) -> bytes:
+        """
+        Renders records as newline-terminated lines encoded in cp1252, ready
+        to be written with write_encoded.
+        """
+        return _encode_block([self._format_line(record) for record in records], 1)
+
+    def write_encoded(self, chunks: Iterable[Tuple[Optional[str], bytes]], output_dir: str) -> Optional[str]:
+        """
+        Writes already encoded (filename, data) chunks in order. The first
+        chunk with a filename names the file; chunks without one are skipped.
+        Returns None, creating nothing, when no chunk carries data. Like
+        write_stream, the official file only appears once every chunk is in.
+        """
+        pending = None
+
+        try:
+            for filename, data in chunks:
+                if filename is None:
+                    continue
+                if pending is None:
+                    pending = _PendingFile(Path(output_dir) / filename)
+                pending.handle.write(data)
+            if pending is not None:
+                self._commit([pending])
+        except BaseException:
+            if pending is not None:
+                pending.discard()
+            raise
+
+        return str(pending.final_path) if pending is not None else None
+
+    def write_partitioned(self, records: Iterable[Any], output_dir: str, max_open_files: int = 64) -> Dict[str, int]:
+        """
+        Routes each record to the file of its own IPRESS and period in a single
+        pass. At most max_open_files handles stay open: the least recently used
+        one is closed and later reopened in append mode if needed. Every file
+        is written to a temp file and only renamed once the whole input is in.
+        Returns a manifest mapping every generated file path to its row count.
+        """
+        if max_open_files < 1:
+            raise ValueError("max_open_files debe ser mayor a cero.")
+
+        open_files: "OrderedDict[str, _PendingFile]" = OrderedDict()
+        pending_files: Dict[str, _PendingFile] = {}
+        manifest: Dict[str, int] = {}
+
+        try:
+            for position, record in enumerate(records, start=1):
+                filename, table_type = self._get_file_metadata(record)
+                file_path = str(Path(output_dir) / filename)
+
+                pending = open_files.get(file_path)
+                if pending is None:
+                    if len(open_files) >= max_open_files:
+                        _, oldest = open_files.popitem(last=False)
+                        oldest.close()
+                    pending = pending_files.get(file_path)
+                    if pending is None:
+                        pending = pending_files[file_path] = _PendingFile(Path(file_path))
+                        manifest[file_path] = 0
+                    else:
+                        pending.reopen()
+                    open_files[file_path] = pending
+                else:
+                    open_files.move_to_end(file_path)
+
+                pending.handle.write(_encode_block([self._format_line(record)], position))
+                manifest[file_path] += 1
+
+            self._commit(pending_files.values())
+        except BaseException:
+            for pending in pending_files.values():
+                pending.discard()
+            raise
+
+        return manifest
+
     def _format_line(self, record: Union[HealthResourceTableA, OutpatientTableB1, EmergencyTableB2]) -> str:
         """
         Converts an entity into a pipe-delimited string according to its specific structure.
         """
-        if isinstance(record, HealthResourceTableA):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code,
-                str(record.physical_consulting_rooms), str(record.functional_consulting_rooms),
-                str(record.hospital_beds), str(record.total_physicians), str(record.serums_physicians),
-                str(record.resident_physicians), str(record.nurses), str(record.dentists),
-                str(record.psychologists), str(record.nutritionists), str(record.medical_technologists),
-                str(record.midwives), str(record.pharmacists), str(record.support_staff),
-                str(record.other_professionals), str(record.operative_ambulances)
-            ]
-        elif isinstance(record, OutpatientTableB1):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_appointments), record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, EmergencyTableB2):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_appointments), record.priority, record.destination,
-                record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, InpatientTableC1):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_appointments), record.exit_type,
-                record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, StayTableC2):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_appointments), str(record.stay_days),
-                record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, EmergencyProductionD1):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_appointments), record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, EmergencyMorbidityD2):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, record.icd10_code,
-                record.diagnosis_type, str(record.total_cases),
-                record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, ChildbirthTableE):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code,
-                str(record.total_deliveries), str(record.complicated_deliveries),
-                str(record.live_births), str(record.still_births)
-            ]
-        elif isinstance(record, SurveillanceTableF):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code,
-                record.ups_code, record.surveillance_code,
-                str(record.event_count)
-            ]
-        elif isinstance(record, ProceduresTableG):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_procedures), record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, SurgeryTableH):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_interventions), record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, ReferralTableI):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code, record.ups_code,
-                record.age_group, record.gender, str(record.total_patients),
-                str(record.total_referrals), record.poverty_level, record.funding_source
-            ]
-        elif isinstance(record, ExpenditureTableJ):
-            fields = [
-                record.period, record.ipress_code, record.ugipress_code,
-                record.funding_source, record.budget_category,
-                f"{record.executed_amount:.2f}" # Formato decimal a 2 dígitos
-            ]
-        return "|".join(fields)
\ No newline at end of file
+        return _resolve_format(type(record))[1](record)
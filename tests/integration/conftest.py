@@ -0,0 +1,24 @@
+import pytest
+from peru_susalud_seti import Observer
+
+
+class EventRecorder(Observer):
+    """Observer that keeps every (event_type, message, data) it receives."""
+
+    def __init__(self):
+        self.events = []
+
+    def update(self, event_type, message, data=None):
+        self.events.append((event_type, message, data))
+
+    def types(self):
+        return [event_type for event_type, _, _ in self.events]
+
+    def messages(self, event_type):
+        return [message for kind, message, _ in self.events if kind == event_type]
+
+
+@pytest.fixture
+def new_recorder():
+    """Factory for EventRecorder instances attached by the test."""
+    return EventRecorder
@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from peru_susalud_seti import AsyncSetiGenerationService, SetiGenerationService
+
+
+async def _arows(rows):
+    for row in rows:
+        await asyncio.sleep(0)
+        yield row
+
+
+def _rows(count, bad_every=4):
+    return [
+        {"period": "BAD" if n % bad_every == 0 else "202602", "ipress_code": "00001234", "total_patients": n}
+        for n in range(count)
+    ]
+
+
+def test_async_generation_matches_sync(tmp_path, new_recorder):
+    """Async rows give the same file and "Fila N" errors as generate_table."""
+    (tmp_path / "sync").mkdir()
+    sync_recorder, async_recorder = new_recorder(), new_recorder()
+    sync_service = SetiGenerationService()
+    sync_service.attach(sync_recorder)
+    expected = sync_service.generate_table("B1", _rows(50), str(tmp_path / "sync"))
+
+    service = AsyncSetiGenerationService()
+    service.attach(async_recorder)
+    path = asyncio.run(service.agenerate_table("B1", _arows(_rows(50)), str(tmp_path), chunk_size=7))
+
+    with open(path, "rb") as a, open(expected, "rb") as b:
+        assert a.read() == b.read()
+    assert async_recorder.messages("ERROR") == sync_recorder.messages("ERROR")
+    assert async_recorder.types()[-1] == "SUCCESS"
+
+
+def test_async_generate_all_limits_concurrency(tmp_path):
+    """Several tables run concurrently, never more than max_concurrency at once."""
+    service = AsyncSetiGenerationService(max_concurrency=2)
+    running, peak = 0, 0
+
+    async def tracked(rows):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            for row in rows:
+                await asyncio.sleep(0.001)
+                yield row
+        finally:
+            running -= 1
+
+    tables = {t: tracked([{"period": "202602", "ipress_code": "00001234"}] * 3) for t in ("B1", "E", "G", "H")}
+    results = asyncio.run(service.agenerate_all(tables, str(tmp_path), chunk_size=1))
+
+    assert sorted(results) == ["B1", "E", "G", "H"]
+    assert peak == 2
+    assert all(result.elapsed_seconds >= 0 for result in results.values())
+
+
+def test_async_generation_errors(tmp_path):
+    """Unknown tables, invalid limits and all-invalid input fail like the sync service."""
+    service = AsyncSetiGenerationService()
+    with pytest.raises(ValueError, match="no está soportada"):
+        asyncio.run(service.agenerate_table("Z", [], str(tmp_path)))
+    with pytest.raises(ValueError, match="no está soportada"):
+        asyncio.run(service.agenerate_all({"Z": []}, str(tmp_path)))
+    with pytest.raises(ValueError, match="max_concurrency"):
+        AsyncSetiGenerationService(max_concurrency=0)
+    with pytest.raises(ValueError, match="No hay registros"):
+        asyncio.run(service.agenerate_all({"E": [{"period": "BAD"}], "G": [{"period": "202602", "ipress_code": "00001234"}]}, str(tmp_path)))
+    assert [p.name for p in tmp_path.iterdir()] == ["00001234_2026_02_TGG0.TXT"]
+
+
+def test_async_generation_failure_leaves_no_file(tmp_path):
+    """A source that fails midway leaves no file behind."""
+    async def broken():
+        yield {"period": "202602", "ipress_code": "00001234"}
+        raise RuntimeError("conexión perdida")
+
+    with pytest.raises(RuntimeError, match="conexión perdida"):
+        asyncio.run(AsyncSetiGenerationService().agenerate_table("E", broken(), str(tmp_path), chunk_size=1))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_async_generation_cancelled_leaves_no_file(tmp_path):
+    """Cancelling the task stops the writer and discards its temp file."""
+    async def endless():
+        while True:
+            await asyncio.sleep(0.001)
+            yield {"period": "202602", "ipress_code": "00001234"}
+
+    async def main():
+        task = asyncio.ensure_future(AsyncSetiGenerationService().agenerate_table("E", endless(), str(tmp_path), chunk_size=1))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        for _ in range(100):
+            if not list(tmp_path.iterdir()):
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_async_run_error_wins_over_observer_error(tmp_path, new_recorder):
+    """A failing async observer does not hide the generation error itself."""
+    class Failing(new_recorder):
+        def update(self, event_type, message, data=None):
+            raise RuntimeError("sink down")
+
+    service = AsyncSetiGenerationService()
+    service.attach(Failing())
+    service.enable_async_dispatch()
+    with pytest.raises(ValueError, match="No hay registros válidos"):
+        asyncio.run(service.agenerate_table("E", [{"period": "BAD"}], str(tmp_path)))
+    service.disable_async_dispatch()
+
+
+def test_agenerate_table_checks_catalogs(tmp_path, new_recorder):
+    """The async service applies the same catalog validation."""
+    from peru_susalud_seti import CatalogValidation, CodeCatalog
+    rows = [
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "J189"},
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "X99"},
+    ]
+    recorder = new_recorder()
+    service = AsyncSetiGenerationService(catalogs=CatalogValidation(icd10=CodeCatalog.from_codes(["J189"])))
+    service.attach(recorder)
+    asyncio.run(service.agenerate_table("D2", rows, str(tmp_path)))
+    assert recorder.messages("ERROR") == ["Fila 2: El código CIE-10 'X99' no figura en el catálogo."]
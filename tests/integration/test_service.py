@@ -1,6 +1,7 @@
+import json
 import os
 import pytest
-from peru_susalud_seti import SetiGenerationService
+from peru_susalud_seti import SetiGenerationService, Observer
 
 @pytest.mark.parametrize("table_id, raw_row, expected_suffix", [
     ("A", {"period": "202602", "ipress_code": "00001234", "hospital_beds": 5}, "TAA0"),
@@ -62,4 +63,555 @@ def test_service_all_rows_fail_mapping(tmp_path):
     service = SetiGenerationService()
     # Sending data that will definitely fail mapping (None)
     with pytest.raises(ValueError, match="No hay registros válidos"):
-        service.generate_table("A", [None, None], str(tmp_path))
\ No newline at end of file
+        service.generate_table("A", [None, None], str(tmp_path))
+
+def test_service_accepts_generator_input(tmp_path):
+    """Rows may come from any iterable; they are written as they are validated."""
+    service = SetiGenerationService()
+    rows = (
+        {"period": "202602", "ipress_code": "12345678", "total_patients": n}
+        for n in range(3)
+    )
+    path = service.generate_table("B1", rows, str(tmp_path))
+
+    with open(path, "r", encoding="cp1252") as f:
+        assert len(f.read().splitlines()) == 3
+
+
+def test_service_all_rows_fail_leaves_no_file(tmp_path):
+    """A stream where every row fails must not leave a file behind."""
+    service = SetiGenerationService()
+    with pytest.raises(ValueError, match="No hay registros válidos"):
+        service.generate_table("B1", iter([None, None]), str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_service_partitioned_generation(tmp_path):
+    """Each IPRESS and period gets its own file, reported in the manifest."""
+    service = SetiGenerationService()
+    rows = [
+        {"period": "202602", "ipress_code": "11111111"},
+        {"period": "202602", "ipress_code": "22222222"},
+        {"period": "202603", "ipress_code": "11111111"},
+        {"period": "202602", "ipress_code": "11111111"},
+    ]
+    manifest = service.generate_partitioned("D1", rows, str(tmp_path))
+
+    assert manifest[str(tmp_path / "11111111_2026_02_TDD1.TXT")] == 2
+    assert len(manifest) == 3
+
+
+def test_service_partitioned_validation(tmp_path):
+    """Unsupported tables and fully invalid inputs are rejected."""
+    service = SetiGenerationService()
+    with pytest.raises(ValueError, match="no está soportada"):
+        service.generate_partitioned("Z9", [], str(tmp_path))
+    with pytest.raises(ValueError, match="No hay registros válidos"):
+        service.generate_partitioned("D1", [None], str(tmp_path))
+
+
+def test_service_batch_mode_matches_row_mode(tmp_path, new_recorder):
+    """Batch mapping writes the same file and reports the same row numbers."""
+    rows = [
+        {"period": "202602", "ipress_code": "12345678", "total_patients": n}
+        for n in range(7)
+    ]
+    rows[2] = None
+    rows[5] = {"period": "202602", "ipress_code": "12345678", "total_patients": "n/a"}
+
+    outputs = []
+    for batch_size, folder in ((None, "serial"), (3, "batch")):
+        recorder = new_recorder()
+        service = SetiGenerationService()
+        service.attach(recorder)
+        output_dir = tmp_path / folder
+        output_dir.mkdir()
+        path = service.generate_table("B1", iter(rows), str(output_dir), batch_size=batch_size)
+        with open(path, "rb") as f:
+            outputs.append((f.read(), recorder.messages("ERROR")))
+
+    assert outputs[0] == outputs[1]
+    assert [message.split(":")[0] for message in outputs[1][1]] == ["Fila 3", "Fila 6"]
+
+
+def test_service_generate_all_in_parallel(tmp_path, new_recorder):
+    """All tables are generated and worker events are replayed in table order."""
+    recorder = new_recorder()
+    service = SetiGenerationService()
+    service.attach(recorder)
+    tables = {
+        "A": [{"period": "202602", "ipress_code": "12345678", "nurses": 2}],
+        "B1": iter([None, {"period": "202602", "ipress_code": "12345678"}]),
+        "J": [{"period": "202602", "ipress_code": "12345678", "executed_amount": 1}],
+    }
+    results = service.generate_all(tables, str(tmp_path), max_workers=2)
+
+    assert list(results) == ["A", "B1", "J"]
+    for table_id, result in results.items():
+        assert result.table_id == table_id
+        assert os.path.exists(result.file_path)
+        assert result.elapsed_seconds >= 0
+    assert recorder.types() == [
+        "START", "SUCCESS", "START", "ERROR", "SUCCESS", "START", "SUCCESS"
+    ]
+    assert recorder.events[3][1].startswith("Fila 1:")
+
+
+def test_service_generate_all_errors(tmp_path):
+    """Unsupported tables fail fast; failing tables raise after the rest finish."""
+    service = SetiGenerationService()
+    with pytest.raises(ValueError, match="no está soportada"):
+        service.generate_all({"Z9": []}, str(tmp_path))
+
+    with pytest.raises(ValueError, match="No hay registros válidos para la Tabla E"):
+        service.generate_all({
+            "E": [None],
+            "F": [{"period": "202602", "ipress_code": "12345678"}],
+        }, str(tmp_path), max_workers=1)
+    assert (tmp_path / "12345678_2026_02_TFF0.TXT").exists()
+
+def test_service_generate_all_flushes_events_before_raising(tmp_path, new_recorder):
+    """With async dispatch, replayed events are delivered before the table error is raised."""
+    import time
+
+    class Slow(new_recorder):
+        def update(self, event_type, message, data=None):
+            time.sleep(0.01)
+            super().update(event_type, message, data)
+
+    recorder = Slow()
+    service = SetiGenerationService()
+    service.attach(recorder)
+    service.enable_async_dispatch()
+    with pytest.raises(ValueError, match="No hay registros válidos para la Tabla E"):
+        service.generate_all({"E": [None]}, str(tmp_path), max_workers=1)
+    assert recorder.types() == ["START", "ERROR"]
+    service.disable_async_dispatch()
+
+
+def test_worker_entry_point_records_events(tmp_path):
+    """The worker returns its path, timing, recorded events and error."""
+    from peru_susalud_seti.application.services import _generate_in_worker
+
+    path, elapsed, events, error = _generate_in_worker(
+        "E", [{"period": "202602", "ipress_code": "12345678"}], str(tmp_path), None
+    )
+    assert os.path.exists(path) and error is None and elapsed >= 0
+    assert [event for event, _, _ in events] == ["START", "SUCCESS"]
+
+    path, _, _, error = _generate_in_worker("E", [None], str(tmp_path), None)
+    assert path is None and isinstance(error, ValueError)
+
+
+def test_service_parallel_table_matches_serial(tmp_path, new_recorder):
+    """Chunked parallel generation writes the same bytes and row numbers."""
+    rows = [
+        {"period": "202602", "ipress_code": "12345678", "icd10_code": f"a{n:02d}", "total_cases": n}
+        for n in range(25)
+    ]
+    for bad in (0, 7, 8, 19):
+        rows[bad] = {"period": "202602", "ipress_code": "12345678", "total_cases": "?"}
+
+    outputs = []
+    for parallel, folder in ((False, "serial"), (True, "parallel")):
+        recorder = new_recorder()
+        service = SetiGenerationService()
+        service.attach(recorder)
+        output_dir = tmp_path / folder
+        output_dir.mkdir()
+        if parallel:
+            path = service.generate_table_parallel("D2", iter(rows), str(output_dir), workers=2, chunk_size=4)
+        else:
+            path = service.generate_table("D2", rows, str(output_dir))
+        with open(path, "rb") as f:
+            errors = recorder.messages("ERROR")
+            outputs.append((os.path.basename(path), f.read(), errors))
+
+    assert outputs[0] == outputs[1]
+    assert [message.split(":")[0] for message in outputs[1][2]] == ["Fila 1", "Fila 8", "Fila 9", "Fila 20"]
+
+
+def test_service_parallel_table_validation(tmp_path):
+    """Unsupported tables and fully invalid inputs are rejected."""
+    service = SetiGenerationService()
+    with pytest.raises(ValueError, match="no está soportada"):
+        service.generate_table_parallel("Z9", [], str(tmp_path))
+    with pytest.raises(ValueError, match="No hay registros válidos"):
+        service.generate_table_parallel("D2", [None] * 3, str(tmp_path), workers=1, chunk_size=2)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chunk_worker_entry_point():
+    """The chunk worker returns the file name, encoded lines and chunk-local errors."""
+    from peru_susalud_seti.application.services import _map_chunk_in_worker
+
+    filename, data, errors = _map_chunk_in_worker("F", [None, {"period": "202602", "ipress_code": "12345678"}])
+    assert filename == "12345678_2026_02_TFF0.TXT"
+    assert data == b"202602|12345678||||0\n"
+    assert [index for index, _ in errors] == [0]
+    assert _map_chunk_in_worker("F", [None])[0] is None
+
+
+def test_service_rejects_rows_outside_cp1252(tmp_path, new_recorder):
+    """Rows with characters ANSI cannot hold are reported per row and skipped."""
+    recorder = new_recorder()
+    service = SetiGenerationService()
+    service.attach(recorder)
+    rows = [
+        {"period": "202602", "ipress_code": "12345678", "ups_code": "301601"},
+        {"period": "202602", "ipress_code": "12345678", "ups_code": "30160✓"},
+    ]
+    path = service.generate_table("B1", rows, str(tmp_path))
+
+    errors = recorder.messages("ERROR")
+    assert len(errors) == 1 and errors[0].startswith("Fila 2:") and "cp1252" in errors[0]
+    with open(path, "r", encoding="cp1252") as f:
+        assert len(f.read().splitlines()) == 1
+
+def test_service_uses_injected_writer(tmp_path, monkeypatch):
+    """An injected writer's durability mode applies to generated tables."""
+    from peru_susalud_seti.infrastructure.writers import Durability, SetiFileWriter
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+
+    service = SetiGenerationService(SetiFileWriter(durability=Durability.FILE))
+    service.generate_table("E", [{"period": "202602", "ipress_code": "00001234"}], str(tmp_path))
+    assert len(synced) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["00001234_2026_02_TEE0.TXT"]
+
+def test_service_async_dispatch_flushes_before_returning(tmp_path, new_recorder):
+    """With async dispatch, observers hold every event once generate_table returns."""
+    recorder = new_recorder()
+    service = SetiGenerationService()
+    service.attach(recorder)
+    service.enable_async_dispatch(max_batch=2)
+
+    rows = [{"period": "202602", "ipress_code": "00001234"}, {"period": "BAD", "ipress_code": "00001234"}]
+    service.generate_table("E", rows, str(tmp_path))
+    assert recorder.types() == ["START", "ERROR", "SUCCESS"]
+
+    with pytest.raises(ValueError, match="No hay registros"):
+        service.generate_table("E", rows[1:], str(tmp_path))
+    assert recorder.types()[3:] == ["START", "ERROR"]
+    service.disable_async_dispatch()
+
+@pytest.mark.parametrize("batch_size", [None, 2])
+def test_service_aggregates_row_errors(tmp_path, batch_size, new_recorder):
+    """Aggregation groups failures by template in one summary plus N detailed events."""
+    from peru_susalud_seti import ErrorAggregation
+    recorder = new_recorder()
+    service = SetiGenerationService(error_aggregation=ErrorAggregation(max_details=1, max_samples=2))
+    service.attach(recorder)
+
+    rows = [
+        {"period": "BAD1", "ipress_code": "00001234"},
+        {"period": "202602", "ipress_code": "00001234"},
+        {"period": "BAD2", "ipress_code": "00001234"},
+        {"period": "202602", "ipress_code": "123"},
+        {"period": "BAD3", "ipress_code": "00001234"},
+    ]
+    service.generate_table("B1", rows, str(tmp_path), batch_size=batch_size)
+
+    assert recorder.types() == ["START", "ERROR", "ERROR_SUMMARY", "SUCCESS"]
+    assert recorder.events[1][1].startswith("Fila 1: ")
+    summary = recorder.events[2][2]
+    assert summary["total"] == 4
+    assert [(g["count"], g["sample_rows"]) for g in summary["groups"]] == [(3, [1, 3]), (1, [4])]
+    assert "El periodo '...' es inválido" in summary["groups"][0]["template"]
+    assert summary["groups"][0]["exception"] == "ValueError"
+
+def test_service_aggregation_summarizes_before_failing(tmp_path, new_recorder):
+    """When every row fails, the summary is still emitted before the error."""
+    from peru_susalud_seti import ErrorAggregation
+    recorder = new_recorder()
+    service = SetiGenerationService(error_aggregation=ErrorAggregation())
+    service.attach(recorder)
+
+    with pytest.raises(ValueError, match="No hay registros"):
+        service.generate_partitioned("E", [{"period": "BAD"}] * 3, str(tmp_path))
+    assert recorder.types() == ["START", "ERROR_SUMMARY"]
+    assert recorder.events[1][2]["groups"][0]["sample_rows"] == [1, 2, 3]
+
+def test_service_run_error_wins_over_observer_error(tmp_path):
+    """A failing async observer does not hide the generation error itself."""
+    class Failing(Observer):
+        def update(self, event_type, message, data=None):
+            raise RuntimeError("sink down")
+
+    service = SetiGenerationService()
+    service.attach(Failing())
+    service.enable_async_dispatch()
+    with pytest.raises(ValueError, match="No hay registros válidos"):
+        service.generate_table("E", [{"period": "BAD"}], str(tmp_path))
+    with pytest.raises(RuntimeError, match="sink down"):
+        service.generate_table("E", [{"period": "202602", "ipress_code": "00001234"}], str(tmp_path))
+    service.disable_async_dispatch()
+
+def test_service_generates_from_streamed_json(tmp_path):
+    """Readers feed generate_table directly, without building a list first."""
+    from peru_susalud_seti.infrastructure.readers import read_json_array, read_json_lines
+    rows = [{"period": "202602", "ipress_code": "00001234", "total_patients": n} for n in range(5)]
+    (tmp_path / "rows.json").write_text(json.dumps(rows), encoding="utf-8")
+    (tmp_path / "rows.jsonl").write_text("\n".join(map(json.dumps, rows)), encoding="utf-8")
+
+    service = SetiGenerationService()
+    outputs = []
+    for name, reader in (("array", read_json_array), ("lines", read_json_lines)):
+        (tmp_path / name).mkdir()
+        path = service.generate_table("B1", reader(tmp_path / f"rows.{'json' if name == 'array' else 'jsonl'}"), str(tmp_path / name))
+        with open(path, "rb") as f:
+            outputs.append(f.read())
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count(b"\n") == 5
+
+def test_service_generates_from_database_cursor(tmp_path, new_recorder):
+    """A SQLite cursor stands in for the HIS database as a streamed row source."""
+    import sqlite3
+    from peru_susalud_seti.infrastructure.readers import read_cursor
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE egresos (periodo TEXT, ipress TEXT, tipo_salida TEXT, pacientes INTEGER)")
+    connection.executemany(
+        "INSERT INTO egresos VALUES (?, ?, ?, ?)",
+        [("202602", "00001234", "1", n) for n in range(10)] + [("2026-02", "00001234", "1", 1)]
+    )
+    cursor = connection.execute("SELECT * FROM egresos")
+    columns = {"periodo": "period", "ipress": "ipress_code", "tipo_salida": "exit_type", "pacientes": "total_patients"}
+
+    recorder = new_recorder()
+    service = SetiGenerationService()
+    service.attach(recorder)
+    path = service.generate_table("C1", read_cursor(cursor, columns, fetch_size=3), str(tmp_path))
+    with open(path, encoding="cp1252") as f:
+        assert len(f.read().splitlines()) == 10
+    assert recorder.messages("ERROR")[0].startswith("Fila 11:")
+
+
+def test_cache_skips_unchanged_tables(tmp_path, new_recorder, monkeypatch):
+    """A second run with the same rows returns the same file without mapping it."""
+    from peru_susalud_seti import GenerationCache
+    rows = [{"period": "202602", "ipress_code": "00001234", "total_patients": n} for n in range(5)]
+    rows.append({"period": "bad", "ipress_code": "00001234"})
+    recorder = new_recorder()
+    service = SetiGenerationService(cache=GenerationCache())
+    service.attach(recorder)
+
+    path = service.generate_table("B1", iter(rows), str(tmp_path))
+    assert recorder.types() == ["START", "CACHE_MISS", "ERROR", "SUCCESS"]
+
+    recorder.events.clear()
+    monkeypatch.setattr(service, "_map_rows", lambda *args: pytest.fail("rows were mapped"))
+    assert service.generate_table("B1", rows, str(tmp_path)) == path
+    assert recorder.types() == ["START", "CACHE_HIT"]
+    assert recorder.events[1][2] == {"table_id": "B1", "file_path": path, "failed_rows": 1}
+
+    monkeypatch.undo()
+    recorder.events.clear()
+    rows[0]["total_patients"] = 99
+    assert service.generate_table("B1", rows, str(tmp_path)) == path
+    assert recorder.types() == ["START", "CACHE_MISS", "ERROR", "SUCCESS"]
+    with open(path, encoding="cp1252") as f:
+        assert "|99|" in f.read()
+
+
+def test_cache_is_shared_with_generate_all_workers(tmp_path):
+    """generate_all hands the cache to its workers, which write the manifests."""
+    from peru_susalud_seti import GenerationCache
+    tables = {
+        "B1": [{"period": "202602", "ipress_code": "00001234", "total_patients": 1}],
+        "G": [{"period": "202602", "ipress_code": "00001234", "total_procedures": 1}],
+    }
+    SetiGenerationService(cache=GenerationCache()).generate_all(tables, str(tmp_path), max_workers=2)
+    assert sorted(os.listdir(tmp_path / ".seti-cache")) == ["B1_00001234_202602.json", "G_00001234_202602.json"]
+
+
+def test_catalog_validation_in_every_generation_path(tmp_path, new_recorder):
+    """Unknown codes are row errors with the same numbering in each path."""
+    from peru_susalud_seti import CatalogValidation, CodeCatalog
+    ups = tmp_path / "ups.txt"
+    ups.write_text("301601\n", encoding="utf-8")
+    catalogs = CatalogValidation(ups=str(ups), surveillance=CodeCatalog.from_codes(["I01"]))
+    rows = [
+        {"period": "202602", "ipress_code": "00001234", "ups_code": "301601", "surveillance_code": "i01", "event_count": 1},
+        {"period": "202602", "ipress_code": "00001234", "ups_code": "999999", "surveillance_code": "I01", "event_count": 1},
+        {"period": "202602", "ipress_code": "00001234", "ups_code": "301601", "surveillance_code": "Z99", "event_count": 1},
+    ]
+    expected = [
+        "Fila 2: El código UPS '999999' no figura en el catálogo.",
+        "Fila 3: El código de vigilancia 'Z99' no figura en el catálogo.",
+    ]
+    runs = [
+        lambda service, out: service.generate_table("F", rows, out),
+        lambda service, out: service.generate_table("F", rows, out, batch_size=2),
+        lambda service, out: service.generate_table_parallel("F", rows, out, workers=2, chunk_size=2),
+        lambda service, out: service.generate_all({"F": rows}, out, max_workers=1)["F"].file_path,
+    ]
+    for number, run in enumerate(runs):
+        recorder = new_recorder()
+        service = SetiGenerationService(catalogs=catalogs)
+        service.attach(recorder)
+        output_dir = tmp_path / str(number)
+        output_dir.mkdir()
+        path = run(service, str(output_dir))
+        assert recorder.messages("ERROR") == expected
+        with open(path, encoding="cp1252") as f:
+            assert f.read().splitlines() == ["202602|00001234||301601|I01|1"]
+
+
+def test_cache_expires_when_a_catalog_changes(tmp_path, new_recorder):
+    """The catalogs in use are part of the cache key."""
+    from peru_susalud_seti import CatalogValidation, CodeCatalog, GenerationCache
+    rows = [{"period": "202602", "ipress_code": "00001234", "ups_code": "301601", "total_patients": 1}]
+    for codes in (["301601"], ["301601", "301602"]):
+        recorder = new_recorder()
+        service = SetiGenerationService(cache=GenerationCache(), catalogs=CatalogValidation(ups=CodeCatalog.from_codes(codes)))
+        service.attach(recorder)
+        service.generate_table("B1", rows, str(tmp_path))
+        assert "CACHE_MISS" in recorder.types()
+
+
+def test_duplicate_keys_rejected_or_merged(tmp_path, new_recorder):
+    """REJECT reports repeated keys as row errors; MERGE sums them into one line."""
+    from peru_susalud_seti import DuplicateCheck, DuplicatePolicy
+    rows = [
+        {"period": "202602", "ipress_code": "00001234", "ups_code": "301601", "total_patients": 2},
+        {"period": "202602", "ipress_code": "00001234", "ups_code": "301602", "total_patients": 1},
+        {"period": "202602", "ipress_code": "00001234", "ups_code": "301601", "total_patients": 3},
+    ]
+    (tmp_path / "reject").mkdir()
+    (tmp_path / "merge").mkdir()
+    recorder = new_recorder()
+    service = SetiGenerationService(duplicates=DuplicateCheck())
+    service.attach(recorder)
+    for batch_size in (None, 2):
+        recorder.events.clear()
+        path = service.generate_table("B1", rows, str(tmp_path / "reject"), batch_size=batch_size)
+        assert [m[:16] for m in recorder.messages("ERROR")] == ["Fila 3: Clave du"]
+        with open(path, encoding="cp1252") as f:
+            assert len(f.read().splitlines()) == 2
+
+    recorder = new_recorder()
+    service = SetiGenerationService(duplicates=DuplicateCheck(policy=DuplicatePolicy.MERGE))
+    service.attach(recorder)
+    path = service.generate_table("B1", rows, str(tmp_path / "merge"))
+    assert recorder.types() == ["START", "DUPLICATES_MERGED", "SUCCESS"]
+    with open(path, encoding="cp1252") as f:
+        assert [line.split("|")[6] for line in f.read().splitlines()] == ["5", "1"]
+
+    with pytest.raises(ValueError, match="duplicados no está disponible"):
+        service.generate_table_parallel("B1", rows, str(tmp_path))
+
+
+def test_catalog_rejected_rows_do_not_take_a_duplicate_key(tmp_path, new_recorder):
+    """Catalog checks run first, so a later valid row with the same key is kept."""
+    from peru_susalud_seti import CatalogValidation, CodeCatalog, DuplicateCheck, GenerationCache
+    from peru_susalud_seti.domain.models import EmergencyMorbidityD2
+    rows = [
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "X99", "total_cases": 1},
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "J189", "total_cases": 2},
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "J189", "total_cases": 3},
+    ]
+    recorder = new_recorder()
+    service = SetiGenerationService(
+        cache=GenerationCache(), duplicates=DuplicateCheck(keys={EmergencyMorbidityD2: ("period", "ipress_code")}),
+        catalogs=CatalogValidation(icd10=CodeCatalog.from_codes(["J189"])),
+    )
+    service.attach(recorder)
+    path = service.generate_table("D2", rows, str(tmp_path))
+    assert [message[:20] for message in recorder.messages("ERROR")] == ["Fila 1: El código CI", "Fila 3: Clave duplic"]
+    with open(path, encoding="cp1252") as f:
+        assert "|J189|D|2|" in f.read()
+
+
+def test_generate_table_from_aggregated_encounters(tmp_path):
+    """Encounter rows rolled up by aggregate_encounters feed generate_table directly."""
+    from peru_susalud_seti import aggregate_encounters
+    encounters = [
+        {"period": "202602", "ipress_code": "00001234", "ups_code": "301601", "gender": g, "patient_id": p}
+        for g, p in [("1", "a"), ("1", "a"), ("2", "b"), ("1", "c")]
+    ]
+    path = SetiGenerationService().generate_table("B1", aggregate_encounters("B1", encounters), str(tmp_path))
+    with open(path, encoding="cp1252") as f:
+        assert f.read().splitlines() == [
+            "202602|00001234||301601|01|1|2|3|3|4",
+            "202602|00001234||301601|01|2|1|1|3|4",
+        ]
+
+
+def test_service_records_table_metrics(tmp_path):
+    """generate_table returns and records row counts, bytes and stage times."""
+    from peru_susalud_seti import DuplicateCheck, DuplicatePolicy, GenerationCache, InMemoryMetricsSink
+    rows = [{"period": "202602", "ipress_code": "00001234", "ups_code": "301601", "total_patients": n} for n in range(3)]
+    rows.append({"period": "bad", "ipress_code": "00001234"})
+    sink = InMemoryMetricsSink()
+    service = SetiGenerationService(cache=GenerationCache(), duplicates=DuplicateCheck(policy=DuplicatePolicy.MERGE), metrics=sink)
+
+    result = service.generate_table("B1", iter(rows), str(tmp_path), batch_size=2)
+    metrics = result.metrics
+    assert sink.records == [metrics]
+    assert (metrics.table_id, metrics.file_path, metrics.cached) == ("B1", result, False)
+    assert (metrics.rows_in, metrics.rows_valid, metrics.rows_rejected, metrics.rows_written) == (4, 3, 1, 1)
+    assert metrics.bytes_written == os.path.getsize(result)
+    assert list(metrics.stage_seconds) == ["map", "format", "encode", "write"]
+    assert sum(metrics.stage_seconds.values()) <= metrics.elapsed_seconds
+
+    cached = service.generate_table("B1", rows, str(tmp_path)).metrics
+    assert cached.cached
+    assert (cached.rows_in, cached.rows_valid, cached.rows_rejected, cached.rows_written, cached.bytes_written) == (4, 3, 1, 0, 0)
+    assert sink.latest("B1") is cached
+
+
+def test_service_without_metrics_sink_times_nothing(tmp_path, monkeypatch):
+    """Without a sink the result carries no metrics and the writer gets no stats."""
+    from peru_susalud_seti.infrastructure.writers import SetiFileWriter
+    monkeypatch.setattr(SetiFileWriter, "_write_stream_timed", lambda *args: pytest.fail("timed write"))
+    result = SetiGenerationService().generate_table("B1", [{"period": "202602", "ipress_code": "00001234"}], str(tmp_path))
+    assert result.metrics is None
+
+
+def test_generate_all_collects_worker_metrics(tmp_path):
+    """Metrics measured in the workers reach the parent sink and the results."""
+    from peru_susalud_seti import InMemoryMetricsSink
+    tables = {
+        "B1": [{"period": "202602", "ipress_code": "00001234", "total_patients": 1}],
+        "G": [{"period": "202602", "ipress_code": "00001234", "total_procedures": 1}, {"period": "x"}],
+    }
+    sink = InMemoryMetricsSink()
+    results = SetiGenerationService(metrics=sink).generate_all(tables, str(tmp_path), max_workers=2)
+    assert [m.table_id for m in sink.records] == ["B1", "G"]
+    assert results["G"].metrics == sink.latest("G")
+    assert (results["G"].metrics.rows_in, results["G"].metrics.rows_rejected) == (2, 1)
+    assert type(results["G"].file_path) is str
+
+
+def test_service_profiles_runs_over_min_rows(tmp_path, new_recorder):
+    """Profiled runs leave a loadable .pstats next to the TXT; small runs do not."""
+    import pstats
+    from peru_susalud_seti import Profiling
+    rows = [{"period": "202602", "ipress_code": "00001234", "total_patients": n} for n in range(3)]
+    recorder = new_recorder()
+    service = SetiGenerationService(profiling=Profiling(min_rows=3))
+    service.attach(recorder)
+
+    for small in (rows[:2], iter(rows[:2])):
+        service.generate_table("B1", small, str(tmp_path))
+        assert not list(tmp_path.glob("*.pstats"))
+    assert "PROFILE" not in recorder.types()
+
+    for source in (rows, iter(rows)):
+        recorder.events.clear()
+        path = service.generate_table("B1", source, str(tmp_path))
+        stats_path = tmp_path / "00001234_2026_02_TBB1.B1.pstats"
+        assert recorder.types() == ["START", "SUCCESS", "PROFILE"]
+        assert recorder.events[-1][2] == {"table_id": "B1", "file_path": str(stats_path)}
+        functions = {name for _, _, name in pstats.Stats(str(stats_path)).stats}
+        assert "write_stream" in functions
+        stats_path.unlink()
+        with open(path, encoding="cp1252") as f:
+            assert len(f.read().splitlines()) == 3
+
+
+def test_service_profiling_from_environment(tmp_path, monkeypatch):
+    """SETI_PROFILE enables profiling for services built without a setting."""
+    monkeypatch.setenv("SETI_PROFILE", "1")
+    SetiGenerationService().generate_table("B1", [{"period": "202602", "ipress_code": "00001234"}], str(tmp_path))
+    assert [p.name for p in tmp_path.glob("*.pstats")] == ["00001234_2026_02_TBB1.B1.pstats"]
@@ -0,0 +1,61 @@
+import json
+import subprocess
+import sys
+import pytest
+import peru_susalud_seti
+
+# Modules a cold start must not pay for until they are needed.
+_HEAVY = ("numpy", "asyncio", "concurrent.futures.process", "pickle", "cProfile")
+
+# Generous ceiling for `import peru_susalud_seti` under -X importtime (it
+# takes a few ms); an eager import of the library blows well past it.
+_IMPORT_BUDGET_US = 50_000
+
+
+def _loaded_after(code):
+    """Modules of interest present in sys.modules after running code in a fresh interpreter."""
+    probe = f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    child = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True)
+    modules = set(json.loads(child.stdout.splitlines()[-1]))
+    return {name for name in modules if name.startswith("peru_susalud_seti.") or name in _HEAVY}
+
+
+def test_package_import_loads_nothing():
+    """The package exports its names lazily (PEP 562)."""
+    assert _loaded_after("import peru_susalud_seti") == set()
+
+
+def test_single_table_run_loads_only_what_it_uses(tmp_path):
+    """A serial run imports the mappers on first use, but no NumPy, pool or asyncio."""
+    code = (
+        "from peru_susalud_seti import SetiGenerationService\n"
+        "service = SetiGenerationService()\n"
+        "import sys; assert 'peru_susalud_seti.application.mappers' not in sys.modules\n"
+        f"service.generate_table('B1', [{{'period': '202602', 'ipress_code': '00001234'}}], {str(tmp_path)!r})"
+    )
+    loaded = _loaded_after(code)
+    assert "peru_susalud_seti.application.mappers" in loaded
+    assert not loaded & set(_HEAVY)
+
+
+def test_import_time_budget():
+    """Tracks the cold import of the package with python -X importtime."""
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import peru_susalud_seti"],
+        check=True, capture_output=True, text=True
+    )
+    lines = [line for line in child.stderr.splitlines() if line.endswith("| peru_susalud_seti")]
+    cumulative_us = int(lines[-1].split("|")[1])
+    assert cumulative_us < _IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize("name", peru_susalud_seti.__all__)
+def test_every_export_resolves(name):
+    """Each public name imports from its module and is listed by dir()."""
+    assert getattr(peru_susalud_seti, name) is not None
+    assert name in dir(peru_susalud_seti)
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="no_existe"):
+        peru_susalud_seti.no_existe
@@ -0,0 +1,78 @@
+import random
+import pytest
+from peru_susalud_seti.application import aggregation
+from peru_susalud_seti.application.aggregation import GroupingStrategy, aggregate_encounters
+
+
+def _encounters(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "period": "202602", "ipress_code": "00001234", "ups_code": rng.choice(["301601", "301602"]),
+            "age_group": rng.choice([1, "1", "01", "12"]), "gender": rng.choice(["1", "2"]),
+            "patient_id": rng.choice([None, "a", "b", "c", 7]), "procedures": rng.choice([1, 2, "3"]),
+        }
+        for _ in range(count)
+    ]
+
+
+def test_counts_distinct_patients_and_encounters():
+    """Patients are counted once per group; anonymous encounters count one each."""
+    rows = [
+        {"period": "202602", "ipress_code": "00001234", "age_group": "1", "patient_id": "p1"},
+        {"period": "202602", "ipress_code": "00001234", "age_group": "01", "patient_id": "p1"},
+        {"period": "202602", "ipress_code": "00001234", "age_group": "01", "patient_id": "p2"},
+        {"period": "202602", "ipress_code": "00001234", "age_group": "01"},
+        {"period": "202602", "ipress_code": "00001234", "age_group": "01"},
+        {"period": "202602", "ipress_code": "00001234", "age_group": "02", "patient_id": "p1"},
+    ]
+    for strategy in GroupingStrategy:
+        result = list(aggregate_encounters("B1", rows, strategy))
+        assert [(r["age_group"], r["total_patients"], r["total_appointments"]) for r in result] == [("01", 4, 5), ("02", 1, 1)]
+        assert result[0]["gender"] == "1" and result[0]["funding_source"] == "4"
+
+
+@pytest.mark.parametrize("table_id, group_extra, count_field", [
+    ("B2", ("priority", "destination"), "total_appointments"),
+    ("G", (), "total_procedures"),
+    ("I", (), "total_referrals"),
+])
+def test_specs_per_table(table_id, group_extra, count_field):
+    """B2 also groups by priority and destination; G/H/I sum their per-encounter counts."""
+    rows = [
+        {"period": "202602", "ipress_code": "00001234", "patient_id": "p1", "procedures": 2, "referrals": 3},
+        {"period": "202602", "ipress_code": "00001234", "patient_id": "p2"},
+    ]
+    (row,) = aggregate_encounters(table_id, rows)
+    assert all(name in row for name in group_extra)
+    assert row["total_patients"] == 2
+    assert row[count_field] == {"total_appointments": 2, "total_procedures": 3, "total_referrals": 4}[count_field]
+
+
+def test_strategies_and_spilling_agree(tmp_path, monkeypatch):
+    """Hash, sort (with and without NumPy) and spilled hash give the same rows."""
+    rows = _encounters(3000)
+    expected = list(aggregate_encounters("G", rows))
+    assert list(aggregate_encounters("G", rows, GroupingStrategy.SORT)) == expected
+    assert list(aggregate_encounters("G", rows, max_groups=3, spill_dir=str(tmp_path))) == expected
+    monkeypatch.setattr(aggregation, "_SPILL_BLOCK", 2)
+    assert list(aggregate_encounters("G", rows, max_groups=5)) == expected
+    monkeypatch.setattr(aggregation, "np", None)
+    assert list(aggregate_encounters("G", rows, "sort")) == expected
+    assert list(aggregate_encounters("G", [], "sort")) == []
+
+
+def test_sort_strategy_with_numpy_and_no_rows():
+    """No encounters, no rows."""
+    assert list(aggregate_encounters("B1", [], GroupingStrategy.SORT)) == []
+    assert list(aggregate_encounters("B1", [])) == []
+
+
+def test_invalid_arguments_and_encounters():
+    """Unsupported tables, bad budgets and bad values are rejected."""
+    with pytest.raises(ValueError, match="no admite agregación"):
+        aggregate_encounters("A", [])
+    with pytest.raises(ValueError, match="max_groups"):
+        aggregate_encounters("B1", [], max_groups=0)
+    with pytest.raises(ValueError, match="Atención 2:"):
+        list(aggregate_encounters("G", [{"procedures": 1}, {"procedures": "x"}]))
@@ -0,0 +1,48 @@
+from peru_susalud_seti.infrastructure.cache import GenerationCache, input_digest
+
+
+ROWS = [
+    {"period": "202602", "ipress_code": "00001234", "total_patients": 10},
+    {"period": "202602", "ipress_code": "00001234", "total_patients": 20},
+]
+
+
+def test_input_digest_is_stable_and_content_sensitive():
+    """Key order does not change the hash; values and table do."""
+    reordered = [dict(reversed(list(row.items()))) for row in ROWS]
+    assert input_digest("B1", ROWS) == input_digest("B1", reordered)
+    assert input_digest("B1", ROWS) != input_digest("G", ROWS)
+    assert input_digest("B1", ROWS) != input_digest("B1", ROWS[:1])
+
+
+def test_lookup_hits_only_for_the_same_rows_and_an_intact_file(tmp_path):
+    """A stored slot is reused until the rows or the TXT change."""
+    cache = GenerationCache()
+    entry = cache.lookup("B1", ROWS, str(tmp_path))
+    assert entry.file_path is None
+
+    txt = tmp_path / "00001234_2026_02_TBB1.TXT"
+    txt.write_bytes(b"line\n")
+    cache.store(entry, str(txt), str(tmp_path), failed_rows=2)
+
+    hit = cache.lookup("B1", ROWS, str(tmp_path))
+    assert hit.file_path == str(txt) and hit.failed_rows == 2
+    assert cache.lookup("B1", ROWS[:1], str(tmp_path)).file_path is None
+
+    txt.write_bytes(b"lime\n")
+    assert cache.lookup("B1", ROWS, str(tmp_path)).file_path is None
+    txt.unlink()
+    assert cache.lookup("B1", ROWS, str(tmp_path)).file_path is None
+
+
+def test_lookup_without_key_or_with_a_broken_manifest(tmp_path):
+    """Rows without IPRESS/period are not cached; an unreadable manifest is a miss."""
+    cache = GenerationCache()
+    assert cache.lookup("B1", [], str(tmp_path)) is None
+    assert cache.lookup("B1", [{"period": "202602"}], str(tmp_path)) is None
+
+    entry = cache.lookup("B1", ROWS, str(tmp_path))
+    manifest_dir = tmp_path / ".seti-cache"
+    manifest_dir.mkdir()
+    (manifest_dir / "B1_00001234_202602.json").write_text("{", encoding="utf-8")
+    assert cache.lookup("B1", ROWS, str(tmp_path)) == entry
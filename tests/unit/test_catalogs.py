@@ -0,0 +1,72 @@
+import pickle
+import pytest
+from peru_susalud_seti.application.mappers import TableD2Mapper, TableFMapper
+from peru_susalud_seti.application.services import CatalogValidation, _check_batch
+from peru_susalud_seti.infrastructure import catalogs
+from peru_susalud_seti.infrastructure.catalogs import CodeCatalog, open_catalog
+
+
+def test_catalog_file_is_parsed_lazily_and_shared(tmp_path, monkeypatch):
+    """Codes are read on first lookup, normalized, and parsed once per file."""
+    path = tmp_path / "cie10.txt"
+    path.write_text("# CIE-10\nj18.9|Neumonía\nA09\tDiarrea\n\n A00 \n", encoding="utf-8")
+    parses = []
+    parse = catalogs._parse_catalog
+    monkeypatch.setattr(catalogs, "_parse_catalog", lambda *args: parses.append(args) or parse(*args))
+
+    first, second = CodeCatalog(path), CodeCatalog(str(path))
+    assert parses == []
+    assert "J18.9" in first and "A00" in second and "B00" not in second
+    assert len(first) == 3 and len(parses) == 1
+
+    path.write_text("B00\n", encoding="utf-8")
+    assert "B00" in CodeCatalog(path) and len(parses) == 2
+
+
+def test_catalog_sources_and_errors(tmp_path):
+    """In-memory catalogs, pickling of file catalogs and invalid arguments."""
+    assert "I01" in CodeCatalog.from_codes([" i01 "])
+    assert repr(CodeCatalog.from_codes(["I01"])) == "CodeCatalog(1 códigos)"
+
+    path = tmp_path / "ups.txt"
+    path.write_text("301601\n", encoding="utf-8")
+    catalog = CodeCatalog(path)
+    assert "301601" in catalog
+    clone = pickle.loads(pickle.dumps(catalog))
+    assert clone._codes is None and "301601" in clone
+
+    with pytest.raises(ValueError, match="no ambos"):
+        CodeCatalog()
+    with pytest.raises(ValueError, match="No se pudo leer el catálogo"):
+        "X" in CodeCatalog(tmp_path / "missing.txt")
+    with pytest.raises(TypeError, match="Catálogo no soportado"):
+        open_catalog(42)
+    assert open_catalog(catalog) is catalog and open_catalog(None) is None
+
+
+def test_catalog_validation_checker_and_fingerprint():
+    """Only the catalogs matching an entity's fields are checked."""
+    validation = CatalogValidation(icd10=CodeCatalog.from_codes(["J189"]))
+    assert validation.checker(TableFMapper._ENTITY) is None
+
+    check = validation.checker(TableD2Mapper._ENTITY)
+    check(TableD2Mapper.map_from_dict({"period": "202602", "ipress_code": "00001234", "icd10_code": "j189"}))
+    with pytest.raises(ValueError, match="El código CIE-10 'X99' no figura en el catálogo."):
+        check(TableD2Mapper.map_from_dict({"period": "202602", "ipress_code": "00001234", "icd10_code": "X99"}))
+
+    assert validation.fingerprint() == CatalogValidation(icd10=CodeCatalog.from_codes(["J189"])).fingerprint()
+    assert validation.fingerprint() != CatalogValidation(icd10=CodeCatalog.from_codes(["J18"])).fingerprint()
+
+
+def test_check_batch_keeps_row_indexes():
+    """Catalog failures are merged with mapping errors in row order."""
+    rows = [
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "X99"},
+        {"period": "BAD", "ipress_code": "00001234", "icd10_code": "J189"},
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "J189"},
+        {"period": "202602", "ipress_code": "00001234", "icd10_code": "X98"},
+    ]
+    check = CatalogValidation(icd10=CodeCatalog.from_codes(["J189"])).checker(TableD2Mapper._ENTITY)
+    result = _check_batch(TableD2Mapper.map_batch(rows), check)
+    assert [record.icd10_code for record in result.records] == ["J189"]
+    assert [index for index, _ in result.errors] == [0, 1, 3]
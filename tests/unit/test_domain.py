@@ -3,8 +3,23 @@ Unit tests for Domain Models.
 Targeting 100% coverage for domain/models.py and domain/types.py
 """
 import pytest
-from peru_susalud_seti.domain.models import HealthResourceTableA
-from peru_susalud_seti.domain.types import Subject, Observer
+from dataclasses import fields
+from peru_susalud_seti.domain.models import (
+    HealthResourceTableA,
+    OutpatientTableB1,
+    EmergencyTableB2,
+    InpatientTableC1,
+    StayTableC2,
+    EmergencyProductionD1,
+    EmergencyMorbidityD2,
+    ChildbirthTableE,
+    SurveillanceTableF,
+    ProceduresTableG,
+    SurgeryTableH,
+    ReferralTableI,
+    ExpenditureTableJ
+)
+from peru_susalud_seti.domain.types import Backpressure, Subject, Observer
 
 def test_domain_invalid_ipress_code():
     """Verifies validation of IPRESS code length."""
@@ -55,4 +70,272 @@ def test_subject_notify_execution():
     obs = ActiveObserver()
     sub.attach(obs)
     sub.notify("TEST", "Message")
-    assert obs.called is True
\ No newline at end of file
+    assert obs.called is True
+
+@pytest.mark.parametrize("entity_cls", [
+    OutpatientTableB1, EmergencyTableB2, InpatientTableC1, StayTableC2,
+    EmergencyProductionD1, EmergencyMorbidityD2, ChildbirthTableE,
+    SurveillanceTableF, ProceduresTableG, SurgeryTableH, ReferralTableI,
+    ExpenditureTableJ,
+])
+def test_domain_invariants_apply_to_every_table(entity_cls):
+    """Period, IPRESS and non-negative rules are enforced on all entities."""
+    def build(**overrides):
+        values = {}
+        for f in fields(entity_cls):
+            values[f.name] = 1 if f.type is int else 1.0 if f.type is float else "1"
+        values.update(period="202602", ipress_code="12345678")
+        values.update(overrides)
+        return entity_cls(**values)
+
+    assert build().period == "202602"
+    with pytest.raises(ValueError, match="El periodo '2026-02' es inválido"):
+        build(period="2026-02")
+    with pytest.raises(ValueError, match="debe tener 8 caracteres"):
+        build(ipress_code="1234")
+
+    int_fields = [f.name for f in fields(entity_cls) if f.type is int]
+    if int_fields:
+        with pytest.raises(ValueError, match=f"'{int_fields[-1]}' no puede ser negativo: -3"):
+            build(**{int_fields[-1]: -3})
+
+
+def _b2():
+    return EmergencyTableB2(
+        period="202602", ipress_code="12345678", ugipress_code="12345678",
+        ups_code="301602", age_group="05", gender="1",
+        total_patients=5, total_appointments=5,
+        poverty_level="3", funding_source="4",
+        priority="1", destination="2"
+    )
+
+def test_domain_entities_are_slotted_and_frozen():
+    """Entities carry no __dict__, keep inheritance and stay immutable."""
+    from dataclasses import FrozenInstanceError
+    from peru_susalud_seti.domain.models import BaseProductionTable
+
+    record = _b2()
+    assert not hasattr(record, "__dict__")
+    assert EmergencyTableB2.__slots__ == ("priority", "destination")
+    assert isinstance(record, BaseProductionTable)
+    with pytest.raises(FrozenInstanceError):
+        record.priority = "2"
+    with pytest.raises(FrozenInstanceError):
+        record.extra = "x"
+    with pytest.raises(FrozenInstanceError):
+        del record.priority
+
+def test_domain_entities_support_weak_references():
+    """Slotted entities can still be weakly referenced, like plain dataclasses."""
+    import weakref
+    record = _b2()
+    assert weakref.ref(record)() is record
+
+def test_domain_entities_pickle_and_replace():
+    """Slotted entities survive pickling (used by worker processes) and replace()."""
+    import pickle
+    from dataclasses import replace
+
+    record = _b2()
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert replace(record, priority="3").priority == "3"
+
+def test_domain_slotted_init_accepts_keywords_and_keeps_defaults():
+    """The compiled __init__ behaves like the dataclass one; defaults keep the original."""
+    from dataclasses import dataclass
+    from peru_susalud_seti.domain.models import _DomainEntity, _slotted
+
+    with pytest.raises(TypeError):
+        SurveillanceTableF(period="202602", ipress_code="12345678")
+
+    @_slotted
+    @dataclass(frozen=True)
+    class WithDefault(_DomainEntity):
+        period: str
+        ipress_code: str
+        event_count: int = 0
+
+    record = WithDefault("202602", "12345678")
+    assert record.event_count == 0 and not hasattr(record, "__dict__")
+
+def test_domain_rejects_text_outside_cp1252():
+    """Text must be representable in SUSALUD's ANSI files; Latin-1 accents are fine."""
+    record = SurveillanceTableF(
+        period="202602", ipress_code="12345678", ugipress_code="12345678",
+        ups_code="301101", surveillance_code="AÑO", event_count=1
+    )
+    assert record.surveillance_code == "AÑO"
+    with pytest.raises(ValueError, match="'surveillance_code' contiene el carácter '✓'"):
+        SurveillanceTableF(
+            period="202602", ipress_code="12345678", ugipress_code="12345678",
+            ups_code="301101", surveillance_code="I01✓", event_count=1
+        )
+
+def test_domain_accepts_non_str_values_in_text_fields():
+    """Non-str values in text fields are checked through str(), as they are written."""
+    record = SurveillanceTableF(
+        period="202602", ipress_code="12345678", ugipress_code="12345678",
+        ups_code=301101, surveillance_code="I01", event_count=1
+    )
+    assert record.ups_code == 301101
+
+
+class _BatchObserver(Observer):
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.batches = []
+    def update(self, event_type, message, data=None):  # pragma: no cover
+        raise AssertionError("async dispatch delivers batches")
+    def update_batch(self, events):
+        if self.gate is not None:
+            self.gate.wait()
+        self.batches.append(list(events))
+
+def _events(observer):
+    return [event for batch in observer.batches for event in batch]
+
+def test_async_dispatch_delivers_batches_in_order():
+    """Queued events reach update_batch in order, bounded by max_batch."""
+    sub = Subject()
+    obs = _BatchObserver()
+    sub.attach(obs)
+    sub.enable_async_dispatch(max_batch=3)
+    for n in range(10):
+        sub.notify("ERROR", f"Fila {n}")
+    sub.flush()
+    assert [message for _, message, _ in _events(obs)] == [f"Fila {n}" for n in range(10)]
+    assert max(len(batch) for batch in obs.batches) <= 3
+    sub.disable_async_dispatch()
+    sub.disable_async_dispatch()
+
+def test_default_update_batch_calls_update():
+    """Observers that only implement update still work in async mode."""
+    received = []
+    class Plain(Observer):
+        def update(self, event_type, message, data=None):
+            received.append((event_type, message, data))
+    sub = Subject()
+    sub.attach(Plain())
+    sub.enable_async_dispatch()
+    sub.notify("SUCCESS", "ok", {"rows": 1})
+    sub.flush()
+    assert received == [("SUCCESS", "ok", {"rows": 1})]
+
+def _saturate(backpressure):
+    """Fills a one-slot queue while the observer is stuck on its first batch."""
+    import threading
+    gate = threading.Event()
+    sub = Subject()
+    obs = _BatchObserver(gate)
+    sub.attach(obs)
+    sub.enable_async_dispatch(max_queue=1, backpressure=backpressure)
+    sub.notify("ERROR", "Fila 0")
+    while sub._dispatcher._queue:
+        pass
+    return sub, obs, gate
+
+def test_async_dispatch_drop_oldest():
+    """A full queue discards its oldest event."""
+    sub, obs, gate = _saturate("drop_oldest")
+    for n in range(1, 4):
+        sub.notify("ERROR", f"Fila {n}")
+    gate.set()
+    sub.flush()
+    assert [message for _, message, _ in _events(obs)] == ["Fila 0", "Fila 3"]
+    sub.disable_async_dispatch()
+
+def test_async_dispatch_coalesce():
+    """A full queue counts overflowing events and reports them once per type."""
+    sub, obs, gate = _saturate(Backpressure.COALESCE)
+    for n in range(1, 5):
+        sub.notify("ERROR", f"Fila {n}")
+    gate.set()
+    sub.flush()
+    events = _events(obs)
+    assert [message for _, message, _ in events[:2]] == ["Fila 0", "Fila 1"]
+    assert events[2][0] == "ERROR" and events[2][2] == {"coalesced": 3}
+    sub.disable_async_dispatch()
+
+def test_async_dispatch_block_waits_for_room():
+    """With block backpressure, notify waits instead of losing events."""
+    import threading
+    sub, obs, gate = _saturate(Backpressure.BLOCK)
+    sub.notify("ERROR", "Fila 1")
+    producer = threading.Thread(target=sub.notify, args=("ERROR", "Fila 2"))
+    producer.start()
+    producer.join(0.05)
+    assert producer.is_alive()
+    gate.set()
+    producer.join()
+    sub.flush()
+    assert [message for _, message, _ in _events(obs)] == ["Fila 0", "Fila 1", "Fila 2"]
+    sub.disable_async_dispatch()
+
+def test_async_dispatch_reraises_observer_errors_on_flush():
+    """An observer failure in the background thread surfaces on flush."""
+    class Failing(Observer):
+        def update(self, event_type, message, data=None):
+            raise RuntimeError("syslog caído")
+    sub = Subject()
+    sub.attach(Failing())
+    sub.enable_async_dispatch()
+    sub.notify("ERROR", "Fila 1")
+    with pytest.raises(RuntimeError, match="syslog caído"):
+        sub.flush()
+    sub.flush()
+    sub.disable_async_dispatch()
+
+def test_async_dispatch_rejects_invalid_settings_and_closed_queue():
+    """Queue sizes must be positive and a closed dispatcher refuses events."""
+    from peru_susalud_seti.domain.types import _AsyncDispatcher
+    with pytest.raises(ValueError, match="max_queue"):
+        Subject().enable_async_dispatch(max_queue=0)
+    dispatcher = _AsyncDispatcher([], 1, 1, Backpressure.BLOCK)
+    dispatcher.close()
+    with pytest.raises(RuntimeError, match="cerrado"):
+        dispatcher.put(("ERROR", "Fila 1", None))
+
+def test_async_dispatch_never_sheds_lifecycle_events():
+    """Only per-row ERROR events are dropped or coalesced; order is kept."""
+    for backpressure in ("drop_oldest", "coalesce"):
+        sub, obs, gate = _saturate(backpressure)
+        sub.notify("START", "inicio")
+        for n in range(1, 4):
+            sub.notify("ERROR", f"Fila {n}")
+        sub.notify("SUCCESS", "archivo.TXT")
+        sub.notify("ERROR", "Fila 4")
+        gate.set()
+        sub.flush()
+        types = [event_type for event_type, _, _ in _events(obs)]
+        assert types[:2] == ["ERROR", "START"]
+        assert types.index("SUCCESS") > max(i for i, t in enumerate(types[:-1]) if t == "ERROR")
+        assert ("SUCCESS", "archivo.TXT", None) in _events(obs)
+        sub.disable_async_dispatch()
+
+def test_async_dispatch_thread_ends_with_subject():
+    """The dispatch thread stops once its subject is garbage collected."""
+    import gc
+    import threading
+    sub = Subject()
+    sub.attach(_BatchObserver())
+    sub.enable_async_dispatch()
+    sub.notify("ERROR", "Fila 1")
+    sub.flush()
+    thread = sub._dispatcher._thread
+    del sub
+    gc.collect()
+    thread.join(5)
+    assert not thread.is_alive()
+
+def test_flush_can_discard_observer_errors():
+    """flush(raise_errors=False) drops a pending observer error."""
+    class Failing(Observer):
+        def update(self, event_type, message, data=None):
+            raise RuntimeError("syslog caído")
+    sub = Subject()
+    sub.attach(Failing())
+    sub.enable_async_dispatch()
+    sub.notify("ERROR", "Fila 1")
+    sub.flush(raise_errors=False)
+    sub.flush()
+    sub.disable_async_dispatch()
@@ -0,0 +1,57 @@
+import pytest
+from peru_susalud_seti.application.duplicates import DuplicateCheck, DuplicatePolicy
+from peru_susalud_seti.application.mappers import TableB1Mapper, TableJMapper
+from peru_susalud_seti.domain.models import BaseProductionTable, EmergencyMorbidityD2, OutpatientTableB1
+
+
+def _b1(**values):
+    return TableB1Mapper.map_from_dict({"period": "202602", "ipress_code": "00001234", **values})
+
+
+def test_default_keys_are_the_text_fields_but_ugipress():
+    """B1 and D2 keys match SUSALUD's natural keys; keys may be overridden per base class."""
+    check = DuplicateCheck()
+    assert check.key_fields(OutpatientTableB1) == ("period", "ipress_code", "ups_code", "age_group", "gender", "poverty_level", "funding_source")
+    assert "icd10_code" in check.key_fields(EmergencyMorbidityD2) and "diagnosis_type" in check.key_fields(EmergencyMorbidityD2)
+    custom = DuplicateCheck(keys={BaseProductionTable: ("period",)})
+    assert custom.key_fields(OutpatientTableB1) == ("period",)
+    assert DuplicateCheck(policy="merge").policy is DuplicatePolicy.MERGE
+
+
+def test_rejecter_flags_repeated_keys_only():
+    """Rows differing only in counts or ugipress_code are duplicates."""
+    check = DuplicateCheck().rejecter(OutpatientTableB1)
+    check(_b1(total_patients=1))
+    check(_b1(gender="2"))
+    with pytest.raises(ValueError, match=r"Clave duplicada \(period=202602, ipress_code=00001234, ups_code=, age_group=01"):
+        check(_b1(total_patients=5, ugipress_code="00009999"))
+
+    single = DuplicateCheck(keys={OutpatientTableB1: ("period",)}).rejecter(OutpatientTableB1)
+    single(_b1())
+    with pytest.raises(ValueError, match=r"\(period=202602\)"):
+        single(_b1(gender="2"))
+    with pytest.raises(ValueError, match="al menos un campo"):
+        DuplicateCheck(keys={OutpatientTableB1: ()}).rejecter(OutpatientTableB1)
+
+
+def test_merger_sums_numeric_fields_in_first_occurrence_order():
+    """Counts (and amounts) are summed; unrepeated entities pass through unchanged."""
+    merger = DuplicateCheck(policy=DuplicatePolicy.MERGE).merger(OutpatientTableB1)
+    lone = _b1(gender="2", total_patients=9)
+    merged = list(merger.merge([_b1(total_patients=1, total_appointments=2), lone, _b1(total_patients=3), _b1(total_patients=4, total_appointments=1)]))
+    assert [(r.gender, r.total_patients, r.total_appointments) for r in merged] == [("1", 8, 3), ("2", 9, 0)]
+    assert merged[1] is lone and merger.merged == 2
+
+    amounts = DuplicateCheck().merger(TableJMapper._ENTITY)
+    rows = [TableJMapper.map_from_dict({"period": "202602", "ipress_code": "00001234", "executed_amount": v}) for v in (1.25, 2.5)]
+    assert [r.executed_amount for r in amounts.merge(rows)] == [3.75]
+
+
+def test_merger_survives_hash_collisions(monkeypatch):
+    """Distinct keys with the same hash are kept apart."""
+    from peru_susalud_seti.application import duplicates
+    monkeypatch.setattr(duplicates, "hash", lambda key: 0, raising=False)
+    merger = DuplicateCheck().merger(OutpatientTableB1)
+    merged = list(merger.merge([_b1(gender="1"), _b1(gender="2"), _b1(gender="2", total_patients=1), _b1(gender="3")]))
+    assert [(r.gender, r.total_patients) for r in merged] == [("1", 0), ("2", 1), ("3", 0)]
+    assert merger.merged == 1
@@ -177,4 +177,108 @@ def test_table_j_mapper_success():
     }
     entity = TableJMapper.map_from_dict(raw_data)
     assert entity.executed_amount == 1500.50
-    assert entity.budget_category == "2.3"
\ No newline at end of file
+    assert entity.budget_category == "2.3"
+
+@pytest.mark.parametrize("mapper, label", [
+    (TableD1Mapper, "TablaD1"),
+    (TableD2Mapper, "TablaD2"),
+    (TableEMapper, "TablaE"),
+    (TableFMapper, "TablaF"),
+    (TableGMapper, "TablaG"),
+    (TableHMapper, "TablaH"),
+    (TableIMapper, "TablaI"),
+    (TableJMapper, "TablaJ"),
+])
+def test_mapper_exception_wrapping(mapper, label):
+    """Every mapper wraps unexpected input errors with its table label."""
+    with pytest.raises(ValueError, match=f"Error en mapeo {label}"):
+        mapper.map_from_dict(None)
+
+
+def _b1_row(**overrides):
+    row = {"period": "202602", "ipress_code": "00001234", "age_group": "5", "total_patients": 3}
+    row.update(overrides)
+    return row
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_map_batch_matches_row_mapping(monkeypatch, use_numpy):
+    """map_batch yields the same entities and errors as map_from_dict per row."""
+    from peru_susalud_seti.application import mappers
+    if not use_numpy:
+        monkeypatch.setattr(mappers, "np", None)
+
+    rows = [_b1_row(), None, _b1_row(total_patients="x"), _b1_row(total_appointments=[]), _b1_row(total_patients=7.9)]
+    result = TableB1Mapper.map_batch(rows)
+
+    assert result.records == [TableB1Mapper.map_from_dict(rows[0]), TableB1Mapper.map_from_dict(rows[4])]
+    assert [index for index, _ in result.errors] == [1, 2, 3]
+    for index, error in result.errors:
+        with pytest.raises(ValueError) as expected:
+            TableB1Mapper.map_from_dict(rows[index])
+        assert str(error) == str(expected.value)
+
+def test_map_batch_accepts_columns():
+    """A dict of columns maps like the equivalent list of rows."""
+    columns = {
+        "period": ["202602", "202602"],
+        "ipress_code": ["00001234", "00005678"],
+        "total_patients": [True, False],
+        "total_appointments": [1.5, 2.0],
+    }
+    result = TableB1Mapper.map_batch(columns)
+
+    assert len(result.records) == 2
+    assert result.records[0].total_patients == 1
+    assert result.records[0].total_appointments == 1
+    assert result.records[0].age_group == "01"
+    assert result.errors == []
+
+def test_map_batch_table_a_and_j():
+    """Table A treats empty counts as zero and validates; Table J keeps floats."""
+    a = TableAMapper.map_batch([
+        {"period": "202602", "ipress_code": "00001234", "nurses": "", "hospital_beds": "4"},
+        {"period": "BAD", "ipress_code": "00001234"},
+    ])
+    j = TableJMapper.map_batch([{"period": "202602", "ipress_code": "00001234", "executed_amount": "10.5"}])
+    assert a.records[0].nurses == 0
+    assert "periodo 'BAD'" in str(a.errors[0][1])
+    assert j.records[0].executed_amount == 10.5
+
+def test_map_batch_empty():
+    """An empty batch produces no records and no errors."""
+    assert TableD2Mapper.map_batch([]) == ([], [])
+
+def test_map_batch_rejects_ragged_columns():
+    """Columns of different lengths are rejected instead of silently truncated."""
+    with pytest.raises(ValueError, match="misma longitud"):
+        TableB1Mapper.map_batch({"period": ["202602", "202602"], "ipress_code": ["00001234"]})
+
+def test_code_fields_share_interned_strings():
+    """Equal codes from different rows map to one string object, in both paths."""
+    rows = [{"period": "".join(["2026", "02"]), "ipress_code": "00001234", "age_group": str(n % 2), "gender": 1} for n in range(4)]
+    batch = TableB1Mapper.map_batch(rows).records
+    single = [TableB1Mapper.map_from_dict(row) for row in rows]
+    assert batch[0].period is batch[1].period is single[3].period
+    assert batch[0].age_group is single[2].age_group == "00"
+    assert batch[1].gender is single[0].gender == "1"
+
+def test_code_cache_keeps_value_types_apart():
+    """1, 1.0 and True are equal keys but normalize to different strings."""
+    values = [1, 1.0, True, "1"]
+    assert [TableB1Mapper.map_from_dict({"period": "202602", "ipress_code": "00001234", "gender": v}).gender for v in values] == ["1", "1.0", "True", "1"]
+    assert [record.gender for record in TableB1Mapper.map_batch({"gender": values, "period": ["202602"] * 4, "ipress_code": ["00001234"] * 4}).records] == ["1", "1.0", "True", "1"]
+
+def test_code_cache_is_bounded(monkeypatch):
+    """Past the size limit, values are still normalized but no longer cached."""
+    from peru_susalud_seti.application import mappers
+    monkeypatch.setattr(mappers, "_CODE_CACHE_SIZE", 2)
+    cache = mappers._CodeCache(str)
+    assert [cache[v] for v in ("a", "b", "c", 1, 2, 3, 1)] == ["a", "b", "c", "1", "2", "3", "1"]
+    assert len(cache) == 2 and len(cache._numbers) == 2
+
+def test_unhashable_code_is_a_row_error():
+    """A list in a code field is reported as a row error by both paths."""
+    row = {"period": "202602", "ipress_code": "00001234", "gender": ["1"]}
+    with pytest.raises(ValueError, match="Error en mapeo TablaB1"):
+        TableB1Mapper.map_from_dict(row)
+    assert [index for index, _ in TableB1Mapper.map_batch([row]).errors] == [0]
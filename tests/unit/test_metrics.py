@@ -0,0 +1,72 @@
+import pickle
+from peru_susalud_seti.application.metrics import (
+    GenerationResult,
+    InMemoryMetricsSink,
+    PrometheusTextfileSink,
+    TableMetrics,
+)
+
+
+def _metrics(table_id="B1", **overrides):
+    values = dict(
+        table_id=table_id, file_path="/out/X.TXT", rows_in=10, rows_valid=8, rows_rejected=2,
+        rows_written=8, bytes_written=400, elapsed_seconds=0.5,
+        stage_seconds={"map": 0.25, "format": 0.125, "encode": 0.0625, "write": 0.0625},
+    )
+    values.update(overrides)
+    return TableMetrics(**values)
+
+
+def test_generation_result_is_the_path():
+    """The result compares, formats and pickles as the plain path."""
+    metrics = _metrics()
+    result = GenerationResult("/out/X.TXT", metrics)
+    assert result == "/out/X.TXT"
+    assert isinstance(result, str)
+    assert result.metrics is metrics
+    assert GenerationResult("/out/X.TXT").metrics is None
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored == result
+    assert restored.metrics == metrics
+
+
+def test_in_memory_sink_keeps_every_run():
+    """records is a copy in recording order; latest finds the last run of a table."""
+    sink = InMemoryMetricsSink()
+    first, other, last = _metrics(rows_in=1), _metrics("G"), _metrics(rows_in=2)
+    for metrics in (first, other, last):
+        sink.record(metrics)
+    assert sink.records == [first, other, last]
+    sink.records.clear()
+    assert len(sink.records) == 3
+    assert sink.latest("B1") is last
+    assert sink.latest("A") is None
+
+
+def test_prometheus_sink_writes_latest_run_per_table(tmp_path):
+    """The textfile holds one sample set per table, replaced on each run."""
+    path = tmp_path / "seti.prom"
+    sink = PrometheusTextfileSink(path)
+    sink.record(_metrics(rows_in=1))
+    sink.record(_metrics("G", cached=True))
+    sink.record(_metrics())
+
+    text = path.read_text(encoding="utf-8")
+    assert list(tmp_path.iterdir()) == [path]
+    assert "# TYPE seti_rows gauge" in text
+    assert 'seti_rows{table="B1",outcome="in"} 10' in text
+    assert 'seti_rows{table="B1",outcome="rejected"} 2' in text
+    assert 'seti_rows{table="B1",outcome="in"} 1\n' not in text
+    assert 'seti_stage_seconds{table="B1",stage="encode"} 0.0625' in text
+    assert 'seti_bytes_written{table="G"} 400' in text
+    assert 'seti_cache_hit{table="G"} 1' in text
+    assert 'seti_cache_hit{table="B1"} 0' in text
+    assert text.endswith("\n")
+
+
+def test_prometheus_sink_escapes_labels(tmp_path):
+    """Label values are escaped and the metric prefix is configurable."""
+    sink = PrometheusTextfileSink(tmp_path / "x.prom", prefix="ipress")
+    sink.record(_metrics('B"1'))
+    assert 'ipress_run_seconds{table="B\\"1"} 0.5' in sink.render()
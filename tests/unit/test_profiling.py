@@ -0,0 +1,25 @@
+import pytest
+from peru_susalud_seti.application.profiling import Profiling
+
+
+@pytest.mark.parametrize("environ, expected", [
+    ({}, None),
+    ({"SETI_PROFILE": ""}, None),
+    ({"SETI_PROFILE": "0", "SETI_PROFILE_MIN_ROWS": "5"}, None),
+    ({"SETI_PROFILE": "1"}, Profiling()),
+    ({"SETI_PROFILE": "yes", "SETI_PROFILE_MIN_ROWS": "5000"}, Profiling(min_rows=5000)),
+])
+def test_profiling_from_env(environ, expected):
+    """SETI_PROFILE switches profiling on; SETI_PROFILE_MIN_ROWS sets the threshold."""
+    assert Profiling.from_env(environ) == expected
+
+
+@pytest.mark.parametrize("min_rows", ["muchas", "-1"])
+def test_profiling_rejects_invalid_min_rows(min_rows):
+    with pytest.raises(ValueError):
+        Profiling.from_env({"SETI_PROFILE": "1", "SETI_PROFILE_MIN_ROWS": min_rows})
+
+
+def test_profiling_stats_path_is_next_to_the_txt():
+    path = Profiling.stats_path("/out/00001234_2026_02_TBB1.TXT", "B1")
+    assert str(path) == "/out/00001234_2026_02_TBB1.B1.pstats"
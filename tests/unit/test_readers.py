@@ -0,0 +1,140 @@
+"""
+Unit tests for Infrastructure Readers.
+"""
+import json
+import pytest
+from peru_susalud_seti.infrastructure import readers
+from peru_susalud_seti.infrastructure.readers import read_csv, read_cursor, read_json_array, read_json_lines
+
+ROWS = [
+    {"period": "202602", "ipress_code": "00001234", "total_patients": n, "gender": "ñ" * (n % 3)}
+    for n in range(50)
+]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_read_json_lines_streams_rows(tmp_path, monkeypatch, use_orjson):
+    """Each non-blank line yields one row, with or without orjson."""
+    if not use_orjson:
+        monkeypatch.setattr(readers, "_loads", json.loads)
+    path = tmp_path / "rows.jsonl"
+    path.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in ROWS) + "\n\n", encoding="utf-8")
+
+    rows = read_json_lines(path)
+    assert next(rows) == ROWS[0]
+    assert list(rows) == ROWS[1:]
+
+
+def test_read_json_lines_reports_bad_line(tmp_path):
+    """A malformed line names its line number."""
+    path = tmp_path / "rows.jsonl"
+    path.write_text('{"period": "202602"}\n{"period": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match="Línea 2: JSON inválido"):
+        list(read_json_lines(path))
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 64, readers.DEFAULT_READ_SIZE])
+def test_read_json_array_matches_json_load(tmp_path, read_size):
+    """Elements come out as json.load would give them, whatever the block size."""
+    values = ROWS + [12345678901234567890, -1.5e10, "a,]", None, [], {}]
+    path = tmp_path / "rows.json"
+    path.write_text(json.dumps(values, ensure_ascii=False, indent=2), encoding="utf-8")
+    assert list(read_json_array(path, read_size=read_size)) == values
+
+
+def test_read_json_array_is_lazy(tmp_path):
+    """The first element is available before the rest of the array is read."""
+    path = tmp_path / "rows.json"
+    path.write_text('[{"n": 1}, {"n": 2}, {"n": ', encoding="utf-8")
+    rows = read_json_array(path, read_size=4)
+    assert next(rows) == {"n": 1}
+    assert next(rows) == {"n": 2}
+    with pytest.raises(ValueError, match="posición"):
+        next(rows)
+
+
+@pytest.mark.parametrize("content, message", [
+    ("", "no contiene un arreglo"),
+    ('{"n": 1}', "no contiene un arreglo"),
+    ("[1", "falta ']'"),
+    ("[1,]", "coma final"),
+    ("[1 2]", "se esperaba ','"),
+    ("[1] x", "después del arreglo"),
+    ('[{"a": 1,}]', "posición 9"),
+    ("[tru]", "se esperaba un valor"),
+])
+def test_read_json_array_rejects_malformed_input(tmp_path, content, message):
+    """Malformed arrays fail with a Spanish message and a position."""
+    path = tmp_path / "rows.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        list(read_json_array(path, read_size=2))
+
+
+def test_read_json_array_empty_and_invalid_read_size(tmp_path):
+    """An empty array yields nothing; the read size must be positive."""
+    path = tmp_path / "rows.json"
+    path.write_text(" [ ] \n", encoding="utf-8")
+    assert list(read_json_array(path)) == []
+    with pytest.raises(ValueError, match="read_size"):
+        list(read_json_array(path, read_size=0))
+
+
+def test_read_csv_renames_columns_and_skips_empty_cells(tmp_path):
+    """Header columns are renamed; empty cells are left for the mapper defaults."""
+    path = tmp_path / "rows.csv"
+    path.write_text("periodo;ipress;atendidos;extra\n202602;00001234;5;\n202602;00001234;;x\n", encoding="cp1252")
+    rows = read_csv(path, {"periodo": "period", "ipress": "ipress_code", "atendidos": "total_patients"},
+                    encoding="cp1252", delimiter=";")
+    assert list(rows) == [
+        {"period": "202602", "ipress_code": "00001234", "total_patients": "5"},
+        {"period": "202602", "ipress_code": "00001234", "extra": "x"},
+    ]
+
+
+def test_read_csv_empty_file_and_unknown_columns(tmp_path):
+    """An empty file yields nothing; renaming a missing column is an error."""
+    path = tmp_path / "rows.csv"
+    path.write_text("", encoding="utf-8")
+    assert list(read_csv(path)) == []
+    path.write_text("period\n202602\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="no encontradas en el origen: ipress"):
+        list(read_csv(path, {"ipress": "ipress_code"}))
+
+
+def _sqlite_cursor(rows):
+    import sqlite3
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE atenciones (periodo TEXT, ipress TEXT, atendidos INTEGER)")
+    connection.executemany("INSERT INTO atenciones VALUES (?, ?, ?)", rows)
+    return connection.execute("SELECT periodo, ipress, atendidos FROM atenciones ORDER BY rowid")
+
+
+def test_read_cursor_fetches_in_batches():
+    """Rows are fetched fetch_size at a time and NULLs are left out."""
+    cursor = _sqlite_cursor([("202602", "00001234", n) for n in range(5)] + [("202602", "00001234", None)])
+    sizes = []
+    fetchmany = cursor.fetchmany
+
+    class Spy:
+        description = cursor.description
+        def fetchmany(self, size):
+            batch = fetchmany(size)
+            sizes.append(len(batch))
+            return batch
+
+    rows = read_cursor(Spy(), {"periodo": "period", "ipress": "ipress_code", "atendidos": "total_patients"}, fetch_size=2)
+    assert next(rows) == {"period": "202602", "ipress_code": "00001234", "total_patients": 0}
+    assert sizes == [2]
+    assert list(rows)[-1] == {"period": "202602", "ipress_code": "00001234"}
+    assert sizes == [2, 2, 2, 0]
+
+
+def test_read_cursor_validation():
+    """The fetch size must be positive and the cursor must hold a result."""
+    import sqlite3
+    cursor = sqlite3.connect(":memory:").cursor()
+    with pytest.raises(ValueError, match="consulta ejecutada"):
+        list(read_cursor(cursor))
+    with pytest.raises(ValueError, match="fetch_size"):
+        list(read_cursor(cursor, fetch_size=0))
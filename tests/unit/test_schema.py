@@ -0,0 +1,65 @@
+from dataclasses import fields
+import pytest
+from peru_susalud_seti.application import mappers
+from peru_susalud_seti.application.services import _TABLE_MAPPERS
+from peru_susalud_seti.domain.models import OutpatientTableB1
+from peru_susalud_seti.domain.schema import SCHEMAS, Column, TableSchema
+from peru_susalud_seti.infrastructure.writers import SetiFileWriter
+
+
+@pytest.mark.parametrize("table_id", list(SCHEMAS))
+def test_schema_drives_mapper_and_layout(table_id):
+    """Each table's mapper and TXT layout come from its schema."""
+    schema = SCHEMAS[table_id]
+    mapper = _TABLE_MAPPERS[table_id]
+    assert mapper._SCHEMA is schema
+    assert mapper._ENTITY is schema.entity_class
+    assert [name for name, _, _ in mapper._COLUMNS] == [f.name for f in fields(schema.entity_class)]
+    assert sorted(schema.column_names) == sorted(name for name, _, _ in mapper._COLUMNS)
+
+    record = mapper.map_from_dict({"period": "202602", "ipress_code": "00001234"})
+    assert type(record) is schema.entity_class
+    line = SetiFileWriter()._format_line(record)
+    assert len(line.split("|")) == len(schema.columns)
+    assert SetiFileWriter()._get_file_metadata(record)[1] == schema.suffix
+
+
+def test_schema_must_match_entity_fields():
+    """A schema naming other fields than its entity is rejected."""
+    schema = SCHEMAS["B1"]
+    for columns in (schema.columns[:-1], schema.columns + (Column("extra"),), schema.columns + schema.columns[:1]):
+        with pytest.raises(TypeError, match="no coincide"):
+            schema._replace(columns=columns).entity_columns()
+
+
+def test_new_table_needs_only_a_schema(monkeypatch):
+    """A table added to the registry gets a generated mapper on first use."""
+    monkeypatch.setattr(mappers, "_MAPPERS", dict(mappers._MAPPERS))
+    columns = tuple(Column(name, "upper" if name == "ups_code" else kind, default) for name, kind, default in mappers.TableB1Mapper._COLUMNS)
+    monkeypatch.setitem(SCHEMAS, "B9", TableSchema("B9", "OutpatientTableB1", "TBB9", columns))
+
+    mapper = mappers.mapper_for("B9")
+    assert mapper.__name__ == "TableB9Mapper"
+    assert mappers.mapper_for("B9") is mapper
+    record = mapper.map_from_dict({"period": "202602", "ipress_code": "00001234", "ups_code": " ab1 "})
+    assert record == OutpatientTableB1("202602", "00001234", "", "AB1", "01", "1", 0, 0, "3", "4")
+    assert mapper.map_batch([{"period": "202602", "ipress_code": "00001234", "ups_code": "x"}]).records[0].ups_code == "X"
+    with pytest.raises(ValueError, match="Error en mapeo TablaB9"):
+        mapper.map_from_dict({"period": "bad"})
+
+
+def test_mapper_registry_is_the_schema_registry():
+    assert list(_TABLE_MAPPERS) == list(SCHEMAS)
+    assert len(_TABLE_MAPPERS) == 13
+    assert "Z" not in _TABLE_MAPPERS
+    with pytest.raises(KeyError):
+        _TABLE_MAPPERS["Z"]
+
+
+def test_mapper_subclass_keeps_the_registered_mapper():
+    """Subclassing a mapper does not replace it in the registry."""
+    class CustomB1Mapper(mappers.TableB1Mapper):
+        pass
+
+    assert mappers.mapper_for("B1") is mappers.TableB1Mapper
+    assert CustomB1Mapper.map_from_dict({"period": "202602", "ipress_code": "00001234"}).period == "202602"
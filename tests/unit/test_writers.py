@@ -3,7 +3,7 @@ Unit tests for Infrastructure Writers.
 Targeting 100% coverage for infrastructure/writers.py
 """
 import pytest
-from peru_susalud_seti.infrastructure.writers import SetiFileWriter
+from peru_susalud_seti.infrastructure.writers import Durability, SetiFileWriter, WriteStats
 from peru_susalud_seti.domain.models import (
     HealthResourceTableA, 
     OutpatientTableB1, 
@@ -159,3 +159,238 @@ def test_writer_format_lines():
     assert "|" in writer._format_line(table_b1)
     assert "|" in writer._format_line(table_b2)
 
+
+
+def _b1(patients=10):
+    return OutpatientTableB1(
+        period="202602", ipress_code="12345678", ugipress_code="12345678",
+        ups_code="301601", age_group="05", gender="1",
+        total_patients=patients, total_appointments=10,
+        poverty_level="3", funding_source="4"
+    )
+
+def test_writer_stream_empty_returns_none(tmp_path):
+    """An empty stream creates no file."""
+    writer = SetiFileWriter()
+    assert writer.write_stream(iter([]), str(tmp_path)) is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_writer_stream_writes_lazily(tmp_path):
+    """Records from a generator are written in order."""
+    writer = SetiFileWriter()
+    path = writer.write_stream((_b1(n) for n in range(3)), str(tmp_path))
+    with open(path, "r", encoding="cp1252") as f:
+        lines = f.read().splitlines()
+    assert [line.split("|")[6] for line in lines] == ["0", "1", "2"]
+
+def test_writer_stream_failure_removes_partial_file(tmp_path):
+    """A failure midway removes the partially written file."""
+    def records():
+        yield _b1()
+        raise RuntimeError("cursor perdido")
+
+    writer = SetiFileWriter()
+    with pytest.raises(RuntimeError):
+        writer.write_stream(records(), str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+def test_writer_write_records_list(tmp_path):
+    """The list-based API still writes every record."""
+    writer = SetiFileWriter()
+    path = writer.write_records([_b1(), _b1()], str(tmp_path))
+    assert path.endswith("12345678_2026_02_TBB1.TXT")
+
+def _b1_for(ipress, period="202602"):
+    return OutpatientTableB1(
+        period=period, ipress_code=ipress, ugipress_code=ipress,
+        ups_code="301601", age_group="05", gender="1",
+        total_patients=1, total_appointments=1,
+        poverty_level="3", funding_source="4"
+    )
+
+def test_writer_partitioned_reopens_evicted_files(tmp_path):
+    """Interleaved partitions survive LRU eviction and are appended to."""
+    writer = SetiFileWriter()
+    records = [
+        _b1_for("11111111"), _b1_for("22222222"), _b1_for("11111111"),
+        _b1_for("22222222", "202603"), _b1_for("11111111"),
+    ]
+    manifest = writer.write_partitioned(records, str(tmp_path), max_open_files=1)
+
+    assert manifest == {
+        str(tmp_path / "11111111_2026_02_TBB1.TXT"): 3,
+        str(tmp_path / "22222222_2026_02_TBB1.TXT"): 1,
+        str(tmp_path / "22222222_2026_03_TBB1.TXT"): 1,
+    }
+    for path, rows in manifest.items():
+        with open(path, "r", encoding="cp1252") as f:
+            assert len(f.read().splitlines()) == rows
+
+def test_writer_partitioned_invalid_pool_size(tmp_path):
+    """The handle pool needs at least one slot."""
+    with pytest.raises(ValueError, match="max_open_files"):
+        SetiFileWriter().write_partitioned([], str(tmp_path), max_open_files=0)
+
+def test_writer_partitioned_failure_removes_files(tmp_path):
+    """A failure midway removes every partition written so far."""
+    def records():
+        yield _b1_for("11111111")
+        yield _b1_for("22222222")
+        raise RuntimeError("cursor perdido")
+
+    with pytest.raises(RuntimeError):
+        SetiFileWriter().write_partitioned(records(), str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+def test_writer_format_follows_official_column_order():
+    """B2 writes priority/destination before poverty_level; J uses 2 decimals."""
+    writer = SetiFileWriter()
+    b2 = EmergencyTableB2(
+        period="202602", ipress_code="12345678", ugipress_code="12345678",
+        ups_code="301602", age_group="05", gender="1",
+        total_patients=5, total_appointments=6,
+        priority="1", destination="2",
+        poverty_level="3", funding_source="4"
+    )
+    j = ExpenditureTableJ(
+        period="202602", ipress_code="12345678", ugipress_code="12345678",
+        funding_source="1", budget_category="2.3", executed_amount=12500.5
+    )
+    assert writer._format_line(b2) == "202602|12345678|12345678|301602|05|1|5|6|1|2|3|4"
+    assert writer._format_line(j) == "202602|12345678|12345678|1|2.3|12500.50"
+
+def test_writer_subclass_reuses_parent_layout():
+    """Subclasses of a registered entity are formatted like their parent."""
+    from dataclasses import dataclass
+
+    @dataclass(frozen=True)
+    class CustomB1(OutpatientTableB1):
+        pass
+
+    writer = SetiFileWriter()
+    record = CustomB1(**{f: getattr(_b1(), f) for f in _b1().__dataclass_fields__})
+    assert writer._format_line(record) == writer._format_line(_b1())
+    assert writer._get_file_metadata(record)[1] == "TBB1"
+
+def test_writer_write_encoded(tmp_path):
+    """Encoded chunks are written in order; chunks without a name are skipped."""
+    writer = SetiFileWriter()
+    data = writer.encode_records([_b1(1), _b1(2)])
+    path = writer.write_encoded([(None, b""), ("X.TXT", data), ("X.TXT", data)], str(tmp_path))
+    with open(path, "rb") as f:
+        assert f.read() == data * 2
+    assert writer.write_encoded([(None, b"")], str(tmp_path / "none")) is None
+
+def test_writer_write_encoded_failure_removes_file(tmp_path):
+    """A failure midway removes the partial file."""
+    def chunks():
+        yield "X.TXT", b"linea\n"
+        raise RuntimeError("worker perdido")
+
+    with pytest.raises(RuntimeError):
+        SetiFileWriter().write_encoded(chunks(), str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+def test_writer_stream_small_buffer_matches_default(tmp_path):
+    """Block size does not change the bytes written."""
+    records = [_b1(n) for n in range(50)]
+    (tmp_path / "small").mkdir()
+    small = SetiFileWriter(buffer_size=64).write_stream(records, str(tmp_path / "small"))
+    default = SetiFileWriter().write_records(records, str(tmp_path))
+    with open(small, "rb") as a, open(default, "rb") as b:
+        assert a.read() == b.read()
+
+def test_writer_stream_with_stats_matches_untimed(tmp_path):
+    """Timed writing produces the same bytes and counts records and bytes."""
+    records = [_b1(n) for n in range(2500)]
+    (tmp_path / "timed").mkdir()
+    stats = WriteStats()
+    timed = SetiFileWriter().write_stream(iter(records), str(tmp_path / "timed"), stats)
+    plain = SetiFileWriter().write_stream(records, str(tmp_path))
+    with open(timed, "rb") as a, open(plain, "rb") as b:
+        data = a.read()
+        assert data == b.read()
+    assert stats.records == 2500
+    assert stats.bytes_written == len(data)
+    assert min(stats.read_seconds, stats.format_seconds, stats.encode_seconds, stats.write_seconds) >= 0
+
+def test_writer_stream_with_stats_failure_removes_file(tmp_path):
+    """Timed writing also discards the temp file on failure."""
+    def records():
+        yield _b1()
+        raise RuntimeError("cursor perdido")
+
+    with pytest.raises(RuntimeError):
+        SetiFileWriter().write_stream(records(), str(tmp_path), WriteStats())
+    assert list(tmp_path.iterdir()) == []
+
+def test_writer_invalid_buffer_size():
+    """The block buffer needs at least one byte."""
+    with pytest.raises(ValueError, match="buffer_size"):
+        SetiFileWriter(buffer_size=0)
+
+def test_writer_reports_record_that_cannot_be_encoded(tmp_path, monkeypatch):
+    """A non-cp1252 character names its record and leaves no truncated file."""
+    from peru_susalud_seti.domain import models
+    monkeypatch.setitem(models._VALIDATORS, OutpatientTableB1, lambda record: None)
+
+    records = [_b1(n) for n in range(5)]
+    records.append(OutpatientTableB1(
+        period="202602", ipress_code="12345678", ugipress_code="12345678",
+        ups_code="✓", age_group="05", gender="1",
+        total_patients=1, total_appointments=1,
+        poverty_level="3", funding_source="4"
+    ))
+    with pytest.raises(ValueError, match="Registro 6: el carácter '✓'"):
+        SetiFileWriter(buffer_size=64).write_stream(records, str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+def test_writer_failure_keeps_previous_official_file(tmp_path):
+    """A failed rewrite leaves the previous file intact and no temp files."""
+    writer = SetiFileWriter()
+    path = writer.write_records([_b1(1)], str(tmp_path))
+    with open(path, "rb") as f:
+        previous = f.read()
+
+    def records():
+        yield _b1(2)
+        raise RuntimeError("proceso interrumpido")
+
+    with pytest.raises(RuntimeError):
+        writer.write_stream(records(), str(tmp_path))
+    with open(path, "rb") as f:
+        assert f.read() == previous
+    assert [p.name for p in tmp_path.iterdir()] == ["12345678_2026_02_TBB1.TXT"]
+
+@pytest.mark.parametrize("durability, file_syncs, dir_syncs", [
+    (Durability.NONE, 0, 0),
+    (Durability.FILE, 1, 0),
+    ("directory", 1, 1),
+])
+def test_writer_durability_modes(tmp_path, monkeypatch, durability, file_syncs, dir_syncs):
+    """Each durability mode fsyncs the file and/or its directory before returning."""
+    import os
+    import stat
+    synced = []
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(stat.S_ISDIR(os.fstat(fd).st_mode)))
+
+    writer = SetiFileWriter(durability=durability)
+    writer.write_records([_b1()], str(tmp_path))
+    assert synced.count(False) == file_syncs
+    assert synced.count(True) == dir_syncs
+
+def test_writer_partitioned_fsyncs_evicted_files(tmp_path, monkeypatch):
+    """Partitions closed by the LRU pool are reopened to be synced and published."""
+    import os
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+
+    records = [_b1_for("11111111"), _b1_for("22222222")]
+    manifest = SetiFileWriter(durability=Durability.FILE).write_partitioned(records, str(tmp_path), max_open_files=1)
+    assert len(synced) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(os.path.basename(p) for p in manifest)
+
+def test_writer_invalid_durability():
+    """Unknown durability modes are rejected."""
+    with pytest.raises(ValueError):
+        SetiFileWriter(durability="siempre")